@@ -1,34 +1,282 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import tkinter.font as tkFont
-import pyodbc
+from tkinter import ttk, messagebox, simpledialog, filedialog
+import json
 import math
+import queue
+import threading
+from collections import Counter
 from typing import List, Dict, Any, Optional
 
+from db_connections import (
+    DEFAULT_DRIVER,
+    READ_ISOLATION_LEVELS,
+    ConnectionPool,
+)
+from session_store import (
+    CATALOG_STAMP_QUERY,
+    CatalogCache,
+    load_session,
+    save_session,
+)
+from change_detection import (
+    LEADING_INDEX_QUERY,
+    PRIMARY_KEY_QUERY,
+    checksum_covers,
+    find_rowversion_column,
+    build_table_watermark_query,
+    build_page_checksum_query,
+    page_key_range,
+)
+from change_tracking import (
+    CHANGE_TRACKING_ENABLED_QUERY,
+    CURRENT_VERSION_QUERY,
+    ChangeTracker,
+)
+from page_cache import TABLE_VALIDATOR_QUERY, PageCache, make_page_key
+from row_buffer import ColumnarPage, format_size
+from workload import WorkloadRecorder, recorded_step
+from table_compare import TableSide, changed_columns, compare_tables, hashable_columns
+from table_copy import copy_table, computed_columns, last_copied_key, map_columns
+from column_profile import profile_column
+from value_index import PrefixIndex, load_distinct_values
+from engine import (
+    DataEngine,
+    DATABASES_QUERY,
+    SCHEMAS_QUERY,
+    TABLES_QUERY,
+    COLUMNS_QUERY,
+    user_schemas,
+    parse_columns,
+    FILTER_OPERATORS,
+    compile_like_filter,
+    compile_conditions,
+    build_count_query,
+    build_page_query,
+    build_key_page_query,
+    build_key_seek_query,
+    build_key_position_query,
+    summary_columns,
+    build_summary_count_query,
+    build_summary_page_query,
+    value_literal,
+    AGGREGATE_FUNCTIONS,
+    edit_text,
+    changed_fields,
+    insert_record,
+    update_record,
+    delete_record,
+)
+from formatters import DEFAULT_DISPLAY_FORMATS, MEMOIZED_TYPES, make_formatter
+from query_plan import (
+    summarize_showplan,
+    parse_statistics_messages,
+    format_plan_summary,
+)
+from index_advisor import (
+    MISSING_INDEX_QUERY,
+    INDEX_USAGE_QUERY,
+    parse_index_usage,
+    rank_index_suggestions,
+)
+from cost_guard import (
+    TABLE_ROW_COUNT_QUERY,
+    plan_estimates,
+    exceeds_thresholds,
+    to_prefix_filter,
+    suggest_cheaper_filters,
+)
+
+# Unpinned columns rendered beyond the visible ones on a wide table
+COLUMN_WINDOW_BUFFER = 5
+
+# One round trip for every table in a schema; partition stats avoid COUNT(*) scans
+SCHEMA_OVERVIEW_QUERY = """
+SELECT
+    t.name,
+    ISNULL(ps.row_count, 0),
+    ISNULL(ps.reserved_kb, 0),
+    ISNULL(ps.used_kb, 0),
+    ISNULL(ix.index_count, 0),
+    t.modify_date,
+    us.last_user_update
+FROM sys.tables AS t
+JOIN sys.schemas AS s ON s.schema_id = t.schema_id
+LEFT JOIN (
+    SELECT
+        object_id,
+        SUM(CASE WHEN index_id IN (0, 1) THEN row_count ELSE 0 END) AS row_count,
+        SUM(reserved_page_count) * 8 AS reserved_kb,
+        SUM(used_page_count) * 8 AS used_kb
+    FROM sys.dm_db_partition_stats
+    GROUP BY object_id
+) AS ps ON ps.object_id = t.object_id
+LEFT JOIN (
+    SELECT object_id, COUNT(*) AS index_count
+    FROM sys.indexes
+    WHERE type > 0
+    GROUP BY object_id
+) AS ix ON ix.object_id = t.object_id
+LEFT JOIN (
+    SELECT object_id, MAX(last_user_update) AS last_user_update
+    FROM sys.dm_db_index_usage_stats
+    WHERE database_id = DB_ID()
+    GROUP BY object_id
+) AS us ON us.object_id = t.object_id
+WHERE s.name = ?
+ORDER BY t.name
+"""
+
 
 class SQLServerCRUDApp:
+    # Attributes persisted under "settings" in the session file
+    SETTINGS = (
+        "pool_size",
+        "connection_options",
+        "read_intent",
+        "read_isolation",
+        "lock_timeout_ms",
+        "cost_guard_enabled",
+        "cost_guard_max_cost",
+        "cost_guard_max_rows",
+        "cost_guard_timeout",
+        "cost_guard_maxdop",
+        "page_cache_enabled",
+        "page_cache_ttl",
+        "page_cache_max_mb",
+        "change_detection_enabled",
+        "live_poll_interval_ms",
+        "live_max_changes",
+        "display_formats",
+        "wide_table_columns",
+        "profile_sample_rows",
+        "autocomplete_max_values",
+    )
+
     def __init__(self, root):
         self.root = root
         self.root.title("SQL Server CRUD Application")
         self.root.geometry("800x600")
 
-        # Database connection variables
-        self.connection = None
+        # Database connection variables (self.pool is used for writes)
+        self.pool = None
+        self.connection_params = None
+        self.read_pool = None
+        self.read_pool_database = None
+
+        # Connection settings
+        self.pool_size = 4
+        self.connection_options = {
+            "driver": DEFAULT_DRIVER,
+            "packet_size": None,
+            "mars": False,
+        }
+
+        # Read routing settings
+        self.read_intent = False  # ApplicationIntent=ReadOnly
+        self.read_isolation = "Read Committed"
+        self.lock_timeout_ms = 5000
+
+        # Current selection
         self.current_database = None
         self.current_schema = None  # Add schema variable
         self.current_table = None
+        self.current_table_type = None
         self.current_columns = []
+        self.column_formatters = []
+        self.primary_key_columns = []
+        self.rowversion_column = None
+        self.rowversion_indexed = False
         self.current_data = []
         self.filtered_data = []
+        # Group-by view of the table: group_by, aggregates, and the grid's
+        # columns and formatters while it is shown; None for the rows
+        self.summary = None
+        self.tree_rows = {}
+
+        # Change markers of the loaded page, compared by refresh_data. They
+        # cost queries of their own, so they are only taken by a Refresh
+        self.change_detection_enabled = True
+        self.watermarks = None
+        self.watermark_refresh = False
+
+        # Live mode (Change Tracking polling)
+        self.live_poll_interval_ms = 2000
+        self.live_max_changes = 500
+        self.live_tracker = None
+        self.live_after_id = None
+
+        # Opt-in workload trace (workload.py replays it)
+        self.workload_recorder = None
+
+        # Cell display (strftime formats, text and binary preview lengths)
+        self.display_formats = dict(DEFAULT_DISPLAY_FORMATS)
+
+        # Wider tables only render pinned columns plus a scrolling window
+        self.wide_table_columns = 40
+        self.column_window_start = 0
+        self.unpinned_column_count = 0
+        self.column_scroll_pending = None
+        self.tree_table_key = None
+
+        # Column profiles sample this many rows when there is no histogram
+        self.profile_sample_rows = 10000
+
+        # Filter value suggestions: (table key, column) -> PrefixIndex, or
+        # None while loading or when the column can't be listed
+        self.autocomplete_max_values = 5000
+        self.value_indexes: Dict[tuple, Optional[PrefixIndex]] = {}
+
+        # Columns filtered on per [schema].[table], used by the index advisor
+        self.filter_column_usage: Dict[str, Counter] = {}
 
         # Pagination variables
         self.page_size = 100
         self.current_page = 1
         self.total_pages = 1
+        self.total_records = 0
+        self.current_filter = ""
+        # (page, key, forward) while Next/Prev reads a page by seeking past a
+        # key of the page on screen
+        self.page_seek = None
+
+        # Cost guard settings (None disables a threshold)
+        self.cost_guard_enabled = True
+        self.cost_guard_max_cost = 50.0
+        self.cost_guard_max_rows = 5_000_000
+        self.cost_guard_timeout = 30  # seconds, for "Run with limits"
+        self.cost_guard_maxdop = 2
+        self.cost_guard_decisions = {}
+
+        # Local SQLite page cache settings
+        self.page_cache_enabled = False
+        self.page_cache_ttl = 3600  # seconds
+        self.page_cache_max_mb = 200
+        self.page_cache = None
+
+        # Restore the last session; its selection is applied as catalogs load
+        self.session = load_session()
+        self.catalog_cache = CatalogCache()
+        for name in self.SETTINGS:
+            if name in self.session.get("settings", {}):
+                setattr(self, name, self.session["settings"][name])
+        self.page_size = self.session.get("page_size", self.page_size)
+        self.column_widths = self.session.get("column_widths", {})
+        self.pinned_columns = self.session.get("pinned_columns", {})
+        self.pending_selection = {}
+
+        # With Windows auth nothing needs prompting, so connect while the UI builds
+        if self.session.get("server") and not self.session.get("username"):
+            self.start_session_connection(self.session["server"], None, None)
 
         # Create GUI
         self.create_widgets()
-        self.connect_to_server()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        if self.pool:
+            server = self.session["server"]
+            self.connection_status.config(text=f"Connecting to {server}...")
+            self.wait_for_pool()
+        else:
+            self.connect_to_server()
 
     def create_widgets(self):
         # Main frame
@@ -55,6 +303,36 @@ class SQLServerCRUDApp:
         self.connection_status = ttk.Label(conn_frame, text="Not connected")
         self.connection_status.grid(row=0, column=1, sticky=tk.W)
 
+        ttk.Label(conn_frame, text="Reads:").grid(row=0, column=2, padx=(10, 5))
+        self.read_mode_combo = ttk.Combobox(
+            conn_frame,
+            values=list(READ_ISOLATION_LEVELS),
+            state="readonly",
+            width=16,
+        )
+        self.read_mode_combo.set(self.read_isolation)
+        self.read_mode_combo.grid(row=0, column=3)
+        self.read_mode_combo.bind(
+            "<<ComboboxSelected>>", self.on_read_settings_changed
+        )
+
+        self.read_intent_var = tk.BooleanVar(value=self.read_intent)
+        ttk.Checkbutton(
+            conn_frame,
+            text="Read-only intent",
+            variable=self.read_intent_var,
+            command=self.on_read_settings_changed,
+        ).grid(row=0, column=4, padx=(10, 0))
+
+        ttk.Label(conn_frame, text="Lock timeout (ms):").grid(
+            row=0, column=5, padx=(10, 5)
+        )
+        self.lock_timeout_entry = ttk.Entry(conn_frame, width=7)
+        self.lock_timeout_entry.insert(0, str(self.lock_timeout_ms))
+        self.lock_timeout_entry.grid(row=0, column=6)
+        self.lock_timeout_entry.bind("<Return>", self.on_read_settings_changed)
+        self.lock_timeout_entry.bind("<FocusOut>", self.on_read_settings_changed)
+
         # Database and Schema selection frame
         selection_frame = ttk.LabelFrame(
             main_frame, text="Database, Schema & Table Selection", padding="5"
@@ -96,11 +374,17 @@ class SQLServerCRUDApp:
         self.filter_column_combo.grid(
             row=0, column=1, sticky=(tk.W, tk.E), padx=(0, 10)
         )
+        self.filter_column_combo.bind(
+            "<<ComboboxSelected>>", lambda e: self.load_value_index()
+        )
 
         ttk.Label(filter_frame, text="Value:").grid(row=0, column=2, padx=(0, 5))
         self.filter_entry = ttk.Entry(filter_frame)
         self.filter_entry.grid(row=0, column=3, sticky=(tk.W, tk.E), padx=(0, 10))
         self.filter_entry.bind("<Return>", lambda e: self.apply_filter())
+        self.filter_suggestions = SuggestionPopup(
+            self.filter_entry, self.suggest_filter_values, self.apply_suggested_filter
+        )
 
         ttk.Button(filter_frame, text="Apply Filter", command=self.apply_filter).grid(
             row=0, column=4, padx=(0, 10)
@@ -113,6 +397,16 @@ class SQLServerCRUDApp:
             text="Advanced Filter",
             command=self.open_advanced_filter_dialog,
         ).grid(row=0, column=6, padx=(10, 0))
+        ttk.Button(
+            filter_frame, text="Profile", command=self.open_column_profile
+        ).grid(row=0, column=7, padx=(10, 0))
+
+        # The WHERE clause behind the rows shown, which the cost guard or a
+        # drill-down can change without touching the column and value above
+        self.active_filter_label = ttk.Label(filter_frame, text="")
+        self.active_filter_label.grid(
+            row=1, column=0, columnspan=8, sticky=tk.W, pady=(5, 0)
+        )
 
         # CRUD buttons frame
         crud_frame = ttk.Frame(main_frame)
@@ -132,6 +426,53 @@ class SQLServerCRUDApp:
         ttk.Button(crud_frame, text="Delete Record", command=self.delete_record).pack(
             side=tk.LEFT, padx=(0, 5)
         )
+        self.page_cache_var = tk.BooleanVar(value=self.page_cache_enabled)
+        ttk.Checkbutton(
+            crud_frame,
+            text="Local cache",
+            variable=self.page_cache_var,
+            command=self.on_page_cache_toggled,
+        ).pack(side=tk.LEFT, padx=(10, 5))
+        self.live_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            crud_frame,
+            text="Live",
+            variable=self.live_var,
+            command=self.on_live_toggled,
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        self.record_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            crud_frame,
+            text="Record",
+            variable=self.record_var,
+            command=self.on_record_toggled,
+        ).pack(side=tk.LEFT, padx=(0, 5))
+
+        # Query plan inspection
+        self.explain_mode_combo = ttk.Combobox(
+            crud_frame, values=["Estimated", "Actual"], state="readonly", width=10
+        )
+        self.explain_mode_combo.set("Estimated")
+        self.explain_mode_combo.pack(side=tk.RIGHT)
+        ttk.Button(crud_frame, text="Explain", command=self.explain_query).pack(
+            side=tk.RIGHT, padx=(0, 5)
+        )
+        self.summary_button = ttk.Button(
+            crud_frame, text="Summary", command=self.on_summary_clicked
+        )
+        self.summary_button.pack(side=tk.RIGHT, padx=(0, 5))
+        ttk.Button(
+            crud_frame, text="Index Advisor", command=self.open_index_advisor
+        ).pack(side=tk.RIGHT, padx=(0, 5))
+        ttk.Button(
+            crud_frame, text="Schema Overview", command=self.open_schema_overview
+        ).pack(side=tk.RIGHT, padx=(0, 5))
+        ttk.Button(crud_frame, text="Compare", command=self.compare_table).pack(
+            side=tk.RIGHT, padx=(0, 5)
+        )
+        ttk.Button(crud_frame, text="Copy To", command=self.copy_table_to).pack(
+            side=tk.RIGHT, padx=(0, 5)
+        )
 
         # Data display frame
         data_frame = ttk.LabelFrame(main_frame, text="Data", padding="5")
@@ -155,11 +496,31 @@ class SQLServerCRUDApp:
         v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         self.tree.configure(yscrollcommand=v_scrollbar.set)
 
-        h_scrollbar = ttk.Scrollbar(
-            tree_frame, orient=tk.HORIZONTAL, command=self.tree.xview
+        self.h_scrollbar = ttk.Scrollbar(
+            tree_frame, orient=tk.HORIZONTAL, command=self.on_horizontal_scroll
         )
-        h_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
-        self.tree.configure(xscrollcommand=h_scrollbar.set)
+        self.h_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        self.tree.configure(xscrollcommand=self.on_tree_xscroll)
+        self.tree.bind("<Button-3>", self.on_tree_heading_menu)
+        self.tree.bind("<Double-1>", self.drill_down)
+
+        # Query plan panel (shown next to the grid by Explain)
+        self.plan_frame = ttk.LabelFrame(data_frame, text="Query Plan", padding="5")
+        self.plan_frame.grid(row=0, column=1, sticky=(tk.N, tk.S), padx=(10, 0))
+        self.plan_frame.rowconfigure(0, weight=1)
+
+        self.plan_text = tk.Text(self.plan_frame, width=50, wrap="none")
+        self.plan_text.grid(row=0, column=0, sticky=(tk.N, tk.S))
+        plan_scrollbar = ttk.Scrollbar(
+            self.plan_frame, orient=tk.VERTICAL, command=self.plan_text.yview
+        )
+        plan_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.plan_text.configure(yscrollcommand=plan_scrollbar.set)
+
+        ttk.Button(
+            self.plan_frame, text="Close", command=self.plan_frame.grid_remove
+        ).grid(row=1, column=0, columnspan=2, pady=(5, 0))
+        self.plan_frame.grid_remove()
 
         # Pagination frame
         pagination_frame = ttk.Frame(data_frame)
@@ -181,20 +542,208 @@ class SQLServerCRUDApp:
         self.records_label = ttk.Label(pagination_frame, text="0 records")
         self.records_label.pack(side=tk.LEFT, padx=(10, 0))
 
+        ttk.Label(pagination_frame, text="Rows per page:").pack(
+            side=tk.LEFT, padx=(10, 5)
+        )
+        self.page_size_combo = ttk.Combobox(
+            pagination_frame,
+            values=["50", "100", "500", "1000", "5000", "10000", "50000"],
+            width=6,
+        )
+        self.page_size_combo.set(str(self.page_size))
+        self.page_size_combo.pack(side=tk.LEFT)
+        self.page_size_combo.bind("<<ComboboxSelected>>", self.on_page_size_changed)
+        self.page_size_combo.bind("<Return>", self.on_page_size_changed)
+
+        ttk.Label(pagination_frame, text="Go to:").pack(side=tk.LEFT, padx=(10, 5))
+        self.goto_mode_combo = ttk.Combobox(
+            pagination_frame, values=["Page", "Key"], state="readonly", width=5
+        )
+        self.goto_mode_combo.set("Page")
+        self.goto_mode_combo.pack(side=tk.LEFT)
+        self.goto_entry = ttk.Entry(pagination_frame, width=12)
+        self.goto_entry.pack(side=tk.LEFT, padx=5)
+        self.goto_entry.bind("<Return>", lambda e: self.go_to())
+        ttk.Button(pagination_frame, text="Go", command=self.go_to).pack(side=tk.LEFT)
+
+    def uses_separate_read_connection(self):
+        """Whether browsing reads need their own connection"""
+        return self.read_intent or self.read_isolation != "Read Committed"
+
+    def open_pool(self):
+        """(Re)create the write pool and start opening connections in the background"""
+        self.close_pools()
+        self.pool = ConnectionPool(
+            size=self.pool_size,
+            **self.connection_params,
+            **self.connection_options,
+            lock_timeout_ms=self.lock_timeout_ms,
+        )
+        self.pool.recorder = self.workload_recorder
+        self.pool.warmup()
+
+    def get_read_pool(self):
+        """Pool used for browsing reads (may point at a readable secondary)"""
+        if not self.uses_separate_read_connection():
+            return self.pool
+
+        # Read-only routing happens at login, so the database must be in the
+        # connection string and a database change needs new connections
+        if self.read_pool is None or (
+            self.read_intent and self.read_pool_database != self.current_database
+        ):
+            if self.read_pool is not None:
+                self.read_pool.close()
+            self.read_pool = ConnectionPool(
+                size=self.pool_size,
+                **self.connection_params,
+                **self.connection_options,
+                database=self.current_database,
+                read_only=self.read_intent,
+                isolation_level=READ_ISOLATION_LEVELS[self.read_isolation],
+                lock_timeout_ms=self.lock_timeout_ms,
+                autocommit=True,
+            )
+            self.read_pool.recorder = self.workload_recorder
+            self.read_pool_database = self.current_database
+        return self.read_pool
+
+    def read_connection(self):
+        """Borrow a read connection: with self.read_connection() as connection"""
+        return self.get_read_pool().connection()
+
+    def close_pools(self):
+        """Close the write pool and the separate read pool, if any"""
+        for pool in (self.pool, self.read_pool):
+            if pool is not None:
+                pool.close()
+        self.pool = None
+        self.read_pool = None
+        self.read_pool_database = None
+
+    def on_read_settings_changed(self, event=None):
+        """Apply changed read routing, isolation and lock timeout settings"""
+        try:
+            lock_timeout_ms = int(self.lock_timeout_entry.get())
+        except ValueError:
+            messagebox.showwarning(
+                "Lock Timeout", "Lock timeout must be a whole number of milliseconds."
+            )
+            return
+
+        changed_timeout = lock_timeout_ms != self.lock_timeout_ms
+        self.read_isolation = self.read_mode_combo.get()
+        self.read_intent = self.read_intent_var.get()
+        self.lock_timeout_ms = lock_timeout_ms
+
+        if self.read_pool is not None:
+            self.read_pool.close()
+            self.read_pool = None
+        if self.pool and changed_timeout:
+            self.open_pool()
+
+    def run_in_background(self, work, on_done=None):
+        """Run work() on a thread and hand its result to on_done on the Tk thread"""
+        results = queue.Queue()
+
+        def run():
+            try:
+                results.put((work(), None))
+            except Exception as e:
+                results.put((None, e))
+
+        def check():
+            try:
+                result, error = results.get_nowait()
+            except queue.Empty:
+                self.root.after(50, check)
+                return
+            if on_done:
+                on_done(result, error)
+
+        threading.Thread(target=run, daemon=True).start()
+        self.root.after(50, check)
+
+    def fetch_catalog(self, key, query, *params):
+        """Catalog rows from the persisted cache, or from the server on a miss"""
+        server = self.connection_params["server"]
+        rows = self.catalog_cache.get(server, key)
+        if rows is None:
+            with self.read_connection() as connection:
+                cursor = connection.cursor()
+                if self.current_database:
+                    cursor.execute(f"USE [{self.current_database}]")
+                cursor.execute(query, *params)
+                rows = [list(row) for row in cursor.fetchall()]
+            self.catalog_cache.put(server, key, rows)
+        return rows
+
+    def revalidate_catalog(self):
+        """Check the cached catalog of the current database in the background"""
+        pool = self.pool
+        server = self.connection_params["server"]
+        database = self.current_database
+
+        def work():
+            with pool.connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(DATABASES_QUERY)
+                databases = [list(row) for row in cursor.fetchall()]
+                cursor.execute(f"USE [{database}]")
+                cursor.execute(CATALOG_STAMP_QUERY)
+                stamp = list(cursor.fetchone())
+            return databases, stamp
+
+        def done(result, error):
+            if error is not None or self.pool is not pool:
+                return
+            databases, stamp = result
+
+            if self.catalog_cache.get(server, "databases") != databases:
+                self.catalog_cache.put(server, "databases", databases)
+                self.database_combo["values"] = [row[0] for row in databases]
+
+            stamp_key = f"{database}/stamp"
+            cached_stamp = self.catalog_cache.get(server, stamp_key)
+            if cached_stamp != stamp:
+                if cached_stamp is not None:
+                    self.catalog_cache.invalidate_database(server, database)
+                self.catalog_cache.put(server, stamp_key, stamp)
+                if cached_stamp is not None and database == self.current_database:
+                    self.reload_catalog_lists()
+            self.catalog_cache.save()
+
+        self.run_in_background(work, done)
+
+    def reload_catalog_lists(self):
+        """Refresh schema/table lists after a catalog change, keeping the selection"""
+        try:
+            self.schema_combo["values"] = self.fetch_schemas()
+            if self.current_schema:
+                self.table_combo["values"] = self.fetch_tables()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to refresh catalog:\n{str(e)}")
+            return
+        if self.current_table:
+            self.load_table_structure()
+
     def load_databases(self):
         """Load available databases"""
-        if not self.connection:
+        if not self.pool:
             return
 
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(
-                "SELECT name FROM sys.databases WHERE database_id > 4 ORDER BY name"
-            )
-            databases = [row[0] for row in cursor.fetchall()]
+            rows = self.fetch_catalog("databases", DATABASES_QUERY)
+            databases = [row[0] for row in rows]
+
             self.database_combo["values"] = databases
             if databases:
-                self.database_combo.current(0)
+                preferred = self.pending_selection.pop("database", None)
+                if preferred in databases:
+                    self.database_combo.set(preferred)
+                else:
+                    self.pending_selection.clear()
+                    self.database_combo.current(0)
                 self.on_database_selected(None)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load databases:\n{str(e)}")
@@ -207,35 +756,30 @@ class SQLServerCRUDApp:
 
         self.current_database = selected_db
         self.load_schemas()
+        self.revalidate_catalog()
+
+    def fetch_schemas(self):
+        """Schema names of the current database, without system schemas"""
+        rows = self.fetch_catalog(f"{self.current_database}/schemas", SCHEMAS_QUERY)
+        return user_schemas([row[0] for row in rows])
 
     def load_schemas(self):
         """Load available schemas from selected database"""
-        if not self.connection or not self.current_database:
+        if not self.pool or not self.current_database:
             return
 
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"USE [{self.current_database}]")
-
-            # Get schemas
-            cursor.execute(
-                """
-                SELECT SCHEMA_NAME 
-                FROM INFORMATION_SCHEMA.SCHEMATA 
-                ORDER BY SCHEMA_NAME
-            """
-            )
-            schemas = [
-                row[0] for row in cursor.fetchall() if not row[0].startswith("db_")
-            ]
-
-            remove_schemas: list[str] = ["guest", "INFORMATION_SCHEMA", "sys"]
-            for idx, value in enumerate(schemas):
-                if value in remove_schemas:
-                    schemas.pop(idx)
+            schemas = self.fetch_schemas()
 
             self.schema_combo["values"] = schemas
             if schemas:
+                preferred = self.pending_selection.pop("schema", None)
+                if preferred in schemas:
+                    self.schema_combo.set(preferred)
+                    self.on_schema_selected(None)
+                    return
+
+                self.pending_selection.clear()
                 # Try to default to 'dbo' if it exists, otherwise first schema
                 if "dbo" in schemas:
                     self.schema_combo.set("dbo")
@@ -255,54 +799,112 @@ class SQLServerCRUDApp:
         self.current_schema = selected_schema
         self.load_tables()
 
+    def fetch_tables(self):
+        """Display names of the tables and views in the current schema"""
+        rows = self.fetch_catalog(
+            f"{self.current_database}/{self.current_schema}/tables",
+            TABLES_QUERY,
+            self.current_schema,
+        )
+
+        tables = []
+        for row in rows:
+            table_name, table_type = row
+            display_name = f"{table_name} ({table_type})"
+            tables.append(display_name)
+        return tables
+
     def load_tables(self):
-        """Load tables and views from selected database and schema"""
-        if not self.connection or not self.current_database or not self.current_schema:
+        """Load tables and views; only a restored session table is opened"""
+        if not self.pool or not self.current_database or not self.current_schema:
             return
 
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"USE [{self.current_database}]")
-
-            # Get tables and views for the specific schema
-            query = """
-            SELECT TABLE_NAME, TABLE_TYPE 
-            FROM INFORMATION_SCHEMA.TABLES 
-            WHERE TABLE_TYPE IN ('BASE TABLE', 'VIEW')
-            AND TABLE_SCHEMA = ?
-            ORDER BY TABLE_TYPE, TABLE_NAME
-            """
-            cursor.execute(query, self.current_schema)
-
-            tables = []
-            for row in cursor.fetchall():
-                table_name, table_type = row
-                display_name = f"{table_name} ({table_type})"
-                tables.append(display_name)
+            tables = self.fetch_tables()
 
             self.table_combo["values"] = tables
-            if tables:
-                self.table_combo.current(0)
+            self.table_combo.set("")
+            self.stop_live_mode()
+            self.current_table = None
+            self.current_columns = []
+            self.current_data = []
+            self.current_page = 1
+            self.total_pages = 1
+            self.update_treeview()
+            self.update_pagination_controls(0)
+
+            # Don't load the first table's data: it may be huge
+            preferred = self.pending_selection.pop("table", None)
+            if preferred in tables:
+                self.table_combo.set(preferred)
                 self.on_table_selected(None)
+            self.pending_selection.clear()
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load tables:\n{str(e)}")
 
+    def open_schema_overview(self):
+        """Show sizes and row counts for every table in the current schema"""
+        if not self.pool or not self.current_database or not self.current_schema:
+            messagebox.showwarning("Schema Overview", "Please select a schema first.")
+            return
+
+        try:
+            with self.read_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(f"USE [{self.current_database}]")
+                cursor.execute(SCHEMA_OVERVIEW_QUERY, self.current_schema)
+                rows = cursor.fetchall()
+        except Exception as e:
+            messagebox.showerror(
+                "Schema Overview", f"Failed to load schema overview:\n{str(e)}"
+            )
+            return
+
+        SchemaOverviewDialog(
+            self.root,
+            f"[{self.current_database}].[{self.current_schema}]",
+            rows,
+            self.open_table,
+        )
+
+    def open_table(self, table_name, table_type="BASE TABLE"):
+        """Select a table in the current schema as if picked from table_combo"""
+        self.table_combo.set(f"{table_name} ({table_type})")
+        self.on_table_selected(None)
+
+    @recorded_step("open_table", with_columns=True)
     def on_table_selected(self, event):
         """Handle table selection"""
         selected_item = self.table_combo.get()
         if not selected_item:
             return
 
+        self.remember_column_widths()
+        self.stop_live_mode()
+        self.summary = None
+        self.summary_button.config(text="Summary")
+
         # Extract table name (remove type suffix)
-        self.current_table = selected_item.split(" (")[0]
+        self.current_table, _, table_type = selected_item.partition(" (")
+        self.current_table_type = table_type.rstrip(")") or None
+        self.current_page = 1
+        self.column_window_start = 0
+        restored = self.pending_selection
+        self.current_filter = restored.get("filter") or ""
         self.load_table_structure()
-        self.load_data()
+
+        if self.current_filter:
+            self.filter_column_combo.set(restored.get("filter_column") or "")
+            self.filter_entry.delete(0, tk.END)
+            self.filter_entry.insert(0, restored.get("filter_value") or "")
+        self.load_data(self.current_filter)
+        self.save_session_state()
 
     def load_table_structure(self):
         """Load table structure and populate filter column dropdown"""
         if (
-            not self.connection
+            not self.pool
             or not self.current_database
             or not self.current_schema
             or not self.current_table
@@ -310,30 +912,45 @@ class SQLServerCRUDApp:
             return
 
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"USE [{self.current_database}]")
-
             # Get column information for specific schema and table
-            query = """
-            SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT
-            FROM INFORMATION_SCHEMA.COLUMNS 
-            WHERE TABLE_NAME = ? AND TABLE_SCHEMA = ?
-            ORDER BY ORDINAL_POSITION
-            """
-            cursor.execute(query, self.current_table, self.current_schema)
+            rows = self.fetch_catalog(
+                f"{self.current_database}/{self.current_schema}/"
+                f"{self.current_table}/column_details",
+                COLUMNS_QUERY,
+                self.current_table,
+                self.current_schema,
+            )
 
-            self.current_columns = []
-            column_names = []
-
-            for row in cursor.fetchall():
-                column_info = {
-                    "name": row[0],
-                    "type": row[1],
-                    "nullable": row[2] == "YES",
-                    "default": row[3],
-                }
-                self.current_columns.append(column_info)
-                column_names.append(row[0])
+            self.current_columns = parse_columns(rows)
+            column_names = [col["name"] for col in self.current_columns]
+
+            # Chosen once per table, applied a whole column at a time
+            self.column_formatters = [
+                (
+                    make_formatter(col["type"], col["scale"], self.display_formats),
+                    col["type"].lower() in MEMOIZED_TYPES,
+                )
+                for col in self.current_columns
+            ]
+
+            pk_rows = self.fetch_catalog(
+                f"{self.current_database}/{self.current_schema}/"
+                f"{self.current_table}/primary_key",
+                PRIMARY_KEY_QUERY,
+                self.full_table_name(),
+            )
+            self.primary_key_columns = [row[0] for row in pk_rows]
+            self.rowversion_column = find_rowversion_column(self.current_columns)
+            self.rowversion_indexed = False
+            if self.rowversion_column:
+                index_rows = self.fetch_catalog(
+                    f"{self.current_database}/{self.current_schema}/"
+                    f"{self.current_table}/rowversion_index",
+                    LEADING_INDEX_QUERY,
+                    self.full_table_name(),
+                    self.rowversion_column,
+                )
+                self.rowversion_indexed = index_rows[0][0] > 0
 
             # Update filter column dropdown
             self.filter_column_combo["values"] = column_names
@@ -344,28 +961,98 @@ class SQLServerCRUDApp:
             messagebox.showerror("Error", f"Failed to load table structure:\n{str(e)}")
 
     def load_data(self, where_clause=""):
-        """Load data from current table with pagination"""
+        """Load data from current table with pagination; True if it was shown"""
         if (
-            not self.connection
+            not self.pool
             or not self.current_database
             or not self.current_schema
             or not self.current_table
         ):
-            return
+            return False
 
         try:
-            cursor = self.connection.cursor()
+            total_records, prompt = self.read_page(where_clause)
+            if prompt is not None:
+                # Ask with the connection back in the pool; the answer is cached
+                retry_filter = self.confirm_query_cost(where_clause, prompt)
+                if retry_filter is None:
+                    return False
+                return self.load_data(retry_filter)
+
+            # Update treeview
+            self.update_treeview()
+            self.update_pagination_controls(total_records)
+            return True
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load data:\n{str(e)}")
+            return False
+
+    def read_page(self, where_clause):
+        """Read the current page into current_data, from the page cache if valid
+
+        Returns (total_records, None), or (None, prompt) when the cost guard
+        wants the user to confirm first (see confirm_query_cost).
+        """
+        with self.read_connection() as connection:
+            cursor = connection.cursor()
             cursor.execute(f"USE [{self.current_database}]")
 
-            # Use schema.table format for queries
-            full_table_name = f"[{self.current_schema}].[{self.current_table}]"
+            # A validated local copy costs one tiny query instead of a fetch
+            validator = self.read_table_validator(cursor)
+            cached = None
+            if validator is not None:
+                cached = self.page_cache.get(
+                    self.page_cache_key(where_clause), validator
+                )
 
-            # Count total records
-            count_query = f"SELECT COUNT(*) FROM {full_table_name}"
-            if where_clause:
-                count_query += f" WHERE {where_clause}"
+            if cached is not None:
+                total_records, rows = cached
+                self.current_data = ColumnarPage.from_rows(
+                    rows, len(self.grid_columns())
+                )
+                self.total_pages = max(1, math.ceil(total_records / self.page_size))
+            else:
+                decision, prompt = self.check_query_cost(cursor, where_clause)
+                if prompt is not None:
+                    return None, prompt
+                where_clause, limited = decision
+                total_records = self.fetch_page(
+                    connection, cursor, where_clause, limited
+                )
+                if validator is not None:
+                    self.page_cache.put(
+                        self.page_cache_key(where_clause),
+                        self.connection_params["server"],
+                        self.current_database,
+                        self.full_table_name(),
+                        validator,
+                        total_records,
+                        self.current_data,
+                    )
+
+            self.watermarks = None
+            if (
+                self.change_detection_enabled
+                and self.watermark_refresh
+                and not self.summary
+            ):
+                self.watermarks = self.capture_watermarks(cursor, where_clause)
+        return total_records, None
+
+    def fetch_page(self, connection, cursor, where_clause, limited=False):
+        """Count and fetch the current page from the server; returns the count
+
+        limited runs both queries with the cost guard's timeout and MAXDOP.
+        """
+        options = ""
+        if limited:
+            options = f"OPTION (MAXDOP {self.cost_guard_maxdop})"
+            connection.timeout = self.cost_guard_timeout
 
-            cursor.execute(count_query)
+        try:
+            # Count total records
+            cursor.execute(self.build_count_query(where_clause, options))
             total_records = cursor.fetchone()[0]
 
             # Calculate pagination
@@ -374,59 +1061,537 @@ class SQLServerCRUDApp:
                 self.current_page = 1
 
             # Get data for current page
-            offset = (self.current_page - 1) * self.page_size
+            cursor.execute(
+                self.build_data_query(where_clause, options), *self.data_query_params()
+            )
+            self.current_data = ColumnarPage.from_cursor(cursor)
+        finally:
+            connection.timeout = 0
+
+        return total_records
+
+    def full_table_name(self):
+        """[schema].[table] of the current table"""
+        return f"[{self.current_schema}].[{self.current_table}]"
+
+    def get_page_cache(self):
+        """The local page cache, opened on first use"""
+        if self.page_cache is None:
+            self.page_cache = PageCache(
+                ttl_seconds=self.page_cache_ttl,
+                max_bytes=self.page_cache_max_mb * 1024 * 1024,
+            )
+        return self.page_cache
+
+    def on_page_cache_toggled(self):
+        """Turn the local page cache on or off"""
+        self.page_cache_enabled = self.page_cache_var.get()
+
+    def page_cache_key(self, where_clause):
+        """Page cache key of the current page"""
+        key_column = self.page_key_column()
+        return make_page_key(
+            self.connection_params["server"],
+            self.current_database,
+            self.full_table_name(),
+            where_clause,
+            f"[{key_column}]" if key_column else "(SELECT NULL)",
+            self.current_page,
+            self.page_size,
+        )
+
+    def read_table_validator(self, cursor):
+        """Cheap server fingerprint of the current table, or None if not caching
+
+        Views are never cached: usage stats are tracked on their base tables.
+        With read intent the read connection may be on a readable secondary,
+        whose usage stats miss the changes replayed from the primary, so the
+        validator is read on the primary instead.
+        """
+        if (
+            not self.page_cache_enabled
+            or self.current_table_type != "BASE TABLE"
+            or self.summary
+        ):
+            return None
+        self.get_page_cache()
+        full_table_name = self.full_table_name()
+        params = (full_table_name, full_table_name, full_table_name)
+        if self.read_intent:
+            with self.pool.connection() as connection:
+                primary = connection.cursor()
+                primary.execute(f"USE [{self.current_database}]")
+                primary.execute(TABLE_VALIDATOR_QUERY, *params)
+                return json.dumps(list(primary.fetchone()), default=str)
+        cursor.execute(TABLE_VALIDATOR_QUERY, *params)
+        return json.dumps(list(cursor.fetchone()), default=str)
+
+    def invalidate_cached_data(self):
+        """Forget cached pages and watermarks of the current table after a write"""
+        self.watermarks = None
+        if self.page_cache is not None:
+            self.page_cache.invalidate_table(
+                self.connection_params["server"],
+                self.current_database,
+                self.full_table_name(),
+            )
 
-            data_query = f"""
-            SELECT * FROM {full_table_name}
-            {f'WHERE {where_clause}' if where_clause else ''}
-            ORDER BY (SELECT NULL)
-            OFFSET {offset} ROWS
-            FETCH NEXT {self.page_size} ROWS ONLY
-            """
+    def cost_guard_key(self, where_clause):
+        """Key of a remembered cost guard decision; summaries are decided apart"""
+        summary = None
+        if self.summary:
+            summary = (
+                tuple(self.summary["group_by"]),
+                tuple(self.summary["aggregates"]),
+            )
+        return (self.current_database, self.full_table_name(), where_clause, summary)
 
-            cursor.execute(data_query)
-            self.current_data = cursor.fetchall()
+    def check_query_cost(self, cursor, where_clause):
+        """Estimate load_data's queries against the cost guard thresholds
 
-            # Update treeview
-            self.update_treeview()
-            self.update_pagination_controls(total_records)
+        Returns (decision, prompt): decision is (where_clause, limited) to run
+        with; when the user has to confirm first it is None and prompt holds
+        the estimates for confirm_query_cost.
+        """
+        if not self.cost_guard_enabled:
+            return (where_clause, False), None
+
+        key = self.cost_guard_key(where_clause)
+        if key in self.cost_guard_decisions:
+            return self.cost_guard_decisions[key], None
+
+        full_table_name = self.full_table_name()
+        try:
+            summaries = [
+                self.get_estimated_plan(cursor, self.build_count_query(where_clause)),
+                self.get_estimated_plan(
+                    cursor,
+                    self.build_data_query(where_clause),
+                    *self.data_query_params(),
+                ),
+            ]
+            cost, rows = plan_estimates(summaries)
+        except Exception:
+            # No SHOWPLAN permission: fall back to the catalog row count
+            cursor.execute(TABLE_ROW_COUNT_QUERY, full_table_name)
+            cost, rows = 0.0, float(cursor.fetchone()[0] or 0)
+
+        if not exceeds_thresholds(
+            cost, rows, self.cost_guard_max_cost, self.cost_guard_max_rows
+        ):
+            self.cost_guard_decisions[key] = (where_clause, False)
+            return self.cost_guard_decisions[key], None
+
+        cursor.execute(INDEX_USAGE_QUERY, full_table_name)
+        indexed_columns = [
+            index["key_columns"][0]
+            for index in parse_index_usage(cursor.fetchall())
+            if index["key_columns"]
+        ]
+        return None, {
+            "cost": cost,
+            "rows": rows,
+            "suggestions": suggest_cheaper_filters(where_clause, indexed_columns),
+            "prefix_filter": to_prefix_filter(where_clause),
+        }
+
+    def confirm_query_cost(self, where_clause, prompt):
+        """Ask how to run an expensive query; the filter to load, or None
+
+        Must be called without holding a pooled connection: the dialog is modal.
+        """
+        dialog = CostGuardDialog(
+            self.root,
+            prompt["cost"],
+            prompt["rows"],
+            prompt["suggestions"],
+            prompt["prefix_filter"] is not None,
+            self.cost_guard_timeout,
+            self.cost_guard_maxdop,
+        )
+        if dialog.result is None:
+            return None
+        if dialog.result == "prefix":
+            # The rewritten filter gets its own estimate; the filter label
+            # shows it once the page is loaded
+            self.current_filter = prompt["prefix_filter"]
+            return prompt["prefix_filter"]
+        self.cost_guard_decisions[self.cost_guard_key(where_clause)] = (
+            where_clause,
+            dialog.result == "limited",
+        )
+        return where_clause
+
+    def build_count_query(self, where_clause="", options=""):
+        """Build the COUNT query issued by load_data"""
+        if self.summary:
+            return build_summary_count_query(
+                self.full_table_name(), where_clause, self.summary["group_by"], options
+            )
+        return build_count_query(self.full_table_name(), where_clause, options)
+
+    def current_seek(self):
+        """page_seek if the current page is read by seeking from a key, else None"""
+        seek = self.page_seek
+        if self.page_key_column() and seek is not None and seek[0] == self.current_page:
+            return seek
+        return None
+
+    def data_query_params(self):
+        """Parameters of build_data_query's query: the key a seek starts from"""
+        seek = self.current_seek()
+        return [seek[1]] if seek is not None else []
+
+    def build_data_query(self, where_clause="", options=""):
+        """Build the page query issued by load_data for the current page"""
+        key_column = self.page_key_column()
+        seek = self.current_seek()
+        if seek is not None:
+            return build_key_seek_query(
+                self.full_table_name(),
+                where_clause,
+                key_column,
+                seek[2],
+                self.page_size,
+                options,
+            )
+        if key_column:
+            return build_key_page_query(
+                self.full_table_name(),
+                where_clause,
+                key_column,
+                self.current_page,
+                self.page_size,
+                options,
+            )
+        if self.summary:
+            return build_summary_page_query(
+                self.full_table_name(),
+                where_clause,
+                self.summary["group_by"],
+                self.summary["aggregates"],
+                self.current_page,
+                self.page_size,
+                options,
+                columns=self.current_columns,
+            )
+        return build_page_query(
+            self.full_table_name(),
+            where_clause,
+            self.current_page,
+            self.page_size,
+            options,
+        )
+
+    def page_key_column(self):
+        """Single-column primary key that pages are ordered and sought by, or None"""
+        if self.summary or len(self.primary_key_columns) != 1:
+            return None
+        return self.primary_key_columns[0]
+
+    def explain_query(self):
+        """Show the execution plan of the current page query next to the grid"""
+        if not self.pool or not self.current_table:
+            messagebox.showwarning("Explain", "Please select a table first.")
+            return
+
+        where_clause = getattr(self, "current_filter", "")
+        queries = [
+            ("Count query", self.build_count_query(where_clause)),
+            ("Page query", self.build_data_query(where_clause)),
+        ]
+
+        try:
+            with self.read_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(f"USE [{self.current_database}]")
+
+                sections = []
+                if self.explain_mode_combo.get() == "Actual":
+                    for title, query in queries:
+                        summary, io_stats = self.get_actual_plan(cursor, query)
+                        sections.append(format_plan_summary(title, summary, io_stats))
+                else:
+                    for title, query in queries:
+                        summary = self.get_estimated_plan(cursor, query)
+                        sections.append(format_plan_summary(title, summary))
+
+            self.plan_text.delete("1.0", tk.END)
+            self.plan_text.insert("1.0", "\n\n".join(sections))
+            self.plan_frame.grid()
 
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load data:\n{str(e)}")
+            messagebox.showerror("Explain", f"Failed to get query plan:\n{str(e)}")
 
-    def update_treeview(self):
-        """Update the treeview with current data"""
-        # Clear existing data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def get_estimated_plan(self, cursor, query, *params):
+        """Compile query under SHOWPLAN_XML and summarize the estimated plan"""
+        cursor.execute("SET SHOWPLAN_XML ON")
+        try:
+            cursor.execute(query, *params)
+            plan_xml = cursor.fetchone()[0]
+        finally:
+            cursor.execute("SET SHOWPLAN_XML OFF")
+        return summarize_showplan(plan_xml)
+
+    def get_actual_plan(self, cursor, query):
+        """Run query with STATISTICS IO/TIME/XML on and summarize what it did"""
+        cursor.execute("SET STATISTICS IO, TIME, XML ON")
+        try:
+            cursor.execute(query)
+            messages = [message[1] for message in cursor.messages]
+            plan_xml = None
+
+            # Result sets: the page rows, then the actual plan
+            while True:
+                if cursor.description is not None:
+                    rows = cursor.fetchall()
+                    if (
+                        cursor.description[0][0]
+                        == "Microsoft SQL Server 2005 XML Showplan"
+                    ):
+                        plan_xml = rows[0][0]
+                if not cursor.nextset():
+                    break
+                messages.extend(message[1] for message in cursor.messages)
+        finally:
+            cursor.execute("SET STATISTICS IO, TIME, XML OFF")
+
+        if plan_xml is None:
+            raise ValueError("The server did not return an actual execution plan.")
+        return summarize_showplan(plan_xml), parse_statistics_messages(messages)
 
-        if not self.current_columns or not self.current_data:
+    def update_treeview(self):
+        """Update the treeview with current data
+
+        Rows are keyed by primary key, so a refresh only deletes, inserts and
+        updates the rows that differ; selection and scroll position survive.
+        """
+        columns = self.grid_columns()
+        if not columns or not self.current_data:
+            self.tree.delete(*self.tree.get_children())
+            self.tree_rows = {}
             return
 
-        # Configure columns
-        column_names = [col["name"] for col in self.current_columns]
-        self.tree["columns"] = column_names
-        self.tree["show"] = "headings"
+        shown = self.shown_column_indexes()
+        column_names = [columns[index]["name"] for index in shown]
+        if list(self.tree["columns"]) != column_names:
+            grid_key = self.table_key() + ("/summary" if self.summary else "")
+            if self.tree_table_key != grid_key:
+                # Different table or view: start over
+                self.tree.delete(*self.tree.get_children())
+                self.tree_rows = {}
+                self.tree_table_key = grid_key
+            # Same table, scrolled column window: rows are updated in place
+            self.tree["columns"] = column_names
+            self.tree["show"] = "headings"
+
+            # Configure column headings and widths
+            for col_name in column_names:
+                self.tree.heading(col_name, text=col_name)
+                self.tree.column(col_name, width=100, minwidth=50)
+
+        new_rows = self.tree_row_items(shown)
+        new_iids = [iid for iid, _ in new_rows]
+        keep = set(new_iids)
+        stale = [iid for iid in self.tree.get_children() if iid not in keep]
+        if stale:
+            self.tree.delete(*stale)
+
+        # Only a hash of each shown row is kept; Tk already holds the strings
+        changed = bool(stale)
+        row_hashes = {}
+        for index, (iid, values) in enumerate(new_rows):
+            row_hash = row_hashes[iid] = hash(values)
+            old_hash = self.tree_rows.get(iid)
+            if old_hash is None:
+                self.tree.insert("", index, iid=iid, values=values)
+                changed = True
+            elif old_hash != row_hash:
+                self.tree.item(iid, values=values)
+                changed = True
+        self.tree_rows = row_hashes
+
+        if list(self.tree.get_children()) != new_iids:
+            for index, iid in enumerate(new_iids):
+                self.tree.move(iid, "", index)
+        self.update_column_scrollbar()
+
+        if not changed:
+            return
 
-        # Configure column headings and widths
+        # Widths saved from an earlier session skip the (slow) autosize pass
+        saved_widths = self.column_widths.get(self.table_key(), {})
+        unsized = []
         for col_name in column_names:
-            self.tree.heading(col_name, text=col_name)
-            self.tree.column(col_name, width=100, minwidth=50)
+            if col_name in saved_widths:
+                self.tree.column(col_name, width=saved_widths[col_name])
+            else:
+                unsized.append(col_name)
+        if unsized:
+            self.autosize_tree_columns(unsized)
+
+    def tree_row_items(self, shown):
+        """(iid, display values) for each row of current_data
+
+        Only the shown columns are formatted. The iid is the primary key (the
+        group columns of a summary) when every row has a distinct one, else
+        the row position (which still lets unchanged rows be skipped).
+        """
+        page = self.current_data
+        columns = self.grid_columns()
+        key_columns = self.primary_key_columns
+        formatters = self.column_formatters
+        if self.summary:
+            key_columns = self.summary["group_by"]
+            formatters = self.summary["formatters"]
+        if len(formatters) != len(columns):
+            formatters = [(str, False)] * len(columns)
+        display_columns = [
+            page.display_column(index, *formatters[index]) for index in shown
+        ]
+        display_rows = list(zip(*display_columns))
+
+        column_names = [col["name"] for col in columns]
+        key_indexes = [
+            column_names.index(col) for col in key_columns if col in column_names
+        ]
+        if key_indexes and len(key_indexes) == len(key_columns):
+            key_values = zip(*(page.column(index) for index in key_indexes))
+            iids = [repr(key) for key in key_values]
+            if len(set(iids)) == len(iids):
+                return list(zip(iids, display_rows))
+
+        return [(f"#{n}", values) for n, values in enumerate(display_rows)]
+
+    def grid_columns(self):
+        """Column dicts of what the grid shows: the table's, or the summary's"""
+        return self.summary["columns"] if self.summary else self.current_columns
+
+    def is_wide_table(self):
+        """Whether the grid renders a column window instead of every column"""
+        return len(self.grid_columns()) > self.wide_table_columns
+
+    def table_pinned_columns(self):
+        """Columns kept in view on a wide table (the primary key by default)"""
+        return self.pinned_columns.get(self.table_key(), self.primary_key_columns)
+
+    def column_window_size(self):
+        """Unpinned columns that fit in the grid"""
+        width = self.tree.winfo_width()
+        return max(10, width // 100) if width > 1 else 10
+
+    def shown_column_indexes(self):
+        """Indexes into grid_columns() of the columns the grid renders
+
+        On wide tables: the pinned columns, then a window of the others plus
+        a few off-screen ones, so a 1,000-column table renders like a narrow one.
+        """
+        columns = self.grid_columns()
+        count = len(columns)
+        if not self.is_wide_table():
+            return list(range(count))
+
+        names = [col["name"] for col in columns]
+        pinned = [names.index(n) for n in self.table_pinned_columns() if n in names]
+        rest = [index for index in range(count) if index not in pinned]
+        fits = self.column_window_size()
+        self.unpinned_column_count = len(rest)
+        self.column_window_start = max(
+            0, min(self.column_window_start, len(rest) - fits)
+        )
+        start = self.column_window_start
+        return pinned + rest[start : start + fits + COLUMN_WINDOW_BUFFER]
+
+    def update_column_scrollbar(self):
+        """Show the column window's position on the horizontal scrollbar"""
+        if not self.is_wide_table() or not self.unpinned_column_count:
+            return
+        first = self.column_window_start / self.unpinned_column_count
+        last = (
+            self.column_window_start + self.column_window_size()
+        ) / self.unpinned_column_count
+        self.h_scrollbar.set(first, min(1.0, last))
+
+    def on_tree_xscroll(self, first, last):
+        """Tree's own horizontal position; wide tables report the window instead"""
+        if self.is_wide_table():
+            self.update_column_scrollbar()
+        else:
+            self.h_scrollbar.set(first, last)
+
+    def on_horizontal_scroll(self, *args):
+        """Scroll the tree, or move the column window of a wide table"""
+        if not self.is_wide_table():
+            self.tree.xview(*args)
+            return
+
+        fits = self.column_window_size()
+        if args[0] == "moveto":
+            start = int(float(args[1]) * self.unpinned_column_count)
+        else:
+            step = int(args[1]) * (fits if args[2] == "pages" else 1)
+            start = self.column_window_start + step
+        start = max(0, min(start, self.unpinned_column_count - fits))
+        if start == self.column_window_start:
+            return
+
+        self.remember_column_widths()
+        self.column_window_start = start
+        # Dragging the scrollbar fires many events; render once per idle
+        if self.column_scroll_pending is None:
+            self.column_scroll_pending = self.root.after_idle(
+                self.render_column_window
+            )
+
+    def render_column_window(self):
+        """Re-render the grid for the moved column window"""
+        self.column_scroll_pending = None
+        self.update_treeview()
+        self.tree.xview_moveto(0)
+
+    def on_tree_heading_menu(self, event):
+        """Right-click on a heading of a wide table: pin or unpin the column"""
+        if not self.is_wide_table():
+            return
+        if self.tree.identify_region(event.x, event.y) != "heading":
+            return
+        index = int(self.tree.identify_column(event.x)[1:]) - 1
+        columns = self.tree["columns"]
+        if not 0 <= index < len(columns):
+            return
 
-        # Insert data
-        for row in self.current_data:
-            # Convert None values to empty strings for display
-            display_row = [str(val) if val is not None else "" for val in row]
-            self.tree.insert("", "end", values=display_row)
+        col_name = columns[index]
+        pinned = list(self.table_pinned_columns())
+        menu = tk.Menu(self.root, tearoff=0)
+        if col_name in pinned:
+            menu.add_command(
+                label=f"Unpin {col_name}",
+                command=lambda: self.set_pinned_columns(
+                    [col for col in pinned if col != col_name]
+                ),
+            )
+        else:
+            menu.add_command(
+                label=f"Pin {col_name}",
+                command=lambda: self.set_pinned_columns(pinned + [col_name]),
+            )
+        menu.tk_popup(event.x_root, event.y_root)
 
-        self.autosize_tree_columns()
+    def set_pinned_columns(self, columns):
+        """Change the current table's pinned columns and re-render"""
+        self.remember_column_widths()
+        self.pinned_columns[self.table_key()] = columns
+        self.update_treeview()
+        self.save_session_state()
 
-    def autosize_tree_columns(self, padding=20):
+    def autosize_tree_columns(self, columns=None, padding=20):
         """Automatically resizes the columns in self.tree to fit the content."""
+        import tkinter.font as tkFont
+
         style = ttk.Style()
         treeview_font = tkFont.nametofont(style.lookup("Treeview", "font"))
 
-        for col in self.tree["columns"]:
+        for col in columns or self.tree["columns"]:
             max_width = treeview_font.measure(col)
             for item in self.tree.get_children():
                 cell_text = self.tree.set(item, col)
@@ -436,178 +1601,1058 @@ class SQLServerCRUDApp:
 
     def update_pagination_controls(self, total_records):
         """Update pagination controls"""
+        self.total_records = total_records
         self.page_label.config(text=f"Page {self.current_page} of {self.total_pages}")
-        self.records_label.config(text=f"{total_records} records")
+        footprint = ""
+        if isinstance(self.current_data, ColumnarPage):
+            footprint = f" ({format_size(self.current_data.nbytes())} in memory)"
+        self.records_label.config(text=f"{total_records} records{footprint}")
+        active_filter = ""
+        if self.current_filter:
+            active_filter = f"Showing rows where {self.current_filter}"
+        self.active_filter_label.config(text=active_filter)
 
         self.prev_button.config(state="normal" if self.current_page > 1 else "disabled")
         self.next_button.config(
             state="normal" if self.current_page < self.total_pages else "disabled"
         )
 
-    def prev_page(self):
-        """Go to previous page"""
-        if self.current_page > 1:
-            self.current_page -= 1
-            if hasattr(self, "current_filter") and self.current_filter:
-                self.load_data(self.current_filter)
-            else:
-                self.load_data()
-
-    def next_page(self):
-        """Go to next page"""
-        if self.current_page < self.total_pages:
-            self.current_page += 1
-            if hasattr(self, "current_filter") and self.current_filter:
-                self.load_data(self.current_filter)
-            else:
-                self.load_data()
-
-    def apply_filter(self):
-        """Apply filter to data"""
-        column = self.filter_column_combo.get()
-        value = self.filter_entry.get().strip()
+    def on_live_toggled(self):
+        """Start or stop live mode from the Live checkbox"""
+        if self.live_var.get():
+            self.start_live_mode()
+        else:
+            self.stop_live_mode()
 
-        if not column or not value:
+    def start_live_mode(self):
+        """Follow the current table through Change Tracking instead of reloading"""
+        if not self.pool or not self.current_table:
+            messagebox.showwarning("Live", "Please select a table first.")
+            self.live_var.set(False)
+            return
+        if not self.primary_key_columns:
             messagebox.showwarning(
-                "Filter", "Please select a column and enter a filter value."
+                "Live", "Live mode needs a table with a primary key."
             )
+            self.live_var.set(False)
+            return
+        if self.summary:
+            messagebox.showwarning("Live", "Live mode follows detail rows only.")
+            self.live_var.set(False)
             return
 
+        full_table_name = self.full_table_name()
         try:
-            # Simple LIKE filter - you can enhance this with more operators
-            where_clause = f"[{column}] LIKE '%{value}%'"
-            self.current_filter = where_clause
-            self.current_page = 1  # Reset to first page
-            self.load_data(where_clause)
-
+            with self.read_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(f"USE [{self.current_database}]")
+                cursor.execute(CHANGE_TRACKING_ENABLED_QUERY, full_table_name)
+                enabled = cursor.fetchone()[0]
+                cursor.execute(CURRENT_VERSION_QUERY)
+                version = cursor.fetchone()[0]
         except Exception as e:
-            messagebox.showerror("Filter Error", f"Failed to apply filter:\n{str(e)}")
-
-    def clear_filter(self):
-        """Clear current filter"""
-        self.filter_entry.delete(0, tk.END)
-        self.current_filter = ""
-        self.current_page = 1
-        self.load_data()
-
-    def refresh_data(self):
-        """Refresh current data"""
-        if hasattr(self, "current_filter") and self.current_filter:
-            self.load_data(self.current_filter)
-        else:
-            self.load_data()
-
-    def get_selected_record(self):
-        """Get currently selected record from treeview"""
-        selection = self.tree.selection()
-        if not selection:
-            messagebox.showwarning("Selection", "Please select a record.")
-            return None
+            messagebox.showerror("Live", f"Failed to start live mode:\n{str(e)}")
+            self.live_var.set(False)
+            return
 
-        item = selection[0]
-        values = self.tree.item(item, "values")
-        return dict(zip([col["name"] for col in self.current_columns], values))
+        if not enabled:
+            messagebox.showwarning(
+                "Live", "Change Tracking is not enabled on this table."
+            )
+            self.live_var.set(False)
+            return
 
-    def add_record(self):
-        """Add new record"""
-        if (
-            not self.current_table
-            or not self.current_columns
-            or not self.current_schema
-        ):
-            messagebox.showwarning("Add Record", "Please select a table first.")
+        # Version first, then reload, so nothing between the two is missed
+        self.live_tracker = ChangeTracker(
+            full_table_name,
+            list(self.primary_key_columns),
+            version,
+            self.live_max_changes,
+        )
+        self.load_data(self.current_filter)
+        self.live_after_id = self.root.after(self.live_poll_interval_ms, self.live_poll)
+
+    def stop_live_mode(self):
+        """Stop polling for changes"""
+        if self.live_after_id is not None:
+            self.root.after_cancel(self.live_after_id)
+            self.live_after_id = None
+        self.live_tracker = None
+        self.live_var.set(False)
+
+    def live_poll(self):
+        """Fetch changes since the last poll on a background thread"""
+        self.live_after_id = None
+        tracker = self.live_tracker
+        if tracker is None:
             return
 
-        # Create dialog for new record
-        dialog = RecordDialog(self.root, "Add Record", self.current_columns)
-        if dialog.result:
-            try:
-                cursor = self.connection.cursor()
-                cursor.execute(f"USE [{self.current_database}]")
+        pool = self.get_read_pool()
+        database = self.current_database
+        where_clause = self.current_filter
+        # Filtered counts can't be adjusted from key changes alone
+        count_query = self.build_count_query(where_clause) if where_clause else None
 
-                # Use schema.table format
-                full_table_name = f"[{self.current_schema}].[{
-                    self.current_table}]"
+        def work():
+            with pool.connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(f"USE [{database}]")
+                return tracker.poll(cursor, where_clause, count_query)
 
-                # Build INSERT query
-                columns = list(dialog.result.keys())
-                placeholders = ", ".join(["?" for _ in columns])
-                column_names = ", ".join([f"[{col}]" for col in columns])
+        def done(result, error):
+            if tracker is not self.live_tracker:
+                return
+            if error is not None:
+                self.stop_live_mode()
+                messagebox.showerror("Live", f"Live mode stopped:\n{str(error)}")
+                return
+            self.apply_live_changes(result)
+            self.live_after_id = self.root.after(
+                self.live_poll_interval_ms, self.live_poll
+            )
 
-                query = f"INSERT INTO {full_table_name} ({column_names}) VALUES ({
-                    placeholders})"
-                values = [
-                    dialog.result[col] if dialog.result[col] != "" else None
-                    for col in columns
-                ]
+        self.run_in_background(work, done)
 
-                cursor.execute(query, values)
-                self.connection.commit()
+    def apply_live_changes(self, result):
+        """Patch the visible page and counts with Change Tracking results"""
+        if result["reload"]:
+            self.watermarks = None
+            self.load_data(self.current_filter)
+            return
+        if not result["changes"] and result["total_records"] is None:
+            return
 
-                messagebox.showinfo("Success", "Record added successfully.")
+        column_names = [col["name"] for col in self.current_columns]
+        key_indexes = [column_names.index(col) for col in self.primary_key_columns]
+        rows = list(self.current_data)
+        positions = {
+            tuple(row[i] for i in key_indexes): n for n, row in enumerate(rows)
+        }
+        removed = set()
+        added = False
+        delta = 0
+
+        # New rows are only placed when pages are in key order and the key
+        # falls in this page's range (open-ended on the first and last page);
+        # anywhere else the count changes and the next page load places them
+        key_column = self.page_key_column()
+        key_range = None
+        if key_column:
+            key_range = page_key_range(rows, column_names.index(key_column))
+
+        def on_this_page(key):
+            if not key_column or key[0] is None:
+                return False
+            if key_range is None:
+                # An empty page only fills up when it is the first one
+                return self.current_page == 1
+            low, high = key_range
+            return (self.current_page == 1 or key[0] > low) and (
+                self.current_page >= self.total_pages or key[0] < high
+            )
+
+        for operation, key, current in result["changes"]:
+            if operation == "I":
+                delta += 1
+            elif operation == "D":
+                delta -= 1
+
+            position = positions.get(key)
+            if position is not None:
+                # Deleted, or updated so it no longer matches the filter
+                if current is None:
+                    removed.add(position)
+                else:
+                    rows[position] = current
+            elif current is not None and on_this_page(key):
+                # Inserted, or updated so it now matches the filter
+                positions[key] = len(rows)
+                rows.append(current)
+                added = True
+
+        rows = [row for n, row in enumerate(rows) if n not in removed]
+        if added:
+            # Key order; rows pushed past the page size belong to the next page
+            key_index = column_names.index(key_column)
+            rows.sort(key=lambda row: row[key_index])
+            del rows[self.page_size :]
+        self.current_data = ColumnarPage.from_rows(rows, len(self.current_columns))
+        total_records = result["total_records"]
+        if total_records is None:
+            total_records = max(0, self.total_records + delta)
+        self.total_pages = max(1, math.ceil(total_records / self.page_size))
+
+        # Refresh watermarks were taken before these changes
+        self.watermarks = None
+        self.update_treeview()
+        self.update_pagination_controls(total_records)
+
+    @recorded_step("page_size")
+    def on_page_size_changed(self, event=None):
+        """Apply a new page size and go back to the first page"""
+        try:
+            page_size = int(self.page_size_combo.get())
+        except ValueError:
+            page_size = 0
+        if page_size <= 0:
+            messagebox.showwarning("Page Size", "Page size must be a positive number.")
+            self.page_size_combo.set(str(self.page_size))
+            return
+
+        self.page_size = page_size
+        self.current_page = 1
+        self.refresh_data()
+
+    def table_key(self):
+        """Key of the current table in session data"""
+        return f"{self.current_database}.{self.current_schema}.{self.current_table}"
+
+    def remember_column_widths(self):
+        """Keep the current table's column widths for the session file"""
+        if not self.current_table or not self.tree["columns"]:
+            return
+        # Merged, since a wide table only shows some of its columns at a time
+        self.column_widths.setdefault(self.table_key(), {}).update(
+            {col: self.tree.column(col, "width") for col in self.tree["columns"]}
+        )
+
+    def save_session_state(self):
+        """Write the current selection and settings to the session file"""
+        params = self.connection_params or {}
+        save_session(
+            {
+                "server": params.get("server"),
+                "username": params.get("username"),
+                "database": self.current_database,
+                "schema": self.current_schema,
+                "table": self.table_combo.get() or None,
+                "filter": self.current_filter,
+                "filter_column": self.filter_column_combo.get(),
+                "filter_value": self.filter_entry.get(),
+                "page_size": self.page_size,
+                "column_widths": self.column_widths,
+                "pinned_columns": self.pinned_columns,
+                "settings": {name: getattr(self, name) for name in self.SETTINGS},
+            }
+        )
+
+    def on_close(self):
+        """Save the session, release connections and close the window"""
+        self.remember_column_widths()
+        self.save_session_state()
+        self.catalog_cache.save()
+        if self.page_cache is not None:
+            self.page_cache.close()
+        self.stop_recording()
+        self.close_pools()
+        self.root.destroy()
+
+    def on_record_toggled(self):
+        """Start or stop writing a workload trace"""
+        if not self.record_var.get():
+            self.stop_recording()
+            return
+
+        path = filedialog.asksaveasfilename(
+            title="Record workload trace",
+            defaultextension=".jsonl",
+            filetypes=[("Workload trace", "*.jsonl"), ("All files", "*.*")],
+        )
+        if not path:
+            self.record_var.set(False)
+            return
+        params = self.connection_params or {}
+        self.workload_recorder = WorkloadRecorder(
+            path,
+            server=params.get("server"),
+            read_intent=self.read_intent,
+            read_isolation=self.read_isolation,
+            page_size=self.page_size,
+        )
+        for pool in (self.pool, self.read_pool):
+            if pool is not None:
+                pool.recorder = self.workload_recorder
+
+    def stop_recording(self):
+        """Close the workload trace, if one is being written"""
+        if self.workload_recorder is None:
+            return
+        for pool in (self.pool, self.read_pool):
+            if pool is not None:
+                pool.recorder = None
+        self.workload_recorder.close()
+        self.workload_recorder = None
+        self.record_var.set(False)
+
+    def workload_context(self, with_columns=False):
+        """Where the app is, for a recorded workload step"""
+        context = {
+            "database": self.current_database,
+            "schema": self.current_schema,
+            "table": self.current_table,
+            "page": self.current_page,
+            "page_size": self.page_size,
+            "filter": self.current_filter,
+        }
+        if with_columns:
+            context["columns"] = self.current_columns
+            context["primary_key"] = self.primary_key_columns
+        return context
+
+    @recorded_step("prev_page")
+    def prev_page(self):
+        """Go to previous page"""
+        if self.current_page > 1:
+            self.show_page(self.current_page - 1, self.neighbour_key(forward=False))
+
+    @recorded_step("next_page")
+    def next_page(self):
+        """Go to next page"""
+        if self.current_page < self.total_pages:
+            self.show_page(self.current_page + 1, self.neighbour_key(forward=True))
+
+    def neighbour_key(self, forward):
+        """Highest (forward) or lowest key on screen, to seek the next page from
+
+        None when pages aren't in key order or nothing is loaded.
+        """
+        key_column = self.page_key_column()
+        if not key_column or not len(self.current_data):
+            return None
+        key_index = [col["name"] for col in self.current_columns].index(key_column)
+        key_range = page_key_range(self.current_data, key_index)
+        if key_range is None:
+            return None
+        return key_range[1] if forward else key_range[0]
+
+    def show_page(self, page, seek_from=None):
+        """Load page number `page`; the pager stays where it was if it isn't shown
+
+        With seek_from (a key on the neighbouring page) the page is read by
+        seeking past that key instead of by OFFSET.
+        """
+        previous = self.current_page
+        self.current_page = page
+        if seek_from is not None:
+            self.page_seek = (page, seek_from, page > previous)
+        try:
+            shown = self.load_data(self.current_filter)
+        finally:
+            self.page_seek = None
+        if not shown:
+            self.current_page = previous
+        return shown
+
+    @recorded_step("go_to")
+    def go_to(self):
+        """Jump to a page number, or to the page holding a key value"""
+        target = self.goto_entry.get().strip()
+        if not self.current_table or not target:
+            return
+
+        if self.goto_mode_combo.get() == "Page":
+            try:
+                page = int(target)
+            except ValueError:
+                messagebox.showwarning("Go to", "Please enter a page number.")
+                return
+            self.show_page(max(1, min(page, self.total_pages)))
+            return
+
+        key_column = self.page_key_column()
+        if key_column is None:
+            messagebox.showwarning(
+                "Go to", "Going to a key needs a single-column primary key."
+            )
+            return
+        try:
+            with self.read_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(f"USE [{self.current_database}]")
+                cursor.execute(
+                    build_key_position_query(
+                        self.full_table_name(), self.current_filter, key_column
+                    ),
+                    target,
+                )
+                position = cursor.fetchone()[0]
+        except Exception as e:
+            messagebox.showerror("Go to", f"Failed to find the key:\n{str(e)}")
+            return
+
+        page = position // self.page_size + 1
+        if not self.show_page(page):
+            return
+        if self.current_page != page:
+            messagebox.showinfo("Go to", f"No rows from {key_column} = {target} on.")
+            return
+
+        # The first row at or after the key
+        rows = self.tree.get_children()
+        index = position % self.page_size
+        if index < len(rows):
+            self.tree.selection_set(rows[index])
+            self.tree.see(rows[index])
+
+    @recorded_step("apply_filter")
+    def apply_filter(self):
+        """Apply filter to data"""
+        column = self.filter_column_combo.get()
+        value = self.filter_entry.get().strip()
+
+        if not column or not value:
+            messagebox.showwarning(
+                "Filter", "Please select a column and enter a filter value."
+            )
+            return
+
+        try:
+            # Simple LIKE filter; the advanced filter has more operators
+            where_clause = compile_like_filter(column, value)
+            self.record_filter_usage([column])
+            self.current_filter = where_clause
+            self.current_page = 1  # Reset to first page
+            self.load_data(where_clause)
+
+        except Exception as e:
+            messagebox.showerror("Filter Error", f"Failed to apply filter:\n{str(e)}")
+
+    def open_column_profile(self, refresh=False):
+        """Show the distribution of the filter column without scanning it"""
+        column = self.filter_column_combo.get()
+        if not self.pool or not self.current_table or not column:
+            messagebox.showwarning(
+                "Column Profile", "Please select a table and a filter column first."
+            )
+            return
+
+        data_type = next(
+            col["type"] for col in self.current_columns if col["name"] == column
+        )
+        server = self.connection_params["server"]
+        cache_key = (
+            f"{self.current_database}/{self.current_schema}/"
+            f"{self.current_table}/profile/{column}"
+        )
+        title = f"{self.full_table_name()}.[{column}]"
+
+        def show(profile):
+            ColumnProfileDialog(
+                self.root,
+                title,
+                profile,
+                lambda value: self.apply_profile_filter(column, value),
+                lambda: self.open_column_profile(refresh=True),
+            )
+
+        profile = None if refresh else self.catalog_cache.get(server, cache_key)
+        if profile is not None:
+            show(profile)
+            return
+
+        database = self.current_database
+        full_table_name = self.full_table_name()
+        sample_rows = self.profile_sample_rows
+
+        def work():
+            with self.read_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(f"USE [{database}]")
+                return profile_column(
+                    cursor, full_table_name, column, data_type, sample_rows
+                )
+
+        def done(profile, error):
+            if error:
+                messagebox.showerror(
+                    "Column Profile", f"Failed to profile column:\n{str(error)}"
+                )
+                return
+            self.catalog_cache.put(server, cache_key, profile)
+            self.catalog_cache.save()
+            show(profile)
+
+        self.run_in_background(work, done)
+
+    def load_value_index(self):
+        """Build the filter column's suggestion index from cache or in the background"""
+        column = self.filter_column_combo.get()
+        if not self.pool or not self.current_table or not column:
+            return
+        key = (self.table_key(), column)
+        if key in self.value_indexes:
+            return
+
+        self.value_indexes[key] = None
+        server = self.connection_params["server"]
+        cache_key = (
+            f"{self.current_database}/{self.current_schema}/"
+            f"{self.current_table}/values/{column}"
+        )
+        values = self.catalog_cache.get(server, cache_key)
+        if values is not None:
+            self.value_indexes[key] = PrefixIndex(values)
+            return
+
+        data_type = next(
+            col["type"] for col in self.current_columns if col["name"] == column
+        )
+        database = self.current_database
+        full_table_name = self.full_table_name()
+        limit = self.autocomplete_max_values
+
+        def work():
+            with self.read_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(f"USE [{database}]")
+                return load_distinct_values(
+                    cursor, full_table_name, column, data_type, limit
+                )
+
+        def done(values, error):
+            if error is not None:
+                # A timeout or missing permission: try again on the next visit
+                self.value_indexes.pop(key, None)
+                return
+            if values is None:
+                return  # No suggestions for this column
+            self.catalog_cache.put(server, cache_key, values)
+            self.value_indexes[key] = PrefixIndex(values)
+
+        self.run_in_background(work, done)
+
+    def suggest_filter_values(self, text):
+        """Cached values of the filter column starting with text"""
+        column = self.filter_column_combo.get()
+        if not self.current_table or not column:
+            return []
+        index = self.value_indexes.get((self.table_key(), column))
+        if index is None:
+            self.load_value_index()
+            return []
+        return index.suggest(text)
+
+    def apply_suggested_filter(self, value):
+        """Filter on a picked suggestion as an exact match, not a contains scan"""
+        self.filter_entry.delete(0, tk.END)
+        self.filter_entry.insert(0, value)
+        self.apply_profile_filter(self.filter_column_combo.get(), value)
+
+    @recorded_step("apply_filter")
+    def apply_profile_filter(self, column, value):
+        """Filter on one value picked in a column profile or a suggestion"""
+        if value is None:
+            where_clause = f"[{column}] IS NULL"
+        else:
+            where_clause = compile_conditions([(column, "=", value)])
+        self.record_filter_usage([column])
+        self.current_filter = where_clause
+        self.current_page = 1
+        self.load_data(where_clause)
+
+    @recorded_step("clear_filter")
+    def clear_filter(self):
+        """Clear current filter"""
+        self.filter_entry.delete(0, tk.END)
+        self.current_filter = ""
+        self.current_page = 1
+        self.load_data()
+
+    @recorded_step("refresh")
+    def refresh_data(self):
+        """Refresh current data, refetching the page only if it changed"""
+        if self.refresh_if_unchanged():
+            return
+        # Take watermarks with this load, for the next Refresh to compare
+        self.watermark_refresh = True
+        try:
+            if hasattr(self, "current_filter") and self.current_filter:
+                self.load_data(self.current_filter)
+            else:
+                self.load_data()
+        finally:
+            self.watermark_refresh = False
+
+    def watermark_context(self, where_clause):
+        """What a set of watermarks was captured for"""
+        return (self.table_key(), where_clause, self.current_page, self.page_size)
+
+    def read_table_mark(self, cursor):
+        """MAX(rowversion) and catalog row count, or None without an index on it"""
+        if not self.rowversion_column or not self.rowversion_indexed:
+            return None
+        full_table_name = self.full_table_name()
+        cursor.execute(
+            build_table_watermark_query(full_table_name, self.rowversion_column),
+            full_table_name,
+        )
+        return list(cursor.fetchone())
+
+    def read_page_mark(self, cursor, where_clause, key_range):
+        """CHECKSUM_AGG and row counts of the page's key range, if it has one
+
+        Without a filter the catalog row count is added, so rows added or
+        removed after the page still change the total shown.
+        """
+        if not key_range or not checksum_covers(self.current_columns):
+            return None
+        full_table_name = self.full_table_name()
+        query = build_page_checksum_query(
+            full_table_name, where_clause, self.page_key_column()
+        )
+        cursor.execute(query, key_range[0], *key_range)
+        mark = list(cursor.fetchone())
+        if not where_clause:
+            cursor.execute(TABLE_ROW_COUNT_QUERY, full_table_name)
+            mark.append(cursor.fetchone()[0])
+        return mark
+
+    def capture_watermarks(self, cursor, where_clause):
+        """Record change markers for the page just loaded
+
+        Needs an indexed rowversion column, or a page in key order (a
+        single-column primary key) whose columns BINARY_CHECKSUM all sees;
+        other tables are simply refetched on refresh.
+        """
+        key_range = None
+        key_column = self.page_key_column()
+        if key_column:
+            # Only a page in key order is described by its key range
+            column_names = [col["name"] for col in self.current_columns]
+            key_index = column_names.index(key_column)
+            key_range = page_key_range(self.current_data, key_index)
+
+        table_mark = self.read_table_mark(cursor)
+        page_mark = self.read_page_mark(cursor, where_clause, key_range)
+        if table_mark is None and page_mark is None:
+            return None
+        return {
+            "context": self.watermark_context(where_clause),
+            "table": table_mark,
+            "key_range": list(key_range) if key_range else None,
+            "page": page_mark,
+        }
+
+    def refresh_if_unchanged(self):
+        """Check the loaded page's watermarks; True if no page refetch is needed
+
+        An unchanged rowversion watermark returns right away. Otherwise the
+        page checksum and the counts of its key range and of the rows before
+        it must be unchanged; with a filter, rows added after the page leave
+        the total shown as it was until the next page load.
+        """
+        marks = self.watermarks
+        where_clause = self.current_filter
+        if not marks or marks["context"] != self.watermark_context(where_clause):
+            return False
+
+        try:
+            with self.read_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(f"USE [{self.current_database}]")
+
+                table_mark = self.read_table_mark(cursor)
+                if table_mark is not None and table_mark == marks["table"]:
+                    return True
+
+                page_mark = self.read_page_mark(
+                    cursor, where_clause, marks["key_range"]
+                )
+        except Exception:
+            return False
+
+        if page_mark is None or page_mark != marks["page"]:
+            return False
+        marks["table"] = table_mark
+        return True
+
+    def record_filter_usage(self, columns):
+        """Count filtered columns for the current table (feeds the index advisor)"""
+        full_table_name = f"[{self.current_schema}].[{self.current_table}]"
+        usage = self.filter_column_usage.setdefault(full_table_name, Counter())
+        usage.update(columns)
+
+    def on_summary_clicked(self):
+        """Pick group-by columns and aggregates, or go back to the detail rows"""
+        if self.summary:
+            self.show_detail_rows()
+            return
+        if not self.pool or not self.current_columns:
+            messagebox.showwarning("Summary", "Please select a table first.")
+            return
+        dialog = SummaryDialog(self.root, self.current_columns)
+        if dialog.result:
+            self.show_summary(*dialog.result)
+
+    @recorded_step("summary")
+    def show_summary(self, group_by, aggregates):
+        """Show server-side GROUP BY results of the current filter in the grid"""
+        self.stop_live_mode()
+        self.remember_column_widths()
+        columns = summary_columns(self.current_columns, group_by, aggregates)
+        self.summary = {
+            "group_by": list(group_by),
+            "aggregates": list(aggregates),
+            "columns": columns,
+            "formatters": [
+                (
+                    make_formatter(col["type"], col["scale"], self.display_formats),
+                    col["type"].lower() in MEMOIZED_TYPES,
+                )
+                for col in columns
+            ],
+        }
+        self.summary_button.config(text="Detail Rows")
+        self.current_page = 1
+        self.column_window_start = 0
+        self.load_data(self.current_filter)
+
+    def show_detail_rows(self):
+        """Leave the summary and show the table's rows for the current filter"""
+        self.remember_column_widths()
+        self.summary = None
+        self.summary_button.config(text="Summary")
+        self.current_page = 1
+        self.column_window_start = 0
+        self.load_data(self.current_filter)
+
+    @recorded_step("drill_down")
+    def drill_down(self, event=None):
+        """Show the detail rows behind the double-clicked summary row"""
+        if not self.summary:
+            return
+        selection = self.tree.selection()
+        if not selection:
+            return
+
+        row = self.current_data[self.tree.index(selection[0])]
+        conditions = [f"({self.current_filter})"] if self.current_filter else []
+        for name, value in zip(self.summary["group_by"], row):
+            if value is None:
+                conditions.append(f"[{name}] IS NULL")
+            else:
+                conditions.append(f"[{name}] = {value_literal(value)}")
+        self.record_filter_usage(self.summary["group_by"])
+        self.current_filter = " AND ".join(conditions)
+        self.show_detail_rows()
+
+    def open_index_advisor(self):
+        """Suggest CREATE INDEX scripts for the current table"""
+        if not self.pool or not self.current_table:
+            messagebox.showwarning("Index Advisor", "Please select a table first.")
+            return
+
+        full_table_name = f"[{self.current_schema}].[{self.current_table}]"
+        try:
+            with self.read_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(f"USE [{self.current_database}]")
+
+                cursor.execute(MISSING_INDEX_QUERY, full_table_name)
+                missing_rows = cursor.fetchall()
+
+                cursor.execute(INDEX_USAGE_QUERY, full_table_name)
+                existing_indexes = parse_index_usage(cursor.fetchall())
+
+        except Exception as e:
+            messagebox.showerror(
+                "Index Advisor", f"Failed to read index statistics:\n{str(e)}"
+            )
+            return
+
+        suggestions = rank_index_suggestions(
+            self.current_schema,
+            self.current_table,
+            missing_rows,
+            existing_indexes,
+            self.filter_column_usage.get(full_table_name, Counter()),
+        )
+        IndexAdvisorDialog(self.root, full_table_name, suggestions, existing_indexes)
+
+    def compare_table(self):
+        """Compare the current table (and filter) with its copy in another database"""
+        if not self.pool or not self.current_table:
+            messagebox.showwarning("Compare", "Please select a table first.")
+            return
+        if len(self.primary_key_columns) != 1:
+            messagebox.showwarning(
+                "Compare", "Comparing needs a single-column primary key."
+            )
+            return
+
+        full_table_name = self.full_table_name()
+        target_database = simpledialog.askstring(
+            "Compare",
+            f"Compare {full_table_name} with the same table in database:",
+            parent=self.root,
+        )
+        if not target_database:
+            return
+
+        key_column = self.primary_key_columns[0]
+        key_type = next(
+            col["type"] for col in self.current_columns if col["name"] == key_column
+        )
+        source = TableSide(self.pool, self.current_database, full_table_name)
+        target = TableSide(self.pool, target_database, full_table_name)
+        columns = hashable_columns(self.current_columns)
+        where_clause = self.current_filter
+        # Leave a connection for browsing while the comparison runs
+        dop = max(1, self.pool_size - 1)
+
+        def work():
+            return compare_tables(
+                source, target, columns, key_column, key_type, where_clause, dop=dop
+            )
+
+        def done(result, error):
+            self.root.config(cursor="")
+            if error:
+                messagebox.showerror("Compare", f"Failed to compare:\n{str(error)}")
+                return
+            CompareDialog(
+                self.root,
+                f"[{self.current_database}] vs [{target_database}] {full_table_name}",
+                result,
+            )
+
+        self.root.config(cursor="watch")
+        self.run_in_background(work, done)
+
+    def copy_table_to(self):
+        """Copy the rows matching the current filter into another database"""
+        if not self.pool or not self.current_table:
+            messagebox.showwarning("Copy", "Please select a table first.")
+            return
+        if len(self.primary_key_columns) != 1:
+            messagebox.showwarning("Copy", "Copying needs a single-column primary key.")
+            return
+
+        full_table_name = self.full_table_name()
+        target_database = simpledialog.askstring(
+            "Copy",
+            f"Copy the rows of {full_table_name} matching the current filter "
+            "into the same table in database:",
+            parent=self.root,
+        )
+        if not target_database:
+            return
+
+        key_column = self.primary_key_columns[0]
+        where_clause = self.current_filter
+        source_database = self.current_database
+        target = TableSide(self.pool, target_database, full_table_name)
+        try:
+            target_columns = parse_columns(
+                target.query(COLUMNS_QUERY, (self.current_table, self.current_schema))
+            )
+            target_computed = computed_columns(target)
+            last_key = last_copied_key(target, key_column, where_clause)
+        except Exception as e:
+            messagebox.showerror("Copy", f"Failed to read the target table:\n{str(e)}")
+            return
+
+        mapping = map_columns(self.current_columns, target_columns, target_computed)
+        if key_column not in [name for name, _ in mapping]:
+            messagebox.showerror(
+                "Copy", f"[{target_database}].{full_table_name} has no [{key_column}]."
+            )
+            return
+        resume_after = None
+        if last_key is not None:
+            answer = messagebox.askyesnocancel(
+                "Copy",
+                f"The target already has rows up to {key_column} = {last_key}.\n"
+                "Resume after it?",
+            )
+            if answer is None:
+                return
+            if answer:
+                resume_after = last_key
+
+        # Written by the copy thread, shown by the Tk thread
+        status = {"text": "Starting..."}
+        progress_window = tk.Toplevel(self.root)
+        progress_window.title(f"Copy - {full_table_name} to [{target_database}]")
+        progress_window.transient(self.root)
+        progress_label = ttk.Label(progress_window, padding=20, width=50)
+        progress_label.pack()
+
+        def show_progress():
+            if progress_window.winfo_exists():
+                progress_label.config(text=status["text"])
+                self.root.after(200, show_progress)
+
+        def progress(rows, seconds, last_key):
+            rate = rows / seconds if seconds else 0
+            status["text"] = (
+                f"{rows:,} rows copied, {rate:,.0f} rows/s\n"
+                f"last {key_column} = {last_key}"
+            )
+            status["last_key"] = last_key
+
+        def work():
+            # Reader and writer each hold a connection for the whole copy; a
+            # pool of their own can't starve (or be starved by) browsing
+            copy_pool = ConnectionPool(
+                size=2,
+                **self.connection_params,
+                **self.connection_options,
+                lock_timeout_ms=self.lock_timeout_ms,
+            )
+            try:
+                return copy_table(
+                    TableSide(copy_pool, source_database, full_table_name),
+                    TableSide(copy_pool, target_database, full_table_name),
+                    mapping,
+                    key_column,
+                    where_clause,
+                    resume_after,
+                    progress=progress,
+                )
+            finally:
+                copy_pool.close()
+
+        def done(result, error):
+            progress_window.destroy()
+            if error:
+                last_key = status.get("last_key", resume_after)
+                messagebox.showerror(
+                    "Copy",
+                    f"Copy failed after {key_column} = {last_key}:\n{str(error)}\n\n"
+                    "Copy again to resume from there.",
+                )
+                return
+            messagebox.showinfo(
+                "Copy",
+                f"{result['rows']:,} rows copied in {result['seconds']:.1f}s "
+                f"({result['rows_per_sec']:,.0f} rows/s).",
+            )
+
+        show_progress()
+        self.run_in_background(work, done)
+
+    def get_selected_record(self):
+        """Get currently selected record from treeview"""
+        if self.summary:
+            messagebox.showwarning(
+                "Summary", "Switch back to the detail rows to change records."
+            )
+            return None
+        selection = self.tree.selection()
+        if not selection:
+            messagebox.showwarning("Selection", "Please select a record.")
+            return None
+
+        # Raw values, not the (possibly truncated) display text
+        row = self.current_data[self.tree.index(selection[0])]
+        values = [edit_text(val) for val in row]
+        return dict(zip([col["name"] for col in self.current_columns], values))
+
+    def selected_key(self):
+        """Primary key values of the selected row as read, or None without a key"""
+        if not self.primary_key_columns:
+            messagebox.showwarning(
+                "Selection", "Changing a record needs a table with a primary key."
+            )
+            return None
+        row = self.current_data[self.tree.index(self.tree.selection()[0])]
+        column_names = [col["name"] for col in self.current_columns]
+        return {col: row[column_names.index(col)] for col in self.primary_key_columns}
+
+    def data_engine(self):
+        """DataEngine over the app's pool: the same writes the CLI runs"""
+        return DataEngine(self.pool)
+
+    @recorded_step("add_record")
+    def add_record(self):
+        """Add new record"""
+        if (
+            not self.current_table
+            or not self.current_columns
+            or not self.current_schema
+        ):
+            messagebox.showwarning("Add Record", "Please select a table first.")
+            return
+        if self.summary:
+            messagebox.showwarning(
+                "Summary", "Switch back to the detail rows to change records."
+            )
+            return
+
+        # Create dialog for new record
+        dialog = RecordDialog(self.root, "Add Record", self.current_columns)
+        if dialog.result:
+            try:
+                # The pool rolls the connection back if anything fails
+                self.data_engine().write(
+                    self.current_database,
+                    insert_record,
+                    self.full_table_name(),
+                    dialog.result,
+                )
+
+                self.invalidate_cached_data()
+                messagebox.showinfo("Success", "Record added successfully.")
                 self.refresh_data()
 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to add record:\n{str(e)}")
-                self.connection.rollback()
 
+    @recorded_step("edit_record")
     def edit_record(self):
         """Edit selected record"""
         record = self.get_selected_record()
         if not record:
             return
+        key = self.selected_key()
+        if key is None:
+            return
 
         # Create dialog for editing record
         dialog = RecordDialog(self.root, "Edit Record", self.current_columns, record)
         if dialog.result:
             try:
-                cursor = self.connection.cursor()
-                cursor.execute(f"USE [{self.current_database}]")
-
-                # Use schema.table format
-                full_table_name = f"[{self.current_schema}].[{
-                    self.current_table}]"
-
-                # Build UPDATE query (assuming first column is primary key)
-                pk_column = self.current_columns[0]["name"]
-                pk_value = record[pk_column]
-
-                set_clauses = []
-                values = []
-
-                for col_name, value in dialog.result.items():
-                    if col_name != pk_column:  # Don't update primary key
-                        set_clauses.append(f"[{col_name}] = ?")
-                        values.append(value if value != "" else None)
-
-                if not set_clauses:
+                # Only the fields that were typed over are written back; the
+                # key identifies the row and isn't changed
+                changes = changed_fields(self.current_columns, record, dialog.result)
+                for column in key:
+                    changes.pop(column, None)
+                if not changes:
                     messagebox.showwarning("Edit", "No changes to save.")
                     return
 
-                query = f"UPDATE {full_table_name} SET {
-                    ', '.join(set_clauses)} WHERE [{pk_column}] = ?"
-                values.append(pk_value)
-
-                cursor.execute(query, values)
-                self.connection.commit()
+                self.data_engine().write(
+                    self.current_database,
+                    update_record,
+                    self.full_table_name(),
+                    key,
+                    changes,
+                )
 
+                self.invalidate_cached_data()
                 messagebox.showinfo("Success", "Record updated successfully.")
                 self.refresh_data()
 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to update record:\n{str(e)}")
-                self.connection.rollback()
 
     def connect_to_server(self):
         """Connect to SQL Server"""
         try:
-            # Connection dialog
-            server = simpledialog.askstring("Server Connection", "Enter server name:")
+            # Connection dialog, prefilled from the last session
+            server = simpledialog.askstring(
+                "Server Connection",
+                "Enter server name:",
+                initialvalue=self.session.get("server", ""),
+            )
             if not server:
                 return
 
             username = simpledialog.askstring(
-                "Server Connection", "Enter username (leave empty for Windows Auth):"
+                "Server Connection",
+                "Enter username (leave empty for Windows Auth):",
+                initialvalue=self.session.get("username") or "",
             )
             password = None
 
@@ -615,14 +2660,10 @@ class SQLServerCRUDApp:
                 password = simpledialog.askstring(
                     "Server Connection", "Enter password:", show="*"
                 )
-                conn_str = f"DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={
-                    server};UID={username};PWD={password}"
-            else:
-                conn_str = f"DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={
-                    server};Trusted_Connection=yes"
-            self.connection = pyodbc.connect(conn_str)
-            self.connection_status.config(text=f"Connected to {server}")
-            self.load_databases()
+
+            self.start_session_connection(server, username, password)
+            self.connection_status.config(text=f"Connecting to {server}...")
+            self.wait_for_pool()
 
         except Exception as e:
             messagebox.showerror(
@@ -630,11 +2671,60 @@ class SQLServerCRUDApp:
             )
             self.connection_status.config(text="Connection failed")
 
+    def start_session_connection(self, server, username, password):
+        """Open the pool and queue the last session's selection if it was this server"""
+        self.pending_selection = {}
+        if server == self.session.get("server"):
+            self.pending_selection = {
+                key: self.session.get(key)
+                for key in (
+                    "database",
+                    "schema",
+                    "table",
+                    "filter",
+                    "filter_column",
+                    "filter_value",
+                )
+            }
+
+        # Writes always go to the primary with default isolation
+        self.connection_params = {
+            "server": server,
+            "username": username,
+            "password": password,
+        }
+        self.open_pool()
+
+    def wait_for_pool(self):
+        """Poll the background warmup and load databases once a connection is open"""
+        if not self.pool:
+            return
+        if not self.pool.ready.is_set():
+            self.root.after(50, self.wait_for_pool)
+            return
+
+        if self.pool.warmup_error is not None and not self.pool.idle_count():
+            messagebox.showerror(
+                "Connection Error",
+                f"Failed to connect to server:\n{str(self.pool.warmup_error)}",
+            )
+            self.connection_status.config(text="Connection failed")
+            self.close_pools()
+            return
+
+        server = self.connection_params["server"]
+        self.connection_status.config(text=f"Connected to {server}")
+        self.load_databases()
+
+    @recorded_step("delete_record")
     def delete_record(self):
         """Delete selected record"""
         record = self.get_selected_record()
         if not record:
             return
+        key = self.selected_key()
+        if key is None:
+            return
 
         # Confirm deletion
         if not messagebox.askyesno(
@@ -643,27 +2733,18 @@ class SQLServerCRUDApp:
             return
 
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"USE [{self.current_database}]")
-
-            # Use schema.table format
-            full_table_name = f"[{self.current_schema}].[{self.current_table}]"
-
-            # Build DELETE query (assuming first column is primary key)
-            pk_column = self.current_columns[0]["name"]
-            pk_value = record[pk_column]
-
-            query = f"DELETE FROM {full_table_name} WHERE [{pk_column}] = ?"
-            cursor.execute(query, pk_value)
-            self.connection.commit()
+            self.data_engine().write(
+                self.current_database, delete_record, self.full_table_name(), key
+            )
 
+            self.invalidate_cached_data()
             messagebox.showinfo("Success", "Record deleted successfully.")
             self.refresh_data()
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to delete record:\n{str(e)}")
-            self.connection.rollback()
 
+    @recorded_step("advanced_filter")
     def open_advanced_filter_dialog(self):
         if not self.current_columns:
             messagebox.showwarning("Advanced Filter", "No table selected.")
@@ -672,25 +2753,30 @@ class SQLServerCRUDApp:
         dialog = AdvancedFilterDialog(self.root, self.current_columns)
         if dialog.result:
             # Build WHERE clause from result
-            filters = []
-            for col, op, val in dialog.result:
-                if val.strip() == "":
-                    continue
-                safe_col = f"[{col}]"
-                if op.lower() == "like":
-                    filters.append(f"{safe_col} LIKE '%{val}%'")
-                else:
-                    filters.append(f"{safe_col} {op} '{val}'")
-            where_clause = " AND ".join(filters)
+            where_clause = compile_conditions(dialog.result)
             if where_clause:
+                self.record_filter_usage([col for col, _, _ in dialog.result])
                 self.current_filter = where_clause
                 self.current_page = 1
                 self.load_data(where_clause)
 
 
 class RecordDialog:
+    # Field rows alive at once; scrolling rebinds them to other columns
+    VISIBLE_ROWS = 15
+
     def __init__(self, parent, title, columns, initial_values=None):
         self.result = None
+        self.columns = columns
+        self.values = {}
+        for column in columns:
+            col_name = column["name"]
+            if initial_values and col_name in initial_values:
+                self.values[col_name] = str(initial_values[col_name])
+            else:
+                self.values[col_name] = ""
+        self.shown = list(columns)
+        self.offset = 0
 
         # Create dialog window
         self.dialog = tk.Toplevel(parent)
@@ -708,40 +2794,37 @@ class RecordDialog:
         main_frame = ttk.Frame(self.dialog, padding="10")
         main_frame.pack(fill=tk.BOTH, expand=True)
 
-        # Create scrollable frame for form fields
-        canvas = tk.Canvas(main_frame)
-        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-
-        scrollable_frame.bind(
-            "<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        search_frame = ttk.Frame(main_frame)
+        search_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Label(search_frame, text="Find column:").pack(side=tk.LEFT, padx=(0, 5))
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self.on_search())
+        ttk.Entry(search_frame, textvariable=self.search_var).pack(
+            side=tk.LEFT, fill=tk.X, expand=True
         )
 
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
-        # Form fields
-        self.entries = {}
-        for i, column in enumerate(columns):
-            col_name = column["name"]
-            col_type = column["type"]
-
-            ttk.Label(scrollable_frame, text=f"{col_name} ({col_type}):").grid(
-                row=i, column=0, sticky=tk.W, padx=(0, 10), pady=(0, 5)
-            )
+        # Only VISIBLE_ROWS label/entry pairs exist, whatever the column count
+        fields_frame = ttk.Frame(main_frame)
+        fields_frame.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(
+            main_frame, orient="vertical", command=self.on_scroll
+        )
+        self.scrollbar.pack(side="right", fill="y")
 
-            entry = ttk.Entry(scrollable_frame, width=30)
+        self.rows = []
+        for i in range(min(self.VISIBLE_ROWS, len(columns))):
+            label = ttk.Label(fields_frame)
+            label.grid(row=i, column=0, sticky=tk.W, padx=(0, 10), pady=(0, 5))
+            entry = ttk.Entry(fields_frame, width=30)
             entry.grid(row=i, column=1, sticky=(tk.W, tk.E), pady=(0, 5))
+            self.rows.append((label, entry))
+        self.bound = [None] * len(self.rows)
+        fields_frame.columnconfigure(1, weight=1)
 
-            if initial_values and col_name in initial_values:
-                entry.insert(0, str(initial_values[col_name]))
-
-            self.entries[col_name] = entry
-
-        scrollable_frame.columnconfigure(1, weight=1)
+        self.dialog.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.dialog.bind("<Button-4>", lambda e: self.scroll_to(self.offset - 1))
+        self.dialog.bind("<Button-5>", lambda e: self.scroll_to(self.offset + 1))
+        self.render()
 
         # Buttons
         button_frame = ttk.Frame(self.dialog)
@@ -758,11 +2841,68 @@ class RecordDialog:
         # Wait for dialog to close
         self.dialog.wait_window()
 
+    def store(self):
+        """Keep what was typed into the rows before they are rebound"""
+        for col_name, (_, entry) in zip(self.bound, self.rows):
+            if col_name is not None:
+                self.values[col_name] = entry.get()
+
+    def render(self):
+        """Bind the field rows to the columns at the current offset"""
+        self.store()
+        self.offset = max(0, min(self.offset, len(self.shown) - len(self.rows)))
+        for n, (label, entry) in enumerate(self.rows):
+            index = self.offset + n
+            if index >= len(self.shown):
+                label.grid_remove()
+                entry.grid_remove()
+                self.bound[n] = None
+                continue
+
+            column = self.shown[index]
+            label.config(text=f"{column['name']} ({column['type']}):")
+            entry.delete(0, tk.END)
+            entry.insert(0, self.values[column["name"]])
+            label.grid()
+            entry.grid()
+            self.bound[n] = column["name"]
+
+        if self.shown:
+            self.scrollbar.set(
+                self.offset / len(self.shown),
+                min(1.0, (self.offset + len(self.rows)) / len(self.shown)),
+            )
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, offset):
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def on_scroll(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.shown)))
+        else:
+            step = int(args[1]) * (len(self.rows) if args[2] == "pages" else 1)
+            self.scroll_to(self.offset + step)
+
+    def on_mouse_wheel(self, event):
+        self.scroll_to(self.offset - (1 if event.delta > 0 else -1))
+
+    def on_search(self):
+        """Show only the columns whose name contains the search text"""
+        text = self.search_var.get().strip().lower()
+        self.shown = [col for col in self.columns if text in col["name"].lower()]
+        self.offset = 0
+        self.render()
+
     def save(self):
         """Save form data"""
+        self.store()
         self.result = {}
-        for col_name, entry in self.entries.items():
-            self.result[col_name] = entry.get()
+        for column in self.columns:
+            self.result[column["name"]] = self.values[column["name"]]
         self.dialog.destroy()
 
     def cancel(self):
@@ -772,48 +2912,56 @@ class RecordDialog:
 
 
 class AdvancedFilterDialog:
+    OPERATORS = FILTER_OPERATORS
+
     def __init__(self, parent, columns):
         self.result = None
+        self.column_names = [col["name"] for col in columns]
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Advanced Filter")
-        self.dialog.geometry("500x600")
+        self.dialog.geometry("650x600")
         self.dialog.transient(parent)
         self.dialog.grab_set()
 
         frame = ttk.Frame(self.dialog, padding=10)
         frame.pack(fill=tk.BOTH, expand=True)
 
+        # Searchable column list; a single Listbox whatever the column count
+        list_frame = ttk.Frame(frame)
+        list_frame.pack(side="left", fill="y", padx=(0, 10))
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self.on_search())
+        ttk.Entry(list_frame, textvariable=self.search_var).pack(fill=tk.X)
+
+        self.column_list = tk.Listbox(list_frame, width=25, exportselection=False)
+        list_scrollbar = ttk.Scrollbar(
+            list_frame, orient="vertical", command=self.column_list.yview
+        )
+        self.column_list.configure(yscrollcommand=list_scrollbar.set)
+        ttk.Button(
+            list_frame, text="Add condition", command=self.add_selected
+        ).pack(side="bottom", fill=tk.X, pady=(5, 0))
+        self.column_list.pack(side="left", fill="y", pady=(5, 0))
+        list_scrollbar.pack(side="right", fill="y", pady=(5, 0))
+        self.column_list.bind("<Double-1>", lambda e: self.add_selected())
+        self.column_list.bind("<Return>", lambda e: self.add_selected())
+        self.on_search()
+
+        # Conditions: widgets exist only for columns added to the filter
         canvas = tk.Canvas(frame)
         scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
-        scroll_frame = ttk.Frame(canvas)
+        self.scroll_frame = ttk.Frame(canvas)
 
-        scroll_frame.bind(
+        self.scroll_frame.bind(
             "<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
         )
-        canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
+        canvas.create_window((0, 0), window=self.scroll_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
 
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
         self.entries = []
-        operators = ["=", "!=", ">", "<", ">=", "<=", "LIKE"]
-
-        for i, col in enumerate(columns):
-            ttk.Label(scroll_frame, text=col["name"]).grid(
-                row=i, column=0, padx=5, pady=5, sticky=tk.W
-            )
-
-            op_cb = ttk.Combobox(
-                scroll_frame, values=operators, state="readonly", width=5
-            )
-            op_cb.grid(row=i, column=1, padx=5, pady=5)
-            op_cb.set("=")
-
-            val_entry = ttk.Entry(scroll_frame, width=20)
-            val_entry.grid(row=i, column=2, padx=5, pady=5)
-
-            self.entries.append((col["name"], op_cb, val_entry))
 
         # Buttons
         btn_frame = ttk.Frame(self.dialog)
@@ -826,6 +2974,45 @@ class AdvancedFilterDialog:
         self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
         self.dialog.wait_window()
 
+    def on_search(self):
+        """Show only the columns whose name contains the search text"""
+        text = self.search_var.get().strip().lower()
+        self.column_list.delete(0, tk.END)
+        self.column_list.insert(
+            tk.END, *[name for name in self.column_names if text in name.lower()]
+        )
+        if self.column_list.size():
+            self.column_list.selection_set(0)
+
+    def add_selected(self):
+        selection = self.column_list.curselection()
+        if selection:
+            self.add_condition(self.column_list.get(selection[0]))
+
+    def add_condition(self, col_name):
+        """Materialize the operator and value fields for one column"""
+        row = ttk.Frame(self.scroll_frame)
+        row.pack(fill=tk.X)
+        ttk.Label(row, text=col_name, width=20).pack(side=tk.LEFT, padx=5, pady=5)
+
+        op_cb = ttk.Combobox(row, values=self.OPERATORS, state="readonly", width=5)
+        op_cb.pack(side=tk.LEFT, padx=5, pady=5)
+        op_cb.set("=")
+
+        val_entry = ttk.Entry(row, width=20)
+        val_entry.pack(side=tk.LEFT, padx=5, pady=5)
+        val_entry.focus_set()
+
+        entry = (col_name, op_cb, val_entry)
+        ttk.Button(
+            row, text="Remove", command=lambda: self.remove_condition(entry, row)
+        ).pack(side=tk.LEFT, padx=5, pady=5)
+        self.entries.append(entry)
+
+    def remove_condition(self, entry, row):
+        self.entries.remove(entry)
+        row.destroy()
+
     def apply(self):
         self.result = []
         for col, op_cb, val_entry in self.entries:
@@ -840,6 +3027,617 @@ class AdvancedFilterDialog:
         self.dialog.destroy()
 
 
+class SummaryDialog:
+    FUNCTIONS = AGGREGATE_FUNCTIONS
+
+    def __init__(self, parent, columns):
+        self.result = None
+        self.column_names = [col["name"] for col in columns]
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Summary")
+        self.dialog.geometry("600x450")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+
+        frame = ttk.Frame(self.dialog, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        # Group-by columns, in the order they were selected
+        list_frame = ttk.Frame(frame)
+        list_frame.pack(side="left", fill="y", padx=(0, 10))
+        ttk.Label(list_frame, text="Group by").pack(anchor=tk.W)
+        self.group_list = tk.Listbox(
+            list_frame, width=25, selectmode=tk.MULTIPLE, exportselection=False
+        )
+        list_scrollbar = ttk.Scrollbar(
+            list_frame, orient="vertical", command=self.group_list.yview
+        )
+        self.group_list.configure(yscrollcommand=list_scrollbar.set)
+        self.group_list.insert(tk.END, *self.column_names)
+        self.group_list.pack(side="left", fill="y", pady=(5, 0))
+        list_scrollbar.pack(side="right", fill="y", pady=(5, 0))
+        self.group_order = []
+        self.group_list.bind("<<ListboxSelect>>", self.on_group_selected)
+
+        # Aggregates
+        self.aggregate_frame = ttk.Frame(frame)
+        self.aggregate_frame.pack(side="left", fill="both", expand=True)
+        ttk.Label(self.aggregate_frame, text="Aggregates").pack(anchor=tk.W)
+        ttk.Button(
+            self.aggregate_frame, text="Add aggregate", command=self.add_aggregate
+        ).pack(side="bottom", anchor=tk.W, pady=(5, 0))
+        self.aggregates = []
+        self.add_aggregate("COUNT", "*")
+
+        btn_frame = ttk.Frame(self.dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(btn_frame, text="Show", command=self.apply).pack(
+            side=tk.RIGHT, padx=5
+        )
+        ttk.Button(btn_frame, text="Cancel", command=self.cancel).pack(side=tk.RIGHT)
+
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
+        self.dialog.wait_window()
+
+    def on_group_selected(self, event):
+        selected = [self.group_list.get(i) for i in self.group_list.curselection()]
+        self.group_order = [name for name in self.group_order if name in selected]
+        self.group_order += [name for name in selected if name not in self.group_order]
+
+    def add_aggregate(self, function="SUM", column=None):
+        row = ttk.Frame(self.aggregate_frame)
+        row.pack(fill=tk.X)
+        function_cb = ttk.Combobox(
+            row, values=self.FUNCTIONS, state="readonly", width=7
+        )
+        function_cb.pack(side=tk.LEFT, padx=5, pady=5)
+        function_cb.set(function)
+        column_cb = ttk.Combobox(
+            row, values=["*"] + self.column_names, state="readonly", width=25
+        )
+        column_cb.pack(side=tk.LEFT, padx=5, pady=5)
+        column_cb.set(column or "")
+
+        entry = (function_cb, column_cb)
+        ttk.Button(
+            row, text="Remove", command=lambda: self.remove_aggregate(entry, row)
+        ).pack(side=tk.LEFT, padx=5, pady=5)
+        self.aggregates.append(entry)
+
+    def remove_aggregate(self, entry, row):
+        self.aggregates.remove(entry)
+        row.destroy()
+
+    def apply(self):
+        if not self.group_order:
+            messagebox.showwarning(
+                "Summary",
+                "Please select at least one column to group by.",
+                parent=self.dialog,
+            )
+            return
+        aggregates = []
+        for function_cb, column_cb in self.aggregates:
+            function, column = function_cb.get(), column_cb.get()
+            if not column:
+                continue
+            if column == "*":
+                if function != "COUNT":
+                    messagebox.showwarning(
+                        "Summary", f"{function} needs a column.", parent=self.dialog
+                    )
+                    return
+                column = None
+            aggregates.append((function, column))
+        self.result = (self.group_order, aggregates)
+        self.dialog.destroy()
+
+    def cancel(self):
+        self.result = None
+        self.dialog.destroy()
+
+
+class CostGuardDialog:
+    def __init__(
+        self, parent, cost, rows, suggestions, can_use_prefix, timeout, maxdop
+    ):
+        self.result = None
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Expensive Query")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+
+        frame = ttk.Frame(self.dialog, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        message = (
+            "This query is estimated to be expensive:\n\n"
+            f"Estimated cost: {cost:,.2f}\n"
+            f"Estimated rows read: {rows:,.0f}"
+        )
+        if suggestions:
+            message += "\n\nCheaper alternatives:\n" + "\n".join(
+                f"- {suggestion}" for suggestion in suggestions
+            )
+        ttk.Label(frame, text=message, justify=tk.LEFT, wraplength=450).pack(
+            anchor=tk.W
+        )
+
+        btn_frame = ttk.Frame(self.dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(btn_frame, text="Cancel", command=self.cancel).pack(side=tk.RIGHT)
+        ttk.Button(
+            btn_frame, text="Run Anyway", command=lambda: self.choose("run")
+        ).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(
+            btn_frame,
+            text=f"Run with Limits ({timeout}s, MAXDOP {maxdop})",
+            command=lambda: self.choose("limited"),
+        ).pack(side=tk.RIGHT, padx=5)
+        if can_use_prefix:
+            ttk.Button(
+                btn_frame,
+                text="Use Prefix Match",
+                command=lambda: self.choose("prefix"),
+            ).pack(side=tk.RIGHT, padx=5)
+
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
+        self.dialog.wait_window()
+
+    def choose(self, result):
+        self.result = result
+        self.dialog.destroy()
+
+    def cancel(self):
+        self.result = None
+        self.dialog.destroy()
+
+
+class IndexAdvisorDialog:
+    def __init__(self, parent, table_name, suggestions, existing_indexes):
+        self.suggestions = suggestions
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(f"Index Advisor - {table_name}")
+        self.dialog.geometry("800x600")
+        self.dialog.transient(parent)
+
+        frame = ttk.Frame(self.dialog, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        # Existing indexes and how they are used
+        ttk.Label(frame, text="Existing indexes").pack(anchor=tk.W)
+        usage_tree = ttk.Treeview(
+            frame,
+            columns=("name", "keys", "seeks", "scans", "lookups", "updates"),
+            show="headings",
+            height=5,
+        )
+        for col, width in (
+            ("name", 200),
+            ("keys", 250),
+            ("seeks", 70),
+            ("scans", 70),
+            ("lookups", 70),
+            ("updates", 70),
+        ):
+            usage_tree.heading(col, text=col.capitalize())
+            usage_tree.column(col, width=width)
+        for index in existing_indexes:
+            usage_tree.insert(
+                "",
+                "end",
+                values=(
+                    index["name"],
+                    ", ".join(index["key_columns"]),
+                    index["seeks"],
+                    index["scans"],
+                    index["lookups"],
+                    index["updates"],
+                ),
+            )
+        usage_tree.pack(fill=tk.X, pady=(0, 10))
+
+        # Ranked suggestions
+        ttk.Label(frame, text="Suggested indexes (not executed)").pack(anchor=tk.W)
+        self.suggestion_tree = ttk.Treeview(
+            frame, columns=("impact", "source", "keys", "detail"), show="headings"
+        )
+        for col, width in (
+            ("impact", 90),
+            ("source", 130),
+            ("keys", 220),
+            ("detail", 280),
+        ):
+            self.suggestion_tree.heading(col, text=col.capitalize())
+            self.suggestion_tree.column(col, width=width)
+        for i, suggestion in enumerate(suggestions):
+            self.suggestion_tree.insert(
+                "",
+                "end",
+                iid=str(i),
+                values=(
+                    f"{suggestion['impact']:,.1f}",
+                    suggestion["source"],
+                    ", ".join(suggestion["key_columns"]),
+                    suggestion["detail"],
+                ),
+            )
+        self.suggestion_tree.pack(fill=tk.BOTH, expand=True)
+        self.suggestion_tree.bind("<<TreeviewSelect>>", self.on_suggestion_selected)
+
+        self.script_text = tk.Text(frame, height=6, wrap="none")
+        self.script_text.pack(fill=tk.X, pady=(10, 0))
+        if not suggestions:
+            self.script_text.insert("1.0", "-- No index suggestions for this table.")
+
+        btn_frame = ttk.Frame(self.dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(btn_frame, text="Close", command=self.dialog.destroy).pack(
+            side=tk.RIGHT
+        )
+        ttk.Button(btn_frame, text="Copy All Scripts", command=self.copy_scripts).pack(
+            side=tk.RIGHT, padx=5
+        )
+
+        if suggestions:
+            self.suggestion_tree.selection_set("0")
+
+    def on_suggestion_selected(self, event):
+        """Show the script for the selected suggestion"""
+        selection = self.suggestion_tree.selection()
+        if not selection:
+            return
+        self.script_text.delete("1.0", tk.END)
+        self.script_text.insert("1.0", self.suggestions[int(selection[0])]["script"])
+
+    def copy_scripts(self):
+        """Copy every suggested script, best first, to the clipboard"""
+        scripts = "\n\nGO\n\n".join(s["script"] for s in self.suggestions)
+        self.dialog.clipboard_clear()
+        self.dialog.clipboard_append(scripts)
+
+
+class SchemaOverviewDialog:
+    COLUMNS = (
+        ("table", "Table", 220),
+        ("rows", "Rows", 100),
+        ("reserved", "Reserved (KB)", 100),
+        ("used", "Used (KB)", 100),
+        ("indexes", "Indexes", 70),
+        ("modified", "Schema Modified", 140),
+        ("updated", "Last Update", 140),
+    )
+
+    def __init__(self, parent, schema_name, rows, open_callback):
+        self.open_callback = open_callback
+        self.rows = [
+            (
+                row[0],
+                row[1],
+                row[2],
+                row[3],
+                row[4],
+                str(row[5])[:19] if row[5] else "",
+                str(row[6])[:19] if row[6] else "",
+            )
+            for row in rows
+        ]
+        self.sort_column = None
+        self.sort_reverse = False
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(f"Schema Overview - {schema_name}")
+        self.dialog.geometry("900x500")
+        self.dialog.transient(parent)
+
+        frame = ttk.Frame(self.dialog, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(
+            frame, columns=[col for col, _, _ in self.COLUMNS], show="headings"
+        )
+        for i, (col, text, width) in enumerate(self.COLUMNS):
+            self.tree.heading(col, text=text, command=lambda i=i: self.sort_by(i))
+            self.tree.column(col, width=width, anchor=tk.W if i == 0 else tk.E)
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.tree.bind("<Double-1>", lambda e: self.open_selected())
+
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        btn_frame = ttk.Frame(self.dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        self.summary_label = ttk.Label(btn_frame)
+        self.summary_label.pack(side=tk.LEFT)
+        ttk.Button(btn_frame, text="Close", command=self.dialog.destroy).pack(
+            side=tk.RIGHT
+        )
+        ttk.Button(btn_frame, text="Open Table", command=self.open_selected).pack(
+            side=tk.RIGHT, padx=5
+        )
+
+        total_kb = sum(row[2] for row in self.rows)
+        self.summary_label.config(
+            text=f"{len(self.rows)} tables, {total_kb / 1024:,.1f} MB reserved"
+        )
+        self.populate()
+
+    def populate(self):
+        """Fill the grid from the (already sorted) rows"""
+        self.tree.delete(*self.tree.get_children())
+        for row in self.rows:
+            values = (row[0], f"{row[1]:,}", f"{row[2]:,}", f"{row[3]:,}") + row[4:]
+            self.tree.insert("", "end", iid=row[0], values=values)
+
+    def sort_by(self, index):
+        """Sort on a column client-side; clicking again reverses the order"""
+        if self.sort_column == index:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = index
+            # Sizes and counts are most useful largest-first
+            self.sort_reverse = index != 0
+        self.rows.sort(key=lambda row: row[index], reverse=self.sort_reverse)
+        self.populate()
+
+    def open_selected(self):
+        """Open the selected table in the main window"""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        self.open_callback(selection[0])
+        self.dialog.destroy()
+
+
+class SuggestionPopup:
+    """Drop-down list of suggestions under an entry, refreshed as the user types"""
+
+    VISIBLE_ROWS = 10
+
+    def __init__(self, entry, suggest, on_pick):
+        self.entry = entry
+        self.suggest = suggest
+        self.on_pick = on_pick
+        self.popup = None
+        self.listbox = None
+
+        entry.bind("<KeyRelease>", self.on_key_release, add="+")
+        entry.bind("<Down>", self.focus_list, add="+")
+        entry.bind("<Escape>", lambda e: self.hide(), add="+")
+        entry.bind("<Return>", lambda e: self.hide(), add="+")
+        entry.bind("<FocusOut>", self.on_focus_out, add="+")
+
+    def on_key_release(self, event):
+        if event.keysym in ("Down", "Up", "Return", "Escape", "Tab"):
+            return
+        text = self.entry.get()
+        values = self.suggest(text) if text else []
+        if values:
+            self.show(values)
+        else:
+            self.hide()
+
+    def show(self, values):
+        if self.popup is None:
+            self.popup = tk.Toplevel(self.entry)
+            self.popup.wm_overrideredirect(True)
+            self.listbox = tk.Listbox(self.popup, height=self.VISIBLE_ROWS)
+            self.listbox.pack(fill=tk.BOTH, expand=True)
+            self.listbox.bind("<Return>", lambda e: self.pick())
+            self.listbox.bind("<Double-1>", lambda e: self.pick())
+            self.listbox.bind("<Escape>", lambda e: self.close_list())
+            self.listbox.bind("<FocusOut>", self.on_focus_out)
+        self.listbox.delete(0, tk.END)
+        for value in values:
+            self.listbox.insert(tk.END, value)
+        self.listbox.config(height=min(len(values), self.VISIBLE_ROWS))
+        x = self.entry.winfo_rootx()
+        y = self.entry.winfo_rooty() + self.entry.winfo_height()
+        width, height = self.entry.winfo_width(), self.listbox.winfo_reqheight()
+        self.popup.geometry(f"{width}x{height}+{x}+{y}")
+        self.popup.deiconify()
+        self.popup.lift()
+
+    def hide(self):
+        if self.popup is not None:
+            self.popup.withdraw()
+
+    def focus_list(self, event):
+        if self.popup is None or not self.popup.winfo_viewable():
+            return
+        self.listbox.focus_set()
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(0)
+        self.listbox.activate(0)
+        return "break"
+
+    def close_list(self):
+        self.hide()
+        self.entry.focus_set()
+
+    def on_focus_out(self, event):
+        # Focus moves between the entry and the list without closing the popup
+        self.entry.after(1, self.hide_unless_focused)
+
+    def hide_unless_focused(self):
+        try:
+            focused = self.entry.focus_get()
+        except KeyError:
+            focused = None
+        if focused not in (self.entry, self.listbox):
+            self.hide()
+
+    def pick(self):
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        value = self.listbox.get(selection[0])
+        self.close_list()
+        self.on_pick(value)
+
+
+class ColumnProfileDialog:
+    def __init__(self, parent, column_name, profile, filter_callback, refresh_callback):
+        self.profile = profile
+        self.filter_callback = filter_callback
+        self.refresh_callback = refresh_callback
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(f"Column Profile - {column_name}")
+        self.dialog.geometry("500x500")
+        self.dialog.transient(parent)
+
+        frame = ttk.Frame(self.dialog, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        def shown(value):
+            return "NULL" if value is None else value
+
+        summary = [
+            ("Source", profile["source"]),
+            ("Rows", f"{profile['rows']:,}"),
+            ("Nulls", f"{profile['nulls']:,} ({profile['null_fraction']:.1%})"),
+            ("Distinct (approx.)", f"{profile['distinct']:,}"),
+            ("Min", shown(profile["min"])),
+            ("Max", shown(profile["max"])),
+        ]
+        if profile.get("updated"):
+            summary.append(("Statistics updated", profile["updated"][:19]))
+        for row, (label, value) in enumerate(summary):
+            ttk.Label(frame, text=f"{label}:").grid(row=row, column=0, sticky=tk.W)
+            ttk.Label(frame, text=value).grid(row=row, column=1, sticky=tk.W, padx=5)
+
+        top_row = len(summary)
+        ttk.Label(frame, text="Top values (double-click to filter)").grid(
+            row=top_row, column=0, columnspan=2, sticky=tk.W, pady=(10, 0)
+        )
+        self.tree = ttk.Treeview(
+            frame, columns=("value", "rows", "share"), show="headings"
+        )
+        for col, text, width in (
+            ("value", "Value", 250),
+            ("rows", "Rows (approx.)", 110),
+            ("share", "Share", 70),
+        ):
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=width, anchor=tk.W if col == "value" else tk.E)
+        total = profile["rows"] or 1
+        for i, (value, count) in enumerate(profile["top"]):
+            self.tree.insert(
+                "",
+                "end",
+                iid=str(i),
+                values=(shown(value), f"{count:,}", f"{count / total:.1%}"),
+            )
+        self.tree.grid(
+            row=top_row + 1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S)
+        )
+        self.tree.bind("<Double-1>", lambda e: self.filter_selected())
+        frame.columnconfigure(1, weight=1)
+        frame.rowconfigure(top_row + 1, weight=1)
+
+        btn_frame = ttk.Frame(self.dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(btn_frame, text="Close", command=self.dialog.destroy).pack(
+            side=tk.RIGHT
+        )
+        ttk.Button(btn_frame, text="Filter", command=self.filter_selected).pack(
+            side=tk.RIGHT, padx=5
+        )
+        ttk.Button(btn_frame, text="Refresh", command=self.refresh).pack(
+            side=tk.LEFT
+        )
+
+    def filter_selected(self):
+        """Apply the selected value as a filter on the main grid"""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        self.filter_callback(self.profile["top"][int(selection[0])][0])
+
+    def refresh(self):
+        """Recompute the profile instead of using the cached one"""
+        self.dialog.destroy()
+        self.refresh_callback()
+
+
+class CompareDialog:
+    def __init__(self, parent, title, result):
+        columns = result["columns"]
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(f"Compare - {title}")
+        self.dialog.geometry("900x500")
+        self.dialog.transient(parent)
+
+        frame = ttk.Frame(self.dialog, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(
+            frame, columns=["difference", "side"] + columns, show="headings"
+        )
+        self.tree.heading("difference", text="Difference")
+        self.tree.column("difference", width=200)
+        self.tree.heading("side", text="Side")
+        self.tree.column("side", width=60)
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=100)
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        v_scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        h_scrollbar = ttk.Scrollbar(
+            frame, orient=tk.HORIZONTAL, command=self.tree.xview
+        )
+        h_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        self.tree.configure(
+            yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set
+        )
+
+        def display(row):
+            return ["NULL" if value is None else str(value) for value in row]
+
+        for row in result["missing_in_target"]:
+            self.tree.insert(
+                "", "end", values=["Missing in target", "source"] + display(row)
+            )
+        for row in result["missing_in_source"]:
+            self.tree.insert(
+                "", "end", values=["Missing in source", "target"] + display(row)
+            )
+        for ours, theirs in result["changed"]:
+            difference = "Changed: " + ", ".join(changed_columns(columns, ours, theirs))
+            self.tree.insert("", "end", values=[difference, "source"] + display(ours))
+            self.tree.insert("", "end", values=[difference, "target"] + display(theirs))
+
+        btn_frame = ttk.Frame(self.dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        differences = (
+            len(result["missing_in_target"])
+            + len(result["missing_in_source"])
+            + len(result["changed"])
+        )
+        ttk.Label(
+            btn_frame,
+            text=(
+                f"{differences:,} differing rows, {result['ranges_hashed']:,} "
+                f"key ranges hashed, {result['keys_compared']:,} keys compared "
+                f"in {result['seconds']:.1f}s"
+            ),
+        ).pack(side=tk.LEFT)
+        ttk.Button(btn_frame, text="Close", command=self.dialog.destroy).pack(
+            side=tk.RIGHT
+        )
+
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = SQLServerCRUDApp(root)
@@ -0,0 +1,412 @@
+"""Latency benchmarks for the engine and grid against a local SQLite stand-in
+
+    python benchmark.py                      # run and check thresholds
+    python benchmark.py --sizes small wide   # only some table sizes
+    python benchmark.py --write-thresholds   # record current p95 x 2 as limits
+    python benchmark.py --require-display    # fail if the grid can't be measured
+
+Thresholds are machine specific; record them on the machine that checks them.
+The grid scenarios (load_data, render, refresh, autosize) need a display;
+without $DISPLAY an installed Xvfb is started for the run, otherwise they are
+skipped, which --require-display turns into a failure.
+Exits with status 1 when a p95 latency exceeds its threshold.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from engine import DataEngine, build_page_query, compile_like_filter, quote_table
+from fake_sqlserver import FakeServer
+from formatters import MEMOIZED_TYPES, make_formatter
+from row_buffer import ColumnarPage
+
+THRESHOLDS_PATH = Path(__file__).with_name("benchmark_thresholds.json")
+
+# name -> (rows, columns)
+SIZES = {
+    "small": (1_000, 8),
+    "medium": (50_000, 12),
+    "wide": (2_000, 400),
+}
+
+# Column types cycled through by the synthetic tables
+COLUMN_TYPES = [
+    ("nvarchar", None),  # low cardinality
+    ("int", None),
+    ("datetime2", None),
+    ("decimal", 2),
+    ("nvarchar", None),  # high cardinality
+    ("float", None),
+    ("bit", None),
+]
+
+CATEGORIES = ["Open", "Closed", "Pending", "Cancelled", "On hold"]
+
+# Methods of SQLServerCRUDApp that load a page without touching a widget
+PAGE_METHODS = (
+    "read_page",
+    "read_connection",
+    "get_read_pool",
+    "uses_separate_read_connection",
+    "read_table_validator",
+    "check_query_cost",
+    "cost_guard_key",
+    "fetch_page",
+    "build_count_query",
+    "build_data_query",
+    "current_seek",
+    "data_query_params",
+    "page_key_column",
+    "full_table_name",
+    "grid_columns",
+    "table_key",
+)
+
+# Scenarios measured on a hidden Treeview
+GRID_SCENARIOS = ("load_data", "render", "refresh", "autosize")
+
+# Methods that render the page into the Treeview
+GRID_METHODS = (
+    "load_data",
+    "update_treeview",
+    "update_pagination_controls",
+    "tree_row_items",
+    "autosize_tree_columns",
+    "shown_column_indexes",
+    "is_wide_table",
+    "table_pinned_columns",
+    "column_window_size",
+    "update_column_scrollbar",
+)
+
+
+
+def synthetic_value(data_type, column_index, row_index, rng):
+    if rng.random() < 0.05:
+        return None
+    if data_type == "int":
+        return rng.randint(0, 1_000_000)
+    if data_type == "datetime2":
+        return datetime(2020, 1, 1) + timedelta(seconds=rng.randint(0, 10**8))
+    if data_type == "decimal":
+        return Decimal(rng.randint(0, 10**7)) / 100
+    if data_type == "float":
+        return rng.random() * 1000
+    if data_type == "bit":
+        return rng.randint(0, 1)
+    if column_index % len(COLUMN_TYPES) == 0:
+        return CATEGORIES[row_index % len(CATEGORIES)]
+    return f"value {row_index}-{rng.randint(0, 10**6)}"
+
+
+def create_synthetic_table(server, table, rows, columns, seed=0):
+    """Create dbo.<table> with an int key and `columns` typed columns"""
+    rng = random.Random(seed)
+    definitions = [("Id", "int", None)]
+    for n in range(columns - 1):
+        data_type, scale = COLUMN_TYPES[n % len(COLUMN_TYPES)]
+        definitions.append((f"Col{n}_{data_type}", data_type, scale))
+    server.create_table("dbo", table, definitions, primary_key=["Id"])
+
+    batch = []
+    for row_index in range(rows):
+        row = [row_index + 1]
+        for n, (_, data_type, _) in enumerate(definitions[1:]):
+            row.append(synthetic_value(data_type, n, row_index, rng))
+        batch.append(row)
+        if len(batch) == 5000:
+            server.insert_rows("dbo", table, batch)
+            batch = []
+    if batch:
+        server.insert_rows("dbo", table, batch)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def start_xvfb():
+    """Start Xvfb when there is no display and it is installed; the process"""
+    if os.environ.get("DISPLAY") or not shutil.which("Xvfb"):
+        return None
+    # Xvfb picks a free display and writes its number once it accepts clients
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen(
+        ["Xvfb", "-displayfd", str(write_fd), "-screen", "0", "1280x1024x24"],
+        pass_fds=(write_fd,),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        number = pipe.readline().strip()
+    if not number:
+        process.wait()
+        return None
+    os.environ["DISPLAY"] = f":{number}"
+    return process
+
+
+def make_app(with_grid):
+    """An object running the app's own paging (and rendering) methods
+
+    with_grid adds a hidden Treeview and the pager widgets; None when that
+    needs a display and there is none.
+    """
+    import app_adv_filter
+    from app_adv_filter import SQLServerCRUDApp
+
+    names = PAGE_METHODS + (GRID_METHODS if with_grid else ())
+    App = type("App", (), {name: getattr(SQLServerCRUDApp, name) for name in names})
+    app = App()
+    app.pool = None
+    app.read_pool = None
+    app.read_intent = False
+    app.read_isolation = "Read Committed"
+    # The stand-in has no SHOWPLAN, usage stats or CHECKSUM_AGG
+    app.cost_guard_enabled = False
+    app.page_cache_enabled = False
+    app.change_detection_enabled = False
+    app.watermarks = None
+    app.summary = None
+    app.current_database, app.current_schema = "bench", "dbo"
+    app.current_table_type = "BASE TABLE"
+    app.current_page, app.total_pages = 1, 1
+    app.page_seek = None
+    app.current_filter = ""
+    app.pinned_columns = {}
+    app.wide_table_columns = 40
+    app.column_window_start = 0
+    app.unpinned_column_count = 0
+    if not with_grid:
+        return app
+
+    import tkinter as tk
+    from tkinter import ttk
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    root.withdraw()
+
+    # A failed load must fail the run, not wait on an error dialog nobody sees
+    def raise_error(title, message, **options):
+        raise RuntimeError(f"{title}: {message}")
+
+    app_adv_filter.messagebox.showerror = raise_error
+
+    app.root = root
+    app.tree = ttk.Treeview(root)
+    app.h_scrollbar = ttk.Scrollbar(root, orient=tk.HORIZONTAL)
+    app.page_label = ttk.Label(root)
+    app.records_label = ttk.Label(root)
+    app.active_filter_label = ttk.Label(root)
+    app.prev_button = ttk.Button(root)
+    app.next_button = ttk.Button(root)
+    reset_grid(app)
+    return app
+
+
+def reset_grid(app):
+    app.tree.delete(*app.tree.get_children())
+    app.tree["columns"] = ()
+    app.tree_rows = {}
+    app.tree_table_key = None
+    app.column_widths = {}
+
+
+def run_size(name, rows, columns, page_size, repeat, pager, grid):
+    server = FakeServer()
+    table = f"Bench_{name}"
+    create_synthetic_table(server, table, rows, columns)
+    engine = DataEngine(server.pool())
+    full_table_name = quote_table("dbo", table)
+    structure = engine.table_structure("bench", "dbo", table)
+    last_page = max(1, -(-rows // page_size))
+    results = {}
+
+    def page_load():
+        engine.count("bench", full_table_name)
+        engine.fetch_page("bench", full_table_name, "", 1, page_size)
+
+    def deep_page():
+        engine.fetch_page("bench", full_table_name, "", last_page, page_size)
+
+    def deep_page_by_key():
+        engine.fetch_page("bench", full_table_name, "", last_page, page_size, "Id")
+
+    def filtered():
+        where_clause = compile_like_filter(structure["columns"][1]["name"], "Open")
+        engine.count("bench", full_table_name, where_clause)
+        engine.fetch_page("bench", full_table_name, where_clause, 1, page_size)
+
+    results["page_load"] = measure(page_load, repeat)
+    results["deep_page"] = measure(deep_page, repeat)
+    results["deep_page_key"] = measure(deep_page_by_key, repeat)
+    results["filter"] = measure(filtered, repeat)
+
+    # The app's own load path: cost guard, key paging and the columnar buffer
+    def point_app_at_table(app):
+        app.pool = server.pool()
+        app.page_size = page_size
+        app.current_table = table
+        app.current_columns = structure["columns"]
+        app.primary_key_columns = structure["primary_key"]
+        app.column_formatters = formatters
+
+    formatters = [
+        (
+            make_formatter(col["type"], col["scale"]),
+            col["type"].lower() in MEMOIZED_TYPES,
+        )
+        for col in structure["columns"]
+    ]
+    point_app_at_table(pager)
+
+    def app_page(page_number):
+        pager.current_page = page_number
+        pager.read_page("")
+
+    results["app_page"] = measure(lambda: app_page(1), repeat)
+    results["app_deep_page"] = measure(lambda: app_page(last_page), repeat)
+
+    page = engine.fetch_page("bench", full_table_name, "", 1, page_size)
+
+    def format_page():
+        for index, (formatter, memoize) in enumerate(formatters):
+            page.display_column(index, formatter, memoize)
+
+    def buffer_page():
+        with server.pool().connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(build_page_query(full_table_name, "", 1, page_size))
+            ColumnarPage.from_cursor(cursor)
+
+    results["buffer"] = measure(buffer_page, repeat)
+    results["format"] = measure(format_page, repeat)
+
+    if grid is not None:
+        point_app_at_table(grid)
+
+        def load_data():
+            reset_grid(grid)
+            grid.current_page = 1
+            grid.load_data("")
+
+        results["load_data"] = measure(load_data, max(1, repeat // 4))
+
+        grid.current_data = page
+
+        def render():
+            reset_grid(grid)
+            grid.update_treeview()
+
+        results["render"] = measure(render, max(1, repeat // 4))
+        results["refresh"] = measure(grid.update_treeview, repeat)
+        results["autosize"] = measure(grid.autosize_tree_columns, max(1, repeat // 4))
+        reset_grid(grid)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", choices=sorted(SIZES), default=None)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--thresholds", type=Path, default=THRESHOLDS_PATH)
+    parser.add_argument(
+        "--write-thresholds",
+        action="store_true",
+        help="Save the measured p95 x 2 as the new thresholds",
+    )
+    parser.add_argument(
+        "--require-display",
+        action="store_true",
+        help="Fail when the grid scenarios can't run or have no threshold",
+    )
+    args = parser.parse_args(argv)
+
+    xvfb = start_xvfb()
+    try:
+        return run_benchmarks(args)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+
+def run_benchmarks(args):
+    pager = make_app(with_grid=False)
+    grid = make_app(with_grid=True)
+    if grid is None:
+        if args.require_display:
+            print("No display and no Xvfb: the grid scenarios can't run.")
+            return 1
+        print("No display: load_data, render, refresh and autosize are skipped.\n")
+
+    thresholds = {}
+    if args.thresholds.exists():
+        thresholds = json.loads(args.thresholds.read_text())
+
+    measured = {}
+    failures = []
+    print(f"{'benchmark':<22}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'limit':>10}")
+    for name in args.sizes or list(SIZES):
+        rows, columns = SIZES[name]
+        results = run_size(
+            name, rows, columns, args.page_size, args.repeat, pager, grid
+        )
+        for scenario, samples in results.items():
+            key = f"{scenario}/{name}"
+            p50, p95 = percentile(samples, 0.5) * 1000, percentile(samples, 0.95) * 1000
+            limit = thresholds.get(key)
+            measured[key] = p95
+            flag = ""
+            if limit is not None and p95 > limit:
+                failures.append(key)
+                flag = "  REGRESSION"
+            elif limit is None and args.require_display and scenario in GRID_SCENARIOS:
+                failures.append(key)
+                flag = "  NO THRESHOLD"
+            limit_text = f"{limit:.1f}" if limit is not None else "-"
+            print(
+                f"{key:<22}{p50:>10.1f}{p95:>10.1f}{max(samples) * 1000:>10.1f}"
+                f"{limit_text:>10}{flag}"
+            )
+
+    if args.write_thresholds:
+        thresholds.update({key: round(p95 * 2, 1) for key, p95 in measured.items()})
+        args.thresholds.write_text(json.dumps(thresholds, indent=2, sort_keys=True))
+        print(f"\nThresholds written to {args.thresholds}")
+        return 0
+
+    if failures:
+        print(f"\n{len(failures)} benchmark(s) failed: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
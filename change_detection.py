@@ -0,0 +1,84 @@
+from typing import List, Dict, Any, Optional, Tuple
+
+PRIMARY_KEY_QUERY = """
+SELECT c.name
+FROM sys.indexes AS i
+JOIN sys.index_columns AS ic
+    ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+JOIN sys.columns AS c
+    ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+WHERE i.object_id = OBJECT_ID(?) AND i.is_primary_key = 1
+ORDER BY ic.key_ordinal
+"""
+
+# Indexes led by a column (params: table, column). MAX(rowversion) is only a
+# cheap watermark when such an index exists; otherwise it scans the table.
+LEADING_INDEX_QUERY = """
+SELECT COUNT(*)
+FROM sys.index_columns AS ic
+JOIN sys.columns AS c
+    ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+WHERE ic.object_id = OBJECT_ID(?) AND c.name = ? AND ic.key_ordinal = 1
+"""
+
+# INFORMATION_SCHEMA reports rowversion columns as "timestamp"
+ROWVERSION_TYPES = {"timestamp", "rowversion"}
+
+# BINARY_CHECKSUM(*) ignores columns of these types
+CHECKSUM_IGNORED_TYPES = {"text", "ntext", "image", "xml"}
+
+
+def find_rowversion_column(columns: List[Dict[str, Any]]) -> Optional[str]:
+    """Name of the table's rowversion column, if it has one"""
+    for column in columns:
+        if column["type"].lower() in ROWVERSION_TYPES:
+            return column["name"]
+    return None
+
+
+def checksum_covers(columns: List[Dict[str, Any]]) -> bool:
+    """Whether BINARY_CHECKSUM(*) sees every column of a table"""
+    return not any(col["type"].lower() in CHECKSUM_IGNORED_TYPES for col in columns)
+
+
+def build_table_watermark_query(full_table_name: str, rowversion_column: str) -> str:
+    """MAX(rowversion) catches inserts/updates; the catalog row count catches deletes"""
+    return f"""
+    SELECT
+        (SELECT MAX([{rowversion_column}]) FROM {full_table_name}),
+        (SELECT SUM(row_count)
+         FROM sys.dm_db_partition_stats
+         WHERE object_id = OBJECT_ID(?) AND index_id IN (0, 1))
+    """
+
+
+def build_page_checksum_query(
+    full_table_name: str, where_clause: str, key_column: str
+) -> str:
+    """Checksum of the rows in a page's key range, and the rows before it
+
+    Params: low key, low key, high key. The count before the range catches
+    inserts and deletes below the page, which shift the rows OFFSET returns.
+    It costs about as much as that OFFSET, so it is only worth running when
+    Refresh is actually used. A checksum can collide: an equal one means the
+    page very probably, not certainly, is unchanged.
+    """
+    conditions = [f"[{key_column}] BETWEEN ? AND ?"]
+    before = [f"[{key_column}] < ?"]
+    if where_clause:
+        conditions.insert(0, f"({where_clause})")
+        before.insert(0, f"({where_clause})")
+    return f"""
+    SELECT CHECKSUM_AGG(BINARY_CHECKSUM(*)), COUNT_BIG(*),
+        (SELECT COUNT_BIG(*) FROM {full_table_name} WHERE {' AND '.join(before)})
+    FROM {full_table_name}
+    WHERE {' AND '.join(conditions)}
+    """
+
+
+def page_key_range(rows, key_index: int) -> Optional[Tuple[Any, Any]]:
+    """Lowest and highest key value on a page"""
+    keys = [row[key_index] for row in rows if row[key_index] is not None]
+    if not keys:
+        return None
+    return min(keys), max(keys)
@@ -0,0 +1,122 @@
+from typing import List, Dict, Any, Optional
+
+CHANGE_TRACKING_ENABLED_QUERY = """
+SELECT COUNT(*) FROM sys.change_tracking_tables WHERE object_id = OBJECT_ID(?)
+"""
+
+CURRENT_VERSION_QUERY = "SELECT CHANGE_TRACKING_CURRENT_VERSION()"
+
+MIN_VALID_VERSION_QUERY = "SELECT CHANGE_TRACKING_MIN_VALID_VERSION(OBJECT_ID(?))"
+
+
+def build_changes_query(
+    full_table_name: str,
+    key_columns: List[str],
+    max_changes: int,
+    where_clause: str = "",
+) -> str:
+    """Changed keys since a version (param), joined to their current rows
+
+    Rows that were deleted, or no longer match the filter, come back with
+    present = 0 (deleted rows also with NULL table columns).
+    """
+    join = " AND ".join(f"t.[{col}] = ct.[{col}]" for col in key_columns)
+    # The filter goes in a single-table scope: CHANGETABLE exposes the key
+    # columns too, so an unqualified [Id] next to ct would be ambiguous
+    match = " AND ".join(f"f.[{col}] = ct.[{col}]" for col in key_columns)
+    if where_clause:
+        match += f" AND ({where_clause})"
+    ct_keys = ", ".join(f"ct.[{col}]" for col in key_columns)
+    return f"""
+    SELECT TOP ({int(max_changes)})
+        ct.SYS_CHANGE_VERSION,
+        ct.SYS_CHANGE_OPERATION,
+        CASE WHEN EXISTS (
+            SELECT 1 FROM {full_table_name} AS f WHERE {match}
+        ) THEN 1 ELSE 0 END AS present,
+        {ct_keys},
+        t.*
+    FROM CHANGETABLE(CHANGES {full_table_name}, ?) AS ct
+    LEFT JOIN {full_table_name} AS t ON {join}
+    ORDER BY ct.SYS_CHANGE_VERSION
+    """
+
+
+class ChangeTracker:
+    """Polls CHANGETABLE for one table, remembering the last synced version"""
+
+    def __init__(
+        self,
+        full_table_name: str,
+        key_columns: List[str],
+        last_version: int,
+        max_changes: int = 500,
+    ):
+        self.full_table_name = full_table_name
+        self.key_columns = key_columns
+        self.last_version = last_version
+        self.max_changes = max_changes
+
+    def poll(
+        self, cursor, where_clause: str = "", count_query: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Fetch changes since the last poll
+
+        Returns {"changes": [(operation, key, row or None)], "reload": bool,
+        "total_records": int or None}. "reload" means the changes could not
+        be applied incrementally (history cleaned up, or one transaction
+        larger than max_changes). Raises RuntimeError if Change Tracking was
+        disabled on the table.
+        """
+        result: Dict[str, Any] = {
+            "changes": [],
+            "reload": False,
+            "total_records": None,
+        }
+
+        cursor.execute(MIN_VALID_VERSION_QUERY, self.full_table_name)
+        min_valid = cursor.fetchone()[0]
+        if min_valid is None:
+            raise RuntimeError(
+                f"Change Tracking is no longer enabled on {self.full_table_name}."
+            )
+        if self.last_version < min_valid:
+            # History was cleaned up: reload once and carry on from now
+            result["reload"] = True
+            cursor.execute(CURRENT_VERSION_QUERY)
+            self.last_version = cursor.fetchone()[0]
+            return result
+
+        cursor.execute(
+            build_changes_query(
+                self.full_table_name, self.key_columns, self.max_changes, where_clause
+            ),
+            self.last_version,
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return result
+
+        key_count = len(self.key_columns)
+        last_version = rows[-1][0]
+        if len(rows) >= self.max_changes:
+            # The last version may be cut off; take it again on the next tick
+            if rows[0][0] == last_version:
+                result["reload"] = True
+                cursor.execute(CURRENT_VERSION_QUERY)
+                self.last_version = cursor.fetchone()[0]
+                return result
+            last_version -= 1
+            rows = [row for row in rows if row[0] <= last_version]
+
+        for row in rows:
+            operation, present = row[1], row[2]
+            key = tuple(row[3 : 3 + key_count])
+            current = tuple(row[3 + key_count :]) if present else None
+            result["changes"].append((operation, key, current))
+
+        self.last_version = last_version
+        if count_query:
+            cursor.execute(count_query)
+            result["total_records"] = cursor.fetchone()[0]
+        return result
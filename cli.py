@@ -0,0 +1,417 @@
+"""Command-line front end for the data engine
+
+Examples:
+    python cli.py -S myserver databases
+    python cli.py -S myserver -d Sales tables --schema dbo
+    python cli.py -S myserver -d Sales browse dbo.Orders --where "[Status] = 'Open'"
+    python cli.py -S myserver -d Sales export dbo.Orders -o orders.csv
+    python cli.py -S myserver -d Sales export dbo.Orders -o orders.csv --parallel 8
+    python cli.py -S myserver -d ProdDB compare dbo.Orders --target-database ReportingDB
+    python cli.py -S prod -d Sales copy dbo.Orders --where "[Region] = 'EU'" \\
+        --target-server testserver --target-database Sales --resume
+    python cli.py -S myserver -d Sales update dbo.Orders --set Status=Closed \\
+        --where "[OrderDate] < '2020-01-01'"
+
+SQL authentication reads the password from DYNSQLAPP_PASSWORD, or prompts.
+"""
+
+import argparse
+import csv
+import getpass
+import os
+import sys
+
+from db_connections import DEFAULT_DRIVER, ConnectionPool
+from engine import DataEngine, compile_conditions, quote_table, update_where
+from parallel_export import export_parallel
+from table_compare import TableSide, changed_columns, compare_tables, hashable_columns
+from table_copy import copy_table, computed_columns, last_copied_key, map_columns
+
+
+def split_table(name):
+    """(schema, table) of schema.table, dbo when no schema is given"""
+    schema, _, table = name.rpartition(".")
+    return schema.strip("[]") or "dbo", table.strip("[]")
+
+
+def parse_table(name):
+    """schema.table as [schema].[table]"""
+    return quote_table(*split_table(name))
+
+
+def parse_where(args):
+    """Raw --where text, or --filter column op value conditions"""
+    if args.where:
+        return args.where
+    conditions = [tuple(condition) for condition in args.filter or []]
+    return compile_conditions(conditions)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Browse, export and update tables")
+    parser.add_argument("-S", "--server", required=True)
+    parser.add_argument("-U", "--username", help="SQL login (default: Windows auth)")
+    parser.add_argument("-d", "--database")
+    parser.add_argument("--driver", default=DEFAULT_DRIVER)
+    parser.add_argument(
+        "--read-only", action="store_true", help="Connect with read-only intent"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("databases", help="List databases")
+    commands.add_parser("schemas", help="List schemas")
+    tables = commands.add_parser("tables", help="List tables and views")
+    tables.add_argument("--schema", default="dbo")
+
+    def add_filter_arguments(command):
+        command.add_argument("table", help="schema.table")
+        command.add_argument("--where", help="Raw WHERE clause")
+        command.add_argument(
+            "--filter",
+            nargs=3,
+            action="append",
+            metavar=("COLUMN", "OP", "VALUE"),
+            help="Condition, repeatable (like the advanced filter)",
+        )
+
+    browse = commands.add_parser("browse", help="Print one page of a table")
+    add_filter_arguments(browse)
+    browse.add_argument("--page", type=int, default=1)
+    browse.add_argument("--page-size", type=int, default=100)
+
+    export = commands.add_parser("export", help="Write every matching row as CSV")
+    add_filter_arguments(export)
+    export.add_argument("-o", "--output", help="CSV file (default: stdout)")
+    export.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        metavar="DOP",
+        help="Read key ranges on this many connections (needs -o)",
+    )
+    export.add_argument(
+        "--parts", type=int, help="Number of key ranges (default: 4 x DOP)"
+    )
+    export.add_argument(
+        "--unordered",
+        action="store_true",
+        help="With --parallel, write one CSV per range into the -o directory",
+    )
+
+    def add_target_arguments(command):
+        command.add_argument("--target-database", required=True)
+        command.add_argument("--target-server", help="Default: the same server")
+        command.add_argument(
+            "--target-table", help="schema.table (default: the same)"
+        )
+
+    compare = commands.add_parser(
+        "compare", help="Print rows that differ from a copy of the table"
+    )
+    add_filter_arguments(compare)
+    add_target_arguments(compare)
+    compare.add_argument(
+        "--parallel", type=int, default=4, metavar="DOP", help="Connections per side"
+    )
+
+    copy = commands.add_parser(
+        "copy", help="Insert every matching row into another table"
+    )
+    add_filter_arguments(copy)
+    add_target_arguments(copy)
+    copy.add_argument("--batch-size", type=int, default=5000)
+    copy.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip keys up to the largest one already in the target",
+    )
+
+    update = commands.add_parser("update", help="Update every matching row")
+    add_filter_arguments(update)
+    update.add_argument(
+        "--set",
+        action="append",
+        required=True,
+        metavar="COLUMN=VALUE",
+        help="Assignment, repeatable; an empty value writes NULL",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command not in ("databases",) and not args.database:
+        print("--database is required for this command", file=sys.stderr)
+        return 2
+
+    password = None
+    if args.username:
+        password = os.environ.get("DYNSQLAPP_PASSWORD") or getpass.getpass()
+
+    # copy reads and writes at once, possibly both on this server
+    size = 2 if args.command == "copy" else max(1, getattr(args, "parallel", 1))
+    pool = ConnectionPool(
+        size=size,
+        server=args.server,
+        username=args.username,
+        password=password,
+        database=args.database,
+        read_only=args.read_only,
+        driver=args.driver,
+    )
+    engine = DataEngine(pool)
+    try:
+        if args.command == "compare":
+            return compare(engine, args, password)
+        if args.command == "copy":
+            return copy(engine, args, password)
+        return run(engine, args)
+    finally:
+        pool.close()
+
+
+def run(engine, args):
+    out = csv.writer(sys.stdout, lineterminator="\n")
+
+    if args.command == "databases":
+        for name in engine.databases():
+            print(name)
+    elif args.command == "schemas":
+        for name in engine.schemas(args.database):
+            print(name)
+    elif args.command == "tables":
+        for name, table_type in engine.tables(args.database, args.schema):
+            print(f"{name}\t{table_type}")
+    elif args.command == "browse":
+        table = parse_table(args.table)
+        where_clause = parse_where(args)
+        page = engine.fetch_page(
+            args.database, table, where_clause, args.page, args.page_size
+        )
+        total = engine.count(args.database, table, where_clause)
+        out.writerows(page)
+        print(f"-- page {args.page}, {len(page)} of {total} rows", file=sys.stderr)
+    elif args.command == "export" and args.parallel > 1:
+        return parallel_export(engine, args)
+    elif args.command == "export":
+        table = parse_table(args.table)
+        f = None
+        if args.output:
+            f = open(args.output, "w", newline="", encoding="utf-8")
+        try:
+            writer = csv.writer(f) if f else out
+            count = 0
+            header_written = False
+            for names, batch in engine.iter_rows(
+                args.database, table, parse_where(args)
+            ):
+                if not header_written:
+                    writer.writerow(names)
+                    header_written = True
+                writer.writerows(batch)
+                count += len(batch)
+        finally:
+            if f:
+                f.close()
+        print(f"-- {count} rows exported", file=sys.stderr)
+    elif args.command == "update":
+        where_clause = parse_where(args)
+        if not where_clause:
+            print("update needs --where or --filter", file=sys.stderr)
+            return 2
+        if any("=" not in item for item in args.set):
+            print("--set takes COLUMN=VALUE", file=sys.stderr)
+            return 2
+        assignments = dict(item.split("=", 1) for item in args.set)
+        count = engine.write(
+            args.database,
+            update_where,
+            parse_table(args.table),
+            assignments,
+            where_clause,
+        )
+        print(f"-- {count} rows updated", file=sys.stderr)
+    return 0
+
+
+def parallel_export(engine, args):
+    if not args.output:
+        print("--parallel needs -o", file=sys.stderr)
+        return 2
+    schema, table = split_table(args.table)
+    structure = engine.table_structure(args.database, schema, table)
+    if len(structure["primary_key"]) != 1:
+        print("--parallel needs a single-column primary key", file=sys.stderr)
+        return 2
+    key_column = structure["primary_key"][0]
+    key_type = next(
+        col["type"] for col in structure["columns"] if col["name"] == key_column
+    )
+
+    def progress(rows, seconds):
+        if seconds:
+            rate = rows / seconds
+            print(f"\r-- {rows} rows, {rate:,.0f} rows/s", end="", file=sys.stderr)
+
+    result = export_parallel(
+        engine.read_pool,
+        args.database,
+        quote_table(schema, table),
+        key_column,
+        key_type,
+        args.output,
+        parse_where(args),
+        parts=args.parts or 4 * args.parallel,
+        dop=args.parallel,
+        ordered=not args.unordered,
+        progress=progress,
+    )
+    print(
+        f"\r-- {result['rows']} rows exported to {len(result['files'])} file(s) "
+        f"in {result['seconds']:.1f}s ({result['rows_per_sec']:,.0f} rows/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def open_target_pool(engine, args, password, size=1):
+    """A pool on --target-server, or the engine's own pool without one"""
+    if not args.target_server:
+        return engine.pool
+    return ConnectionPool(
+        size=max(1, size),
+        server=args.target_server,
+        username=args.username,
+        password=password,
+        driver=args.driver,
+    )
+
+
+def key_column_of(structure):
+    """(name, type) of a single-column primary key, or None"""
+    if len(structure["primary_key"]) != 1:
+        return None
+    key_column = structure["primary_key"][0]
+    key_type = next(
+        col["type"] for col in structure["columns"] if col["name"] == key_column
+    )
+    return key_column, key_type
+
+
+def compare(engine, args, password):
+    schema, table = split_table(args.table)
+    structure = engine.table_structure(args.database, schema, table)
+    key = key_column_of(structure)
+    if key is None:
+        print("compare needs a single-column primary key", file=sys.stderr)
+        return 2
+    key_column, key_type = key
+
+    target_pool = open_target_pool(engine, args, password, args.parallel)
+    try:
+        result = compare_tables(
+            TableSide(engine.pool, args.database, quote_table(schema, table)),
+            TableSide(
+                target_pool,
+                args.target_database,
+                parse_table(args.target_table or args.table),
+            ),
+            hashable_columns(structure["columns"]),
+            key_column,
+            key_type,
+            parse_where(args),
+            dop=args.parallel,
+        )
+    finally:
+        if target_pool is not engine.pool:
+            target_pool.close()
+
+    out = csv.writer(sys.stdout, lineterminator="\n")
+    columns = result["columns"]
+    out.writerow(["difference", "side"] + columns)
+    for row in result["missing_in_target"]:
+        out.writerow(["missing in target", "source"] + list(row))
+    for row in result["missing_in_source"]:
+        out.writerow(["missing in source", "target"] + list(row))
+    for ours, theirs in result["changed"]:
+        difference = "changed: " + ", ".join(changed_columns(columns, ours, theirs))
+        out.writerow([difference, "source"] + list(ours))
+        out.writerow([difference, "target"] + list(theirs))
+    differences = (
+        len(result["missing_in_target"])
+        + len(result["missing_in_source"])
+        + len(result["changed"])
+    )
+    print(
+        f"-- {differences} differing rows; {result['ranges_hashed']} ranges hashed, "
+        f"{result['keys_compared']} keys compared in {result['seconds']:.1f}s",
+        file=sys.stderr,
+    )
+    return 1 if differences else 0
+
+
+def copy(engine, args, password):
+    schema, table = split_table(args.table)
+    target_schema, target_table = split_table(args.target_table or args.table)
+    structure = engine.table_structure(args.database, schema, table)
+    key = key_column_of(structure)
+    if key is None:
+        print("copy needs a single-column primary key", file=sys.stderr)
+        return 2
+    key_column = key[0]
+    where_clause = parse_where(args)
+
+    target_pool = open_target_pool(engine, args, password)
+    try:
+        target_structure = DataEngine(target_pool).table_structure(
+            args.target_database, target_schema, target_table
+        )
+        target = TableSide(
+            target_pool,
+            args.target_database,
+            quote_table(target_schema, target_table),
+        )
+        mapping = map_columns(
+            structure["columns"], target_structure["columns"], computed_columns(target)
+        )
+        if key_column not in [name for name, _ in mapping]:
+            print(f"The target has no [{key_column}] column", file=sys.stderr)
+            return 2
+        resume_after = None
+        if args.resume:
+            resume_after = last_copied_key(target, key_column, where_clause)
+            if resume_after is not None:
+                print(
+                    f"-- resuming after {key_column} = {resume_after}", file=sys.stderr
+                )
+
+        def progress(rows, seconds, last_key):
+            if seconds:
+                rate = rows / seconds
+                print(f"\r-- {rows} rows, {rate:,.0f} rows/s", end="", file=sys.stderr)
+
+        result = copy_table(
+            TableSide(engine.pool, args.database, quote_table(schema, table)),
+            target,
+            mapping,
+            key_column,
+            where_clause,
+            resume_after,
+            batch_size=args.batch_size,
+            progress=progress,
+        )
+    finally:
+        if target_pool is not engine.pool:
+            target_pool.close()
+
+    print(
+        f"\r-- {result['rows']} rows copied in {result['seconds']:.1f}s "
+        f"({result['rows_per_sec']:,.0f} rows/s), last {key_column} = "
+        f"{result['last_key']}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
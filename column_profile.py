@@ -0,0 +1,162 @@
+import math
+from typing import List, Dict, Any, Optional
+
+from cost_guard import TABLE_ROW_COUNT_QUERY
+from parallel_export import key_cast_type
+
+# Statistics object whose leading column is the given column; filtered
+# statistics only describe part of the table
+COLUMN_STATS_QUERY = """
+SELECT TOP 1 s.stats_id
+FROM sys.stats AS s
+JOIN sys.stats_columns AS sc
+    ON sc.object_id = s.object_id
+    AND sc.stats_id = s.stats_id
+    AND sc.stats_column_id = 1
+WHERE s.object_id = OBJECT_ID(?)
+    AND COL_NAME(sc.object_id, sc.column_id) = ?
+    AND s.has_filter = 0
+ORDER BY s.stats_id
+"""
+
+# Params: table, stats_id
+STATS_PROPERTIES_QUERY = """
+SELECT rows, rows_sampled, last_updated
+FROM sys.dm_db_stats_properties(OBJECT_ID(?), ?)
+"""
+
+# Types that can't be grouped or have no histogram
+UNPROFILED_TYPES = {"text", "ntext", "image", "xml", "geography", "geometry"}
+
+
+def build_histogram_query(data_type: str) -> str:
+    """Histogram steps of a statistics object (params: table, stats_id)"""
+    return f"""
+    SELECT CAST(range_high_key AS {key_cast_type(data_type)}),
+           equal_rows, range_rows, distinct_range_rows
+    FROM sys.dm_db_stats_histogram(OBJECT_ID(?), ?)
+    ORDER BY step_number
+    """
+
+
+def build_sample_query(
+    full_table_name: str, column: str, sample_rows: Optional[int], top_only=False
+) -> str:
+    """Value counts over a TABLESAMPLE, the first rows (top_only) or everything"""
+    source = full_table_name
+    select = f"[{column}] AS v"
+    if sample_rows and top_only:
+        select = f"TOP ({int(sample_rows)}) {select}"
+    elif sample_rows:
+        source += f" TABLESAMPLE ({int(sample_rows)} ROWS)"
+    return f"""
+    SELECT v, COUNT_BIG(*)
+    FROM (SELECT {select} FROM {source}) AS sampled
+    GROUP BY v
+    ORDER BY COUNT_BIG(*) DESC
+    """
+
+
+def display_value(value) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def profile_from_histogram(steps, rows: int, updated=None, top=20) -> Dict[str, Any]:
+    """Profile from (high key, equal_rows, range_rows, distinct_range_rows) steps"""
+    values = [step for step in steps if step[0] is not None]
+    nulls = sum(step[1] for step in steps if step[0] is None)
+    total = rows or sum(step[1] + step[2] for step in steps)
+    ranked = sorted(values, key=lambda step: step[1], reverse=True)[:top]
+    return {
+        "source": "statistics histogram",
+        "rows": int(total),
+        "sampled": int(total),
+        "nulls": int(nulls),
+        "null_fraction": nulls / total if total else 0.0,
+        "min": display_value(values[0][0]) if values else None,
+        "max": display_value(values[-1][0]) if values else None,
+        "distinct": int(
+            sum(1 for step in values if step[1] > 0)
+            + sum(step[3] for step in values)
+        ),
+        "top": [[display_value(step[0]), int(step[1])] for step in ranked],
+        "updated": display_value(updated),
+    }
+
+
+def estimate_distinct(counts: List[int], sampled: int, rows: int) -> int:
+    """Guaranteed-error estimator: values seen once are scaled by sqrt(N/n)"""
+    if not sampled or sampled >= rows:
+        return len(counts)
+    singletons = sum(1 for count in counts if count == 1)
+    estimate = math.sqrt(rows / sampled) * singletons + len(counts) - singletons
+    return int(round(min(estimate, rows)))
+
+
+def profile_from_sample(groups, rows: int, source: str, top=20) -> Dict[str, Any]:
+    """Profile from (value, count) groups of a sample of `rows` rows"""
+    sampled = sum(count for _, count in groups)
+    values = [(value, count) for value, count in groups if value is not None]
+    nulls = sampled - sum(count for _, count in values)
+    ordered = sorted(value for value, _ in values)
+    scale = rows / sampled if sampled else 0.0
+    return {
+        "source": source,
+        "rows": int(rows),
+        "sampled": int(sampled),
+        "nulls": int(round(nulls * scale)),
+        "null_fraction": nulls / sampled if sampled else 0.0,
+        "min": display_value(ordered[0]) if ordered else None,
+        "max": display_value(ordered[-1]) if ordered else None,
+        "distinct": estimate_distinct([count for _, count in values], sampled, rows),
+        "top": [
+            [display_value(value), int(round(count * scale))]
+            for value, count in values[:top]
+        ],
+        "updated": None,
+    }
+
+
+def profile_column(
+    cursor, full_table_name: str, column: str, data_type: str, sample_rows=10000
+) -> Dict[str, Any]:
+    """Distribution of a column without scanning it
+
+    Reads the histogram of a statistics object led by the column when there
+    is one; otherwise counts values in a TABLESAMPLE of about sample_rows rows
+    (the first sample_rows rows of a view, all rows of a small table).
+    """
+    if data_type.lower() in UNPROFILED_TYPES:
+        raise ValueError(f"Columns of type {data_type} can't be profiled.")
+
+    try:
+        cursor.execute(COLUMN_STATS_QUERY, full_table_name, column)
+        row = cursor.fetchone()
+        if row is not None:
+            stats_id = row[0]
+            cursor.execute(STATS_PROPERTIES_QUERY, full_table_name, stats_id)
+            properties = cursor.fetchone()
+            cursor.execute(build_histogram_query(data_type), full_table_name, stats_id)
+            steps = [tuple(step) for step in cursor.fetchall()]
+            if steps and properties is not None:
+                return profile_from_histogram(steps, properties[0], properties[2])
+    except Exception:
+        pass  # No VIEW DATABASE STATE, or a server before 2016 SP1 CU2
+
+    cursor.execute(TABLE_ROW_COUNT_QUERY, full_table_name)
+    rows = cursor.fetchone()[0]
+    if rows is None:
+        # A view: no partition stats and no TABLESAMPLE
+        query = build_sample_query(full_table_name, column, sample_rows, top_only=True)
+        source = f"first {sample_rows:,} rows"
+    elif rows <= sample_rows:
+        query = build_sample_query(full_table_name, column, None)
+        source = "all rows"
+    else:
+        query = build_sample_query(full_table_name, column, sample_rows)
+        source = f"sample of ~{sample_rows:,} rows"
+    cursor.execute(query)
+    groups = [(value, count) for value, count in cursor.fetchall()]
+    if rows is None:
+        rows = sum(count for _, count in groups)
+    return profile_from_sample(groups, rows, source)
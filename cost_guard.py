@@ -0,0 +1,58 @@
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+# Catalog row count, used when the login lacks SHOWPLAN permission
+TABLE_ROW_COUNT_QUERY = """
+SELECT SUM(row_count)
+FROM sys.dm_db_partition_stats
+WHERE object_id = OBJECT_ID(?) AND index_id IN (0, 1)
+"""
+
+CONTAINS_LIKE_RE = re.compile(r"(\[[^\]]+\]) LIKE '%([^%']*)%'")
+FILTER_COLUMN_RE = re.compile(r"\[([^\]]+)\]\s*(?:=|!=|<>|>=|<=|>|<|LIKE)", re.I)
+
+
+def plan_estimates(summaries: List[Dict[str, Any]]) -> Tuple[float, float]:
+    """Total estimated cost and estimated rows read of some plans"""
+    cost = sum(summary["statement_cost"] for summary in summaries)
+    rows = sum(summary["estimated_rows_read"] for summary in summaries)
+    return cost, rows
+
+
+def exceeds_thresholds(
+    cost: float, rows: float, max_cost: Optional[float], max_rows: Optional[float]
+) -> bool:
+    """Whether an estimate is over either configured threshold"""
+    if max_cost is not None and cost > max_cost:
+        return True
+    if max_rows is not None and rows > max_rows:
+        return True
+    return False
+
+
+def to_prefix_filter(where_clause: str) -> Optional[str]:
+    """Rewrite LIKE '%x%' predicates as LIKE 'x%' so an index can be seeked"""
+    if not CONTAINS_LIKE_RE.search(where_clause):
+        return None
+    return CONTAINS_LIKE_RE.sub(r"\1 LIKE '\2%'", where_clause)
+
+
+def suggest_cheaper_filters(
+    where_clause: str, indexed_columns: List[str]
+) -> List[str]:
+    """Human readable suggestions for making a filter index-friendly"""
+    suggestions = []
+    if to_prefix_filter(where_clause):
+        suggestions.append(
+            "Use a prefix match (LIKE 'x%') instead of a contains match (LIKE '%x%')."
+        )
+
+    filtered = {col.lower() for col in FILTER_COLUMN_RE.findall(where_clause)}
+    indexed = {col.lower() for col in indexed_columns}
+    if where_clause and indexed and not filtered & indexed:
+        suggestions.append(
+            "Filter on an indexed column instead: " + ", ".join(indexed_columns) + "."
+        )
+    if not where_clause:
+        suggestions.append("Add a filter on an indexed column to narrow the scan.")
+    return suggestions
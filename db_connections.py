@@ -0,0 +1,227 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+DEFAULT_DRIVER = "ODBC Driver 17 for SQL Server"
+
+# Display name -> SET TRANSACTION ISOLATION LEVEL value for browsing reads
+READ_ISOLATION_LEVELS = {
+    "Read Committed": "READ COMMITTED",
+    "Snapshot": "SNAPSHOT",
+    "Read Uncommitted": "READ UNCOMMITTED",
+}
+
+
+def build_connection_string(
+    server: str,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    database: Optional[str] = None,
+    read_only: bool = False,
+    driver: str = DEFAULT_DRIVER,
+    packet_size: Optional[int] = None,
+    mars: bool = False,
+) -> str:
+    """Build an ODBC connection string for SQL Server"""
+    conn_str = f"DRIVER={{{driver}}};SERVER={server}"
+    if username:
+        conn_str += f";UID={username};PWD={password}"
+    else:
+        conn_str += ";Trusted_Connection=yes"
+    if database:
+        conn_str += f";DATABASE={database}"
+    if read_only:
+        # Routed to a readable Availability Group secondary at login
+        conn_str += ";ApplicationIntent=ReadOnly;MultiSubnetFailover=Yes"
+    if packet_size:
+        conn_str += f";Packet Size={int(packet_size)}"
+    if mars:
+        conn_str += ";MARS_Connection=Yes"
+    return conn_str
+
+
+def configure_session(
+    connection, isolation_level: Optional[str] = None, lock_timeout_ms: int = -1
+):
+    """Apply session-level isolation and lock timeout settings to a connection"""
+    cursor = connection.cursor()
+    if isolation_level:
+        cursor.execute(f"SET TRANSACTION ISOLATION LEVEL {isolation_level}")
+    # -1 waits forever (the server default); 0 fails immediately on a blocked lock
+    cursor.execute(f"SET LOCK_TIMEOUT {int(lock_timeout_ms)}")
+    cursor.close()
+
+
+def open_connection(
+    server: str,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    database: Optional[str] = None,
+    read_only: bool = False,
+    isolation_level: Optional[str] = None,
+    lock_timeout_ms: int = -1,
+    autocommit: bool = False,
+    driver: str = DEFAULT_DRIVER,
+    packet_size: Optional[int] = None,
+    mars: bool = False,
+):
+    """Open and configure a pyodbc connection"""
+    # Imported here so startup doesn't pay for loading the ODBC driver manager
+    import pyodbc
+
+    connection = pyodbc.connect(
+        build_connection_string(
+            server, username, password, database, read_only, driver, packet_size, mars
+        ),
+        autocommit=autocommit,
+    )
+    configure_session(connection, isolation_level, lock_timeout_ms)
+    return connection
+
+
+def is_alive(connection) -> bool:
+    """Cheap round trip to check a connection still works"""
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+        cursor.close()
+        return True
+    except Exception:
+        return False
+
+
+class ConnectionPool:
+    """Thread-safe pool of configured connections for the UI and background workers
+
+    Connections idle for longer than validate_after seconds are checked with a
+    cheap round trip before being handed out; dead ones are replaced.
+    """
+
+    def __init__(self, size=4, validate_after=30.0, **connect_kwargs):
+        self.size = size
+        self.validate_after = validate_after
+        self.connect_kwargs = connect_kwargs
+        self.ready = threading.Event()
+        self.warmup_error = None
+        self.recorder = None  # workload.WorkloadRecorder while recording
+
+        self._idle = []  # (connection, last_used) pairs, most recent last
+        self._open_count = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def warmup(self, count=None):
+        """Open connections on a background thread; sets ready after the first"""
+        thread = threading.Thread(
+            target=self._warmup, args=(count or self.size,), daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _warmup(self, count):
+        try:
+            for _ in range(count):
+                with self._condition:
+                    if self._closed or self._open_count >= self.size:
+                        break
+                    self._open_count += 1
+                try:
+                    connection = open_connection(**self.connect_kwargs)
+                except Exception as e:
+                    self._forget()
+                    self.warmup_error = e
+                    break
+                self.release(connection)
+                self.ready.set()
+        finally:
+            self.ready.set()
+
+    def acquire(self, timeout=30.0):
+        """Take a working connection, opening one if the pool is not full"""
+        deadline = time.monotonic() + timeout
+        while True:
+            connection = None
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed.")
+                    if self._idle:
+                        connection, last_used = self._idle.pop()
+                        break
+                    if self._open_count < self.size:
+                        self._open_count += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._condition.wait(remaining):
+                        raise TimeoutError("No database connection became available.")
+
+            if connection is None:
+                try:
+                    return open_connection(**self.connect_kwargs)
+                except Exception:
+                    self._forget()
+                    raise
+
+            if time.monotonic() - last_used < self.validate_after or is_alive(
+                connection
+            ):
+                return connection
+            self.release(connection, discard=True)
+
+    def release(self, connection, discard=False):
+        """Return a connection to the pool, or close it if it is broken"""
+        with self._condition:
+            if not discard and not self._closed:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+                return
+        try:
+            connection.close()
+        except Exception:
+            pass
+        self._forget()
+
+    def idle_count(self):
+        """Number of open connections waiting in the pool"""
+        with self._condition:
+            return len(self._idle)
+
+    def _forget(self):
+        with self._condition:
+            self._open_count -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, timeout=30.0):
+        """Borrow a connection for a with block; rolls back and checks it on error"""
+        connection = self.acquire(timeout)
+        discard = False
+        try:
+            if self.recorder is not None:
+                yield self.recorder.wrap(connection)
+            else:
+                yield connection
+        except BaseException:
+            # Also a generator closed early or Ctrl+C: never leak the slot
+            discard = True
+            alive = is_alive(connection)
+            if alive and not connection.autocommit:
+                try:
+                    connection.rollback()
+                except Exception:
+                    alive = False
+            discard = not alive
+            raise
+        finally:
+            self.release(connection, discard=discard)
+
+    def close(self):
+        """Close idle connections; busy ones are closed when released"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for connection, _ in idle:
+            self.release(connection, discard=True)
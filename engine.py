@@ -0,0 +1,512 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
+
+from change_detection import (
+    PRIMARY_KEY_QUERY,
+    ROWVERSION_TYPES,
+    find_rowversion_column,
+)
+from formatters import BINARY_TYPES
+from row_buffer import ColumnarPage
+
+DATABASES_QUERY = "SELECT name FROM sys.databases WHERE database_id > 4 ORDER BY name"
+
+SCHEMAS_QUERY = """
+SELECT SCHEMA_NAME
+FROM INFORMATION_SCHEMA.SCHEMATA
+ORDER BY SCHEMA_NAME
+"""
+
+TABLES_QUERY = """
+SELECT TABLE_NAME, TABLE_TYPE
+FROM INFORMATION_SCHEMA.TABLES
+WHERE TABLE_TYPE IN ('BASE TABLE', 'VIEW')
+AND TABLE_SCHEMA = ?
+ORDER BY TABLE_TYPE, TABLE_NAME
+"""
+
+COLUMNS_QUERY = """
+SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT,
+    NUMERIC_SCALE
+FROM INFORMATION_SCHEMA.COLUMNS
+WHERE TABLE_NAME = ? AND TABLE_SCHEMA = ?
+ORDER BY ORDINAL_POSITION
+"""
+
+SYSTEM_SCHEMAS = ["guest", "INFORMATION_SCHEMA", "sys"]
+
+FILTER_OPERATORS = ["=", "!=", ">", "<", ">=", "<=", "LIKE"]
+
+AGGREGATE_FUNCTIONS = ["COUNT", "SUM", "MIN", "MAX", "AVG"]
+
+
+def quote_table(schema: str, table: str) -> str:
+    """[schema].[table]"""
+    return f"[{schema}].[{table}]"
+
+
+def user_schemas(names: List[str]) -> List[str]:
+    """Schema names without system and fixed database role schemas"""
+    return [
+        name
+        for name in names
+        if not name.startswith("db_") and name not in SYSTEM_SCHEMAS
+    ]
+
+
+def parse_columns(rows) -> List[Dict[str, Any]]:
+    """Column dicts (name, type, nullable, default, scale) from COLUMNS_QUERY"""
+    return [
+        {
+            "name": row[0],
+            "type": row[1],
+            "nullable": row[2] == "YES",
+            "default": row[3],
+            "scale": row[4],
+        }
+        for row in rows
+    ]
+
+
+# Filter compiler
+
+
+def sql_literal(value: str) -> str:
+    """Quoted string literal"""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def value_literal(value) -> str:
+    """Literal for a value read back from the server (not None)"""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float, Decimal)):
+        return str(value)
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    if isinstance(value, str):
+        # Unicode, so nvarchar values outside the code page still match
+        return "N" + sql_literal(value)
+    if isinstance(value, datetime) and value.microsecond % 1000 == 0:
+        # datetime columns reject more than three fractional digits
+        return sql_literal(value.isoformat(" ", "milliseconds"))
+    return sql_literal(str(value))
+
+
+def compile_like_filter(column: str, value: str) -> str:
+    """Contains filter used by the quick filter bar"""
+    return f"[{column}] LIKE {sql_literal(f'%{value}%')}"
+
+
+def compile_conditions(conditions: Sequence[Tuple[str, str, str]]) -> str:
+    """WHERE clause (without WHERE) from (column, operator, value) conditions"""
+    filters = []
+    for col, op, val in conditions:
+        if val.strip() == "":
+            continue
+        if op.upper() not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported operator: {op}")
+        if op.lower() == "like":
+            filters.append(compile_like_filter(col, val))
+        else:
+            filters.append(f"[{col}] {op} {sql_literal(val)}")
+    return " AND ".join(filters)
+
+
+# Page loader
+
+
+def build_count_query(full_table_name: str, where_clause="", options="") -> str:
+    count_query = f"SELECT COUNT(*) FROM {full_table_name}"
+    if where_clause:
+        count_query += f" WHERE {where_clause}"
+    if options:
+        count_query += f" {options}"
+    return count_query
+
+
+def build_page_query(
+    full_table_name: str, where_clause="", page=1, page_size=100, options=""
+) -> str:
+    offset = (page - 1) * page_size
+    return f"""
+            SELECT * FROM {full_table_name}
+            {f'WHERE {where_clause}' if where_clause else ''}
+            ORDER BY (SELECT NULL)
+            OFFSET {offset} ROWS
+            FETCH NEXT {page_size} ROWS ONLY
+            {options}
+            """
+
+
+def build_key_page_query(
+    full_table_name: str,
+    where_clause: str,
+    key_column: str,
+    page=1,
+    page_size=100,
+    options="",
+) -> str:
+    """One page in key order; the offset is walked over keys only
+
+    OFFSET runs over the narrowest index holding the key, then only the
+    page's rows are fetched by key, so deep pages don't drag whole rows
+    through the skipped range.
+    """
+    offset = (page - 1) * page_size
+    return f"""
+            SELECT t.* FROM {full_table_name} AS t
+            JOIN (
+                SELECT [{key_column}] FROM {full_table_name}
+                {f'WHERE {where_clause}' if where_clause else ''}
+                ORDER BY [{key_column}]
+                OFFSET {offset} ROWS
+                FETCH NEXT {page_size} ROWS ONLY
+            ) AS page_keys ON t.[{key_column}] = page_keys.[{key_column}]
+            ORDER BY t.[{key_column}]
+            {options}
+            """
+
+
+def build_key_seek_query(
+    full_table_name: str,
+    where_clause: str,
+    key_column: str,
+    forward: bool,
+    page_size=100,
+    options="",
+) -> str:
+    """The page after (forward) or before a key (param), in key order: an index seek
+
+    Used for Next/Prev from the keys already on screen, so no rows are
+    skipped over however deep the page is.
+    """
+    where = f"({where_clause}) AND " if where_clause else ""
+    operator, direction = (">", "") if forward else ("<", " DESC")
+    return f"""
+            SELECT * FROM (
+                SELECT TOP ({int(page_size)}) * FROM {full_table_name}
+                WHERE {where}[{key_column}] {operator} ?
+                ORDER BY [{key_column}]{direction}
+            ) AS page
+            ORDER BY [{key_column}]
+            {options}
+            """
+
+
+def build_key_position_query(
+    full_table_name: str, where_clause: str, key_column: str
+) -> str:
+    """Rows before a key (param) in key order: a range count on the key index"""
+    where = f"({where_clause}) AND " if where_clause else ""
+    return (
+        f"SELECT COUNT_BIG(*) FROM {full_table_name} "
+        f"WHERE {where}[{key_column}] < ?"
+    )
+
+
+# Summary (GROUP BY) queries
+
+
+def aggregate_label(function: str, column: Optional[str]) -> str:
+    """Result column name of an aggregate; column None is COUNT(*)"""
+    return f"{function}({column or '*'})"
+
+
+def sum_type(data_type: str, scale: Optional[int]) -> Optional[str]:
+    """Type to SUM a column in; SUM of an int column returns an int and overflows"""
+    data_type = data_type.lower()
+    if data_type in ("tinyint", "smallint", "int"):
+        return "bigint"
+    if data_type in ("decimal", "numeric"):
+        return f"decimal(38, {scale or 0})"
+    return None
+
+
+def aggregate_expression(
+    function: str,
+    column: Optional[str],
+    data_type: Optional[str] = None,
+    scale: Optional[int] = None,
+) -> str:
+    if function.upper() not in AGGREGATE_FUNCTIONS:
+        raise ValueError(f"Unsupported aggregate: {function}")
+    if column is None:
+        return "COUNT_BIG(*)"
+    if function.upper() == "AVG":
+        # AVG of an int column would be truncated to an int
+        return f"AVG(CAST([{column}] AS float))"
+    if function.upper() == "COUNT":
+        return f"COUNT_BIG([{column}])"
+    if function.upper() == "SUM" and data_type and sum_type(data_type, scale):
+        return f"SUM(CAST([{column}] AS {sum_type(data_type, scale)}))"
+    return f"{function.upper()}([{column}])"
+
+
+def summary_columns(
+    columns: List[Dict[str, Any]],
+    group_by: Sequence[str],
+    aggregates: Sequence[Tuple[str, Optional[str]]],
+) -> List[Dict[str, Any]]:
+    """Column dicts of a summary: the group columns, then one per aggregate"""
+    by_name = {col["name"]: col for col in columns}
+    result = [dict(by_name[name]) for name in group_by]
+    for function, column in aggregates:
+        data_type, scale = "bigint", None
+        if function.upper() == "AVG":
+            data_type = "float"
+        elif function.upper() != "COUNT":
+            data_type, scale = by_name[column]["type"], by_name[column]["scale"]
+            wide = sum_type(data_type, scale) if function.upper() == "SUM" else None
+            if wide:
+                data_type = wide.split("(")[0]  # decimal(38, s) keeps its scale
+        result.append(
+            {
+                "name": aggregate_label(function, column),
+                "type": data_type,
+                "nullable": True,
+                "default": None,
+                "scale": scale,
+            }
+        )
+    return result
+
+
+def build_summary_count_query(
+    full_table_name: str, where_clause: str, group_by: Sequence[str], options=""
+) -> str:
+    """Number of groups"""
+    groups = ", ".join(f"[{name}]" for name in group_by)
+    where = f"WHERE {where_clause}" if where_clause else ""
+    return f"""
+            SELECT COUNT(*) FROM (
+                SELECT 1 AS n FROM {full_table_name} {where} GROUP BY {groups}
+            ) AS groups
+            {options}
+            """
+
+
+def build_summary_page_query(
+    full_table_name: str,
+    where_clause: str,
+    group_by: Sequence[str],
+    aggregates: Sequence[Tuple[str, Optional[str]]],
+    page=1,
+    page_size=100,
+    options="",
+    columns: Optional[List[Dict[str, Any]]] = None,
+) -> str:
+    """One page of groups, ordered by the group columns
+
+    columns (the table's column dicts) lets SUM widen int and decimal columns.
+    """
+    types = {col["name"]: (col["type"], col["scale"]) for col in columns or []}
+    groups = ", ".join(f"[{name}]" for name in group_by)
+    values = ", ".join(
+        f"{aggregate_expression(function, column, *types.get(column, (None, None)))}"
+        " AS "
+        f"[{aggregate_label(function, column).replace(']', ']]')}]"
+        for function, column in aggregates
+    )
+    offset = (page - 1) * page_size
+    return f"""
+            SELECT {groups}{', ' + values if values else ''}
+            FROM {full_table_name}
+            {f'WHERE {where_clause}' if where_clause else ''}
+            GROUP BY {groups}
+            ORDER BY {groups}
+            OFFSET {offset} ROWS
+            FETCH NEXT {page_size} ROWS ONLY
+            {options}
+            """
+
+
+# CRUD writer (the caller commits)
+
+
+def insert_record(cursor, full_table_name: str, record: Dict[str, str]):
+    """INSERT one row; empty strings are written as NULL"""
+    columns = list(record.keys())
+    placeholders = ", ".join(["?" for _ in columns])
+    column_names = ", ".join([f"[{col}]" for col in columns])
+    query = f"INSERT INTO {full_table_name} ({column_names}) VALUES ({placeholders})"
+    values = [record[col] if record[col] != "" else None for col in columns]
+    cursor.execute(query, values)
+
+
+def edit_text(value) -> str:
+    """Text a record dialog shows for a value read back from the server"""
+    if value is None:
+        return ""
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex().upper()
+    if isinstance(value, datetime) and value.microsecond % 1000 == 0:
+        # datetime columns reject more than three fractional digits
+        return value.isoformat(" ", "milliseconds")
+    return str(value)
+
+
+def changed_fields(
+    columns: List[Dict[str, Any]], original: Dict[str, str], edited: Dict[str, str]
+) -> Dict[str, Any]:
+    """Fields whose text was changed in a record dialog, ready for update_record
+
+    Unchanged text isn't written back (it may not round-trip), rowversion
+    columns never are, and 0x... text of binary columns is sent as bytes.
+    """
+    changes = {}
+    for column in columns:
+        name, data_type = column["name"], column["type"].lower()
+        value = edited.get(name, "")
+        if data_type in ROWVERSION_TYPES or value == original.get(name, ""):
+            continue
+        if data_type in BINARY_TYPES and value[:2].lower() == "0x":
+            value = bytes.fromhex(value[2:])
+        changes[name] = value
+    return changes
+
+
+def key_condition(key: Dict[str, Any]) -> str:
+    """WHERE clause (without WHERE) matching one row by its primary key values"""
+    return " AND ".join(f"[{col}] = ?" for col in key)
+
+
+def update_record(
+    cursor, full_table_name: str, key: Dict[str, Any], record: Dict[str, str]
+) -> bool:
+    """UPDATE one row by primary key; False when there was nothing to set"""
+    set_clauses = []
+    values = []
+    for col_name, value in record.items():
+        if col_name not in key:  # Don't update the key
+            set_clauses.append(f"[{col_name}] = ?")
+            values.append(value if value != "" else None)
+    if not set_clauses:
+        return False
+
+    query = (
+        f"UPDATE {full_table_name} SET {', '.join(set_clauses)} "
+        f"WHERE {key_condition(key)}"
+    )
+    cursor.execute(query, values + list(key.values()))
+    return True
+
+
+def delete_record(cursor, full_table_name: str, key: Dict[str, Any]):
+    """DELETE one row by primary key"""
+    cursor.execute(
+        f"DELETE FROM {full_table_name} WHERE {key_condition(key)}", list(key.values())
+    )
+
+
+def update_where(
+    cursor, full_table_name: str, assignments: Dict[str, str], where_clause: str
+) -> int:
+    """Bulk UPDATE of every row matching a filter; returns the row count"""
+    set_clauses = ", ".join(f"[{col}] = ?" for col in assignments)
+    values = [value if value != "" else None for value in assignments.values()]
+    cursor.execute(
+        f"UPDATE {full_table_name} SET {set_clauses} WHERE {where_clause}", values
+    )
+    return cursor.rowcount
+
+
+class DataEngine:
+    """Catalog, paging and writes for one server, without any UI
+
+    Drives a db_connections.ConnectionPool; reads go through read_pool when
+    one is given (e.g. a read-intent pool).
+    """
+
+    def __init__(self, pool, read_pool=None):
+        self.pool = pool
+        self.read_pool = read_pool or pool
+
+    def query(self, database: Optional[str], query: str, *params) -> List[Any]:
+        with self.read_pool.connection() as connection:
+            cursor = connection.cursor()
+            if database:
+                cursor.execute(f"USE [{database}]")
+            cursor.execute(query, *params)
+            return cursor.fetchall()
+
+    # Catalog
+
+    def databases(self) -> List[str]:
+        return [row[0] for row in self.query(None, DATABASES_QUERY)]
+
+    def schemas(self, database: str) -> List[str]:
+        return user_schemas([row[0] for row in self.query(database, SCHEMAS_QUERY)])
+
+    def tables(self, database: str, schema: str) -> List[Tuple[str, str]]:
+        """(name, TABLE_TYPE) of the tables and views in a schema"""
+        return [tuple(row) for row in self.query(database, TABLES_QUERY, schema)]
+
+    def table_structure(self, database: str, schema: str, table: str) -> Dict[str, Any]:
+        """columns, primary_key and rowversion_column of a table"""
+        columns = parse_columns(self.query(database, COLUMNS_QUERY, table, schema))
+        pk_rows = self.query(database, PRIMARY_KEY_QUERY, quote_table(schema, table))
+        return {
+            "columns": columns,
+            "primary_key": [row[0] for row in pk_rows],
+            "rowversion_column": find_rowversion_column(columns),
+        }
+
+    # Pages
+
+    def count(self, database: str, full_table_name: str, where_clause="") -> int:
+        return self.query(
+            database, build_count_query(full_table_name, where_clause)
+        )[0][0]
+
+    def fetch_page(
+        self,
+        database: str,
+        full_table_name: str,
+        where_clause="",
+        page=1,
+        page_size=100,
+        key_column: Optional[str] = None,
+    ) -> ColumnarPage:
+        """One page, in key order when a single-column key is given"""
+        if key_column:
+            query = build_key_page_query(
+                full_table_name, where_clause, key_column, page, page_size
+            )
+        else:
+            query = build_page_query(full_table_name, where_clause, page, page_size)
+        with self.read_pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"USE [{database}]")
+            cursor.execute(query)
+            return ColumnarPage.from_cursor(cursor)
+
+    def iter_rows(
+        self, database: str, full_table_name: str, where_clause="", batch_size=1000
+    ) -> Iterator[Tuple[List[str], List[Any]]]:
+        """(column names, batch of rows) for every row matching a filter"""
+        with self.read_pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"USE [{database}]")
+            query = f"SELECT * FROM {full_table_name}"
+            if where_clause:
+                query += f" WHERE {where_clause}"
+            cursor.execute(query)
+            names = [column[0] for column in cursor.description]
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    return
+                yield names, batch
+
+    # Writes
+
+    def write(self, database: str, writer, *args):
+        """Run one writer function in its own transaction"""
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"USE [{database}]")
+            result = writer(cursor, *args)
+            connection.commit()
+            return result
@@ -0,0 +1,254 @@
+"""In-process stand-in for a pyodbc SQL Server connection, backed by SQLite
+
+Answers the catalog queries of engine.py, change_detection.py and table_copy.py
+from its own metadata and translates the T-SQL the engine emits (bracketed
+[schema].[table] names, OFFSET/FETCH paging, TOP with ORDER BY, OPTION hints,
+COUNT_BIG, N'...' literals), so the engine can be exercised and benchmarked on a
+machine without SQL Server.
+"""
+
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+from change_detection import PRIMARY_KEY_QUERY
+from engine import COLUMNS_QUERY, DATABASES_QUERY, SCHEMAS_QUERY, TABLES_QUERY
+from table_copy import COMPUTED_COLUMNS_QUERY, IDENTITY_COLUMN_QUERY
+
+# SQL Server type -> declared SQLite type (which picks the converter below)
+SQLITE_TYPES = {
+    "int": "INTEGER",
+    "bigint": "INTEGER",
+    "smallint": "INTEGER",
+    "tinyint": "INTEGER",
+    "bit": "INTEGER",
+    "float": "REAL",
+    "real": "REAL",
+    "decimal": "DECIMAL",
+    "numeric": "DECIMAL",
+    "money": "DECIMAL",
+    "datetime": "DATETIME",
+    "datetime2": "DATETIME",
+    "date": "DATEONLY",
+    "char": "TEXT",
+    "varchar": "TEXT",
+    "nchar": "TEXT",
+    "nvarchar": "TEXT",
+    "uniqueidentifier": "TEXT",
+    "varbinary": "BLOB",
+}
+
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("DECIMAL", lambda raw: Decimal(raw.decode()))
+sqlite3.register_converter(
+    "DATETIME", lambda raw: datetime.fromisoformat(raw.decode())
+)
+sqlite3.register_converter("DATEONLY", lambda raw: date.fromisoformat(raw.decode()))
+
+TABLE_NAME_RE = re.compile(r"\[([^\]]+)\]\.\[([^\]]+)\]")
+OPTION_RE = re.compile(r"OPTION\s*\([^)]*\)", re.IGNORECASE)
+COUNT_BIG_RE = re.compile(r"\bCOUNT_BIG\(", re.IGNORECASE)
+OFFSET_FETCH_RE = re.compile(
+    r"OFFSET\s+(\d+)\s+ROWS\s+FETCH\s+NEXT\s+(\d+)\s+ROWS\s+ONLY", re.IGNORECASE
+)
+# N'...' Unicode string literals; SQLite strings are Unicode already
+UNICODE_LITERAL_RE = re.compile(r"(?<![\w'])N'")
+# SELECT TOP (n) ... ORDER BY [key] [DESC], as in the key seek query
+TOP_ORDER_BY_RE = re.compile(
+    r"SELECT\s+TOP\s*\((\d+)\)\s(.*?ORDER BY \[[^\]]+\](?: DESC)?)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def translate(query: str) -> str:
+    """T-SQL as emitted by the engine -> SQLite"""
+    query = TABLE_NAME_RE.sub(lambda m: f'"{m.group(1)}.{m.group(2)}"', query)
+    query = OPTION_RE.sub("", query)
+    query = UNICODE_LITERAL_RE.sub("'", query)
+    query = COUNT_BIG_RE.sub("COUNT(", query)
+    query = TOP_ORDER_BY_RE.sub(r"SELECT \2 LIMIT \1", query)
+    return OFFSET_FETCH_RE.sub(r"LIMIT \2 OFFSET \1", query)
+
+
+class FakeServer:
+    """One database's tables in SQLite plus the catalog metadata to describe them"""
+
+    def __init__(self, database: str = "bench", path: str = ":memory:"):
+        self.database = database
+        self.db = sqlite3.connect(
+            path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False
+        )
+        self.lock = threading.Lock()
+        # (schema, table) -> {"columns": [(name, type, scale)], "primary_key": [...]}
+        self.tables: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def create_table(
+        self,
+        schema: str,
+        table: str,
+        columns: Sequence[Tuple[str, str, Optional[int]]],
+        primary_key: Sequence[str] = (),
+    ):
+        """Create a table from (name, SQL Server type, scale) columns"""
+        definitions = [
+            f"[{name}] {SQLITE_TYPES.get(data_type, 'TEXT')}"
+            for name, data_type, _ in columns
+        ]
+        if primary_key:
+            keys = ", ".join(f"[{name}]" for name in primary_key)
+            definitions.append(f"PRIMARY KEY ({keys})")
+        with self.lock:
+            self.db.execute(f'DROP TABLE IF EXISTS "{schema}.{table}"')
+            self.db.execute(
+                f'CREATE TABLE "{schema}.{table}" ({", ".join(definitions)})'
+            )
+            self.db.commit()
+        self.tables[(schema, table)] = {
+            "columns": list(columns),
+            "primary_key": list(primary_key),
+        }
+
+    def insert_rows(self, schema: str, table: str, rows: Sequence[Sequence[Any]]):
+        count = len(self.tables[(schema, table)]["columns"])
+        placeholders = ", ".join("?" * count)
+        with self.lock:
+            self.db.executemany(
+                f'INSERT INTO "{schema}.{table}" VALUES ({placeholders})', rows
+            )
+            self.db.commit()
+
+    def catalog(self, query: str, params: Sequence[Any]) -> Optional[List[tuple]]:
+        """Rows for a catalog query, or None if it is not one"""
+        if query == DATABASES_QUERY:
+            return [(self.database,)]
+        if query == SCHEMAS_QUERY:
+            return sorted({(schema,) for schema, _ in self.tables})
+        if query == TABLES_QUERY:
+            return sorted(
+                (table, "BASE TABLE")
+                for schema, table in self.tables
+                if schema == params[0]
+            )
+        if query == COLUMNS_QUERY:
+            info = self.tables.get((params[1], params[0]))
+            if info is None:
+                return []
+            return [
+                (name, data_type, "YES", None, scale)
+                for name, data_type, scale in info["columns"]
+            ]
+        if query == PRIMARY_KEY_QUERY:
+            match = TABLE_NAME_RE.fullmatch(params[0])
+            info = self.tables.get(match.groups()) if match else None
+            return [(name,) for name in info["primary_key"]] if info else []
+        if query in (IDENTITY_COLUMN_QUERY, COMPUTED_COLUMNS_QUERY):
+            return []
+        return None
+
+    def connect(self) -> "FakeConnection":
+        return FakeConnection(self)
+
+    def pool(self) -> "FakePool":
+        return FakePool(self)
+
+
+class FakeCursor:
+    def __init__(self, server: FakeServer):
+        self.server = server
+        self.description = None
+        self.rowcount = -1
+        self._rows: Optional[List[tuple]] = None
+        self._cursor = None
+
+    def execute(self, query: str, *params):
+        # pyodbc takes parameters either spread out or as one sequence
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = tuple(params[0])
+
+        self._rows = None
+        self._cursor = None
+        if query.strip().upper().startswith("USE "):
+            self.description = None
+            return self
+
+        rows = self.server.catalog(query, params)
+        if rows is not None:
+            self._rows = list(rows)
+            width = len(rows[0]) if rows else 0
+            self.description = [(f"col{n}",) + (None,) * 6 for n in range(width)]
+            self.rowcount = len(rows)
+            return self
+
+        with self.server.lock:
+            self._cursor = self.server.db.execute(translate(query), params)
+            self.description = self._cursor.description
+            self.rowcount = self._cursor.rowcount
+        return self
+
+    def executemany(self, query: str, rows):
+        self._rows = None
+        with self.server.lock:
+            self._cursor = self.server.db.executemany(translate(query), rows)
+            self.description = None
+            self.rowcount = self._cursor.rowcount
+        return self
+
+    def fetchone(self):
+        if self._rows is not None:
+            return self._rows.pop(0) if self._rows else None
+        return self._cursor.fetchone() if self._cursor else None
+
+    def fetchmany(self, size: int = 1):
+        if self._rows is not None:
+            batch, self._rows = self._rows[:size], self._rows[size:]
+            return batch
+        return self._cursor.fetchmany(size) if self._cursor else []
+
+    def fetchall(self):
+        if self._rows is not None:
+            rows, self._rows = self._rows, []
+            return rows
+        return self._cursor.fetchall() if self._cursor else []
+
+    def close(self):
+        self._cursor = None
+
+
+class FakeConnection:
+    def __init__(self, server: FakeServer):
+        self.server = server
+        self.timeout = 0
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self.server)
+
+    def commit(self):
+        with self.server.lock:
+            self.server.db.commit()
+
+    def rollback(self):
+        with self.server.lock:
+            self.server.db.rollback()
+
+    def close(self):
+        pass
+
+
+class FakePool:
+    """Just enough of ConnectionPool for DataEngine"""
+
+    def __init__(self, server: FakeServer):
+        self.server = server
+
+    @contextmanager
+    def connection(self, timeout=30.0):
+        yield self.server.connect()
+
+    def close(self):
+        pass
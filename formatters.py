@@ -0,0 +1,81 @@
+from datetime import date, time
+from typing import Any, Callable, Dict, Optional
+
+Formatter = Callable[[Any], str]
+
+DATETIME_TYPES = {"datetime", "datetime2", "smalldatetime", "datetimeoffset"}
+DECIMAL_TYPES = {"decimal", "numeric"}
+MONEY_TYPES = {"money", "smallmoney"}
+BINARY_TYPES = {"binary", "varbinary", "image", "timestamp", "rowversion"}
+TEXT_TYPES = {"char", "varchar", "nchar", "nvarchar", "text", "ntext", "xml"}
+
+# Types whose values repeat often enough to be worth formatting once each
+MEMOIZED_TYPES = {"bit", "tinyint", "date", "char", "nchar"} | MONEY_TYPES
+
+DEFAULT_DISPLAY_FORMATS = {
+    "datetime_format": "%Y-%m-%d %H:%M:%S",
+    "date_format": "%Y-%m-%d",
+    "time_format": "%H:%M:%S",
+    "max_text_length": 200,
+    "binary_preview_bytes": 16,
+}
+
+
+def strftime_formatter(fmt: str) -> Formatter:
+    # Some drivers hand back unsupported types (e.g. datetimeoffset) as strings
+    def format_value(value):
+        if isinstance(value, (date, time)):
+            return value.strftime(fmt)
+        return str(value)
+
+    return format_value
+
+
+def decimal_formatter(scale: Optional[int]) -> Formatter:
+    if scale is None:
+        return lambda value: format(value, "f")
+    return lambda value: format(value, f".{scale}f")
+
+
+def binary_formatter(preview_bytes: int) -> Formatter:
+    def format_value(value):
+        if not isinstance(value, (bytes, bytearray)):
+            return str(value)
+        text = "0x" + value[:preview_bytes].hex().upper()
+        return text + "…" if len(value) > preview_bytes else text
+
+    return format_value
+
+
+def text_formatter(max_length: int) -> Formatter:
+    def format_value(value):
+        text = str(value)
+        return text if len(text) <= max_length else text[: max_length - 1] + "…"
+
+    return format_value
+
+
+def make_formatter(
+    data_type: str,
+    scale: Optional[int] = None,
+    formats: Optional[Dict[str, Any]] = None,
+) -> Formatter:
+    """Display formatter for one column, chosen from its INFORMATION_SCHEMA type"""
+    formats = {**DEFAULT_DISPLAY_FORMATS, **(formats or {})}
+    data_type = data_type.lower()
+
+    if data_type in DATETIME_TYPES:
+        return strftime_formatter(formats["datetime_format"])
+    if data_type == "date":
+        return strftime_formatter(formats["date_format"])
+    if data_type == "time":
+        return strftime_formatter(formats["time_format"])
+    if data_type in DECIMAL_TYPES:
+        return decimal_formatter(scale)
+    if data_type in MONEY_TYPES:
+        return decimal_formatter(4 if scale is None else scale)
+    if data_type in BINARY_TYPES:
+        return binary_formatter(formats["binary_preview_bytes"])
+    if data_type in TEXT_TYPES:
+        return text_formatter(formats["max_text_length"])
+    return str
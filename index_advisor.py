@@ -0,0 +1,160 @@
+from collections import Counter
+from typing import List, Dict, Any, Optional
+
+MISSING_INDEX_QUERY = """
+SELECT
+    mid.equality_columns,
+    mid.inequality_columns,
+    mid.included_columns,
+    migs.user_seeks,
+    migs.user_scans,
+    migs.avg_total_user_cost,
+    migs.avg_user_impact,
+    migs.last_user_seek
+FROM sys.dm_db_missing_index_details AS mid
+JOIN sys.dm_db_missing_index_groups AS mig
+    ON mig.index_handle = mid.index_handle
+JOIN sys.dm_db_missing_index_group_stats AS migs
+    ON migs.group_handle = mig.index_group_handle
+WHERE mid.database_id = DB_ID()
+AND mid.object_id = OBJECT_ID(?)
+"""
+
+INDEX_USAGE_QUERY = """
+SELECT
+    i.name,
+    i.type_desc,
+    i.is_primary_key,
+    ISNULL(us.user_seeks, 0),
+    ISNULL(us.user_scans, 0),
+    ISNULL(us.user_lookups, 0),
+    ISNULL(us.user_updates, 0),
+    STUFF((
+        SELECT ', ' + c.name
+        FROM sys.index_columns AS ic
+        JOIN sys.columns AS c
+            ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+        WHERE ic.object_id = i.object_id
+        AND ic.index_id = i.index_id
+        AND ic.is_included_column = 0
+        ORDER BY ic.key_ordinal
+        FOR XML PATH('')
+    ), 1, 2, '') AS key_columns
+FROM sys.indexes AS i
+LEFT JOIN sys.dm_db_index_usage_stats AS us
+    ON us.object_id = i.object_id
+    AND us.index_id = i.index_id
+    AND us.database_id = DB_ID()
+WHERE i.object_id = OBJECT_ID(?)
+AND i.type > 0
+ORDER BY i.index_id
+"""
+
+# Boost applied to DMV suggestions whose key columns the app actually filters on
+APP_USAGE_WEIGHT = 0.25
+
+
+def split_column_list(columns: Optional[str]) -> List[str]:
+    """Split a DMV column list like '[A], [B]' into plain column names"""
+    if not columns:
+        return []
+    return [col.strip().strip("[]") for col in columns.split(",") if col.strip()]
+
+
+def build_create_index_script(
+    schema: str,
+    table: str,
+    key_columns: List[str],
+    include_columns: Optional[List[str]] = None,
+) -> str:
+    """Generate (but do not run) a CREATE INDEX statement"""
+    name = "IX_{}_{}".format(table, "_".join(key_columns))[:128]
+    keys = ", ".join(f"[{col}]" for col in key_columns)
+    script = f"CREATE NONCLUSTERED INDEX [{name}]\nON [{schema}].[{table}] ({keys})"
+    if include_columns:
+        includes = ", ".join(f"[{col}]" for col in include_columns)
+        script += f"\nINCLUDE ({includes})"
+    return script + ";"
+
+
+def parse_index_usage(rows) -> List[Dict[str, Any]]:
+    """Turn INDEX_USAGE_QUERY rows into dicts"""
+    return [
+        {
+            "name": row[0],
+            "type": row[1],
+            "is_primary_key": bool(row[2]),
+            "seeks": row[3],
+            "scans": row[4],
+            "lookups": row[5],
+            "updates": row[6],
+            "key_columns": split_column_list(row[7]),
+        }
+        for row in rows
+    ]
+
+
+def rank_index_suggestions(
+    schema: str,
+    table: str,
+    missing_rows,
+    existing_indexes: List[Dict[str, Any]],
+    column_usage: Counter,
+) -> List[Dict[str, Any]]:
+    """Rank missing-index DMV rows and unindexed filter columns by impact"""
+    leading_columns = {
+        index["key_columns"][0].lower()
+        for index in existing_indexes
+        if index["key_columns"]
+    }
+    total_usage = sum(column_usage.values()) or 1
+    suggestions = []
+    covered = set()
+
+    for row in missing_rows:
+        equality = split_column_list(row[0])
+        inequality = split_column_list(row[1])
+        include = split_column_list(row[2])
+        key_columns = equality + inequality
+
+        # Standard estimate: cost saved per query * improvement * times requested
+        # (avg_user_impact is a percentage)
+        impact = (row[3] + row[4]) * row[5] * row[6] / 100
+        app_hits = sum(column_usage.get(col, 0) for col in key_columns)
+        impact *= 1 + APP_USAGE_WEIGHT * app_hits / total_usage
+
+        covered.update(col.lower() for col in key_columns[:1])
+        suggestions.append(
+            {
+                "source": "Missing index DMV",
+                "impact": impact,
+                "key_columns": key_columns,
+                "include_columns": include,
+                "detail": f"{row[3]} seeks, {row[4]} scans, "
+                f"{row[6]:.0f}% avg improvement",
+                "script": build_create_index_script(
+                    schema, table, key_columns, include
+                ),
+            }
+        )
+
+    # Columns the app filters on that no index (or DMV suggestion) leads with
+    for column, hits in column_usage.most_common():
+        if column.lower() in leading_columns or column.lower() in covered:
+            continue
+        suggestions.append(
+            {
+                "source": "App filter usage",
+                "impact": float(hits),
+                "key_columns": [column],
+                "include_columns": [],
+                "detail": f"filtered {hits} time(s), no index leads with it",
+                "script": build_create_index_script(schema, table, [column]),
+            }
+        )
+
+    # DMV estimates first (they are server-measured), then app usage by hit count
+    suggestions.sort(
+        key=lambda s: (s["source"] == "Missing index DMV", s["impact"]), reverse=True
+    )
+    return suggestions
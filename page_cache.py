@@ -0,0 +1,167 @@
+import json
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple, Any
+
+from session_store import CONFIG_DIR
+
+PAGE_CACHE_PATH = CONFIG_DIR / "page_cache.sqlite3"
+
+# One tiny round trip that changes whenever the table's data (or shape) changes.
+# last_user_update is reset by a server restart, which also (correctly) fails
+# validation of anything cached before the restart. Only meaningful on the
+# primary: a readable secondary's usage stats don't see replayed changes.
+TABLE_VALIDATOR_QUERY = """
+SELECT
+    (SELECT CONVERT(varchar(30), MAX(last_user_update), 126)
+     FROM sys.dm_db_index_usage_stats
+     WHERE database_id = DB_ID() AND object_id = OBJECT_ID(?)),
+    (SELECT SUM(row_count)
+     FROM sys.dm_db_partition_stats
+     WHERE object_id = OBJECT_ID(?) AND index_id IN (0, 1)),
+    (SELECT CONVERT(varchar(30), modify_date, 126)
+     FROM sys.objects
+     WHERE object_id = OBJECT_ID(?))
+"""
+
+
+def make_page_key(
+    server: str,
+    database: str,
+    table: str,
+    where_clause: str,
+    order_by: str,
+    page: int,
+    page_size: int,
+) -> str:
+    """Cache key for one fetched page"""
+    return json.dumps(
+        [server, database, table, where_clause, order_by, page, page_size]
+    )
+
+
+class PageCache:
+    """Fetched pages stored in a local SQLite file with TTL and size-based eviction"""
+
+    def __init__(
+        self,
+        path: Path = PAGE_CACHE_PATH,
+        ttl_seconds: float = 3600,
+        max_bytes: int = 200 * 1024 * 1024,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                server TEXT,
+                database_name TEXT,
+                table_name TEXT,
+                validator TEXT,
+                total_records INTEGER,
+                rows BLOB,
+                size INTEGER,
+                created REAL,
+                last_used REAL
+            )
+            """
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS pages_table "
+            "ON pages (server, database_name, table_name)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS pages_lru ON pages (last_used)")
+        self.db.commit()
+
+    def get(self, key: str, validator: str) -> Optional[Tuple[int, List[Tuple]]]:
+        """(total_records, rows) if cached, fresh and still valid on the server"""
+        row = self.db.execute(
+            "SELECT validator, total_records, rows, created FROM pages WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        cached_validator, total_records, blob, created = row
+        if cached_validator != validator or time.time() - created > self.ttl_seconds:
+            self.db.execute("DELETE FROM pages WHERE key = ?", (key,))
+            self.db.commit()
+            return None
+
+        self.db.execute(
+            "UPDATE pages SET last_used = ? WHERE key = ?", (time.time(), key)
+        )
+        self.db.commit()
+        return total_records, pickle.loads(blob)
+
+    def put(
+        self,
+        key: str,
+        server: str,
+        database: str,
+        table: str,
+        validator: str,
+        total_records: int,
+        rows: List[Any],
+    ):
+        """Store a page (rows are converted to plain tuples)"""
+        blob = pickle.dumps([tuple(row) for row in rows], pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        self.db.execute(
+            """
+            INSERT OR REPLACE INTO pages
+            (key, server, database_name, table_name, validator, total_records,
+             rows, size, created, last_used)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                key,
+                server,
+                database,
+                table,
+                validator,
+                total_records,
+                blob,
+                len(blob),
+                now,
+                now,
+            ),
+        )
+        self.db.commit()
+        self.evict()
+
+    def invalidate_table(self, server: str, database: str, table: str):
+        """Forget every cached page of a table (after we wrote to it)"""
+        self.db.execute(
+            "DELETE FROM pages "
+            "WHERE server = ? AND database_name = ? AND table_name = ?",
+            (server, database, table),
+        )
+        self.db.commit()
+
+    def evict(self):
+        """Drop expired pages, then least recently used ones until under max_bytes"""
+        self.db.execute(
+            "DELETE FROM pages WHERE created < ?", (time.time() - self.ttl_seconds,)
+        )
+        total = self.db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM pages"
+        ).fetchone()[0]
+        if total > self.max_bytes:
+            for key, size in self.db.execute(
+                "SELECT key, size FROM pages ORDER BY last_used"
+            ).fetchall():
+                self.db.execute("DELETE FROM pages WHERE key = ?", (key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,206 @@
+"""Export a table in parallel, one key range per pooled connection
+
+The key space of a single-column primary key is split into ranges of similar
+row counts (from the statistics histogram when readable, NTILE otherwise),
+and each range is read on its own connection into its own CSV file.
+"""
+
+import csv
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+# Histogram of the primary key's statistics: up to 200 steps, no table scan.
+# range_high_key is a sql_variant, which ODBC can't fetch; it is cast back to
+# the key's type.
+KEY_HISTOGRAM_QUERY = """
+SELECT CAST(h.range_high_key AS {key_type}), h.equal_rows + h.range_rows
+FROM sys.stats AS s
+JOIN sys.indexes AS i
+    ON i.object_id = s.object_id AND i.index_id = s.stats_id
+CROSS APPLY sys.dm_db_stats_histogram(s.object_id, s.stats_id) AS h
+WHERE s.object_id = OBJECT_ID(?) AND i.is_primary_key = 1
+ORDER BY h.step_number
+"""
+
+# Types the histogram key can be cast to as-is; others go through nvarchar
+CASTABLE_KEY_TYPES = {
+    "int",
+    "bigint",
+    "smallint",
+    "tinyint",
+    "date",
+    "datetime",
+    "datetime2",
+    "uniqueidentifier",
+}
+
+
+def key_cast_type(data_type: str) -> str:
+    return data_type if data_type.lower() in CASTABLE_KEY_TYPES else "nvarchar(4000)"
+
+
+def build_ntile_query(full_table_name: str, key_column: str, where_clause="") -> str:
+    """Exact split by NTILE over the key (param: number of parts); scans the key"""
+    where = f"WHERE {where_clause}" if where_clause else ""
+    return f"""
+    SELECT MAX(k) FROM (
+        SELECT [{key_column}] AS k, NTILE(?) OVER (ORDER BY [{key_column}]) AS tile
+        FROM {full_table_name}
+        {where}
+    ) AS tiles
+    GROUP BY tile
+    ORDER BY tile
+    """
+
+
+def choose_boundaries(histogram: List[Tuple[Any, int]], parts: int) -> List[Any]:
+    """Keys splitting histogram steps into `parts` ranges of similar row counts"""
+    total = sum(rows or 0 for _, rows in histogram)
+    if parts <= 1 or not total:
+        return []
+    boundaries = []
+    cumulative = 0
+    target = total / parts
+    for key, rows in histogram[:-1]:
+        cumulative += rows or 0
+        if cumulative >= target * (len(boundaries) + 1):
+            boundaries.append(key)
+            if len(boundaries) == parts - 1:
+                break
+    return boundaries
+
+
+def key_ranges(boundaries: List[Any]) -> List[Tuple[Optional[Any], Optional[Any]]]:
+    """(low, high] ranges covering the whole key space; None is unbounded"""
+    edges = [None] + list(boundaries) + [None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def range_predicate(key_column: str, low, high) -> Tuple[str, List[Any]]:
+    """WHERE fragment and params for low < key <= high"""
+    conditions, params = [], []
+    if low is not None:
+        conditions.append(f"[{key_column}] > ?")
+        params.append(low)
+    if high is not None:
+        conditions.append(f"[{key_column}] <= ?")
+        params.append(high)
+    return " AND ".join(conditions) or "1 = 1", params
+
+
+def split_key_ranges(
+    cursor, full_table_name: str, key_column: str, key_type: str, parts: int, where=""
+):
+    """Key ranges from the statistics histogram, or from NTILE without one"""
+    boundaries = []
+    try:
+        cursor.execute(
+            KEY_HISTOGRAM_QUERY.format(key_type=key_cast_type(key_type)),
+            full_table_name,
+        )
+        boundaries = choose_boundaries(
+            [(row[0], row[1]) for row in cursor.fetchall()], parts
+        )
+    except Exception:
+        pass  # No permission on the DMF, or a server before 2016 SP1 CU2
+    if not boundaries and parts > 1:
+        cursor.execute(build_ntile_query(full_table_name, key_column, where), parts)
+        boundaries = [row[0] for row in cursor.fetchall()][:-1]
+    return key_ranges(boundaries)
+
+
+def export_parallel(
+    pool,
+    database: str,
+    full_table_name: str,
+    key_column: str,
+    key_type: str,
+    output: str,
+    where_clause="",
+    parts=8,
+    dop=4,
+    ordered=True,
+    batch_size=5000,
+    progress: Optional[Callable[[int, float], None]] = None,
+) -> Dict[str, Any]:
+    """Export matching rows as `parts` key ranges read by `dop` threads
+
+    The pool needs at least dop connections. With ordered=True the parts are
+    concatenated in key order into `output`; otherwise `output` is a
+    directory of one CSV per range. Returns rows, seconds, rows_per_sec and
+    files.
+    """
+    start = time.perf_counter()
+    with pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"USE [{database}]")
+        ranges = split_key_ranges(
+            cursor, full_table_name, key_column, key_type, parts, where_clause
+        )
+
+    if ordered:
+        part_dir = output + ".parts"
+    else:
+        part_dir = output
+    os.makedirs(part_dir, exist_ok=True)
+
+    lock = threading.Lock()
+    done = {"rows": 0}
+
+    def export_range(index, low, high):
+        path = os.path.join(part_dir, f"part_{index:04d}.csv")
+        predicate, params = range_predicate(key_column, low, high)
+        if where_clause:
+            predicate = f"({where_clause}) AND {predicate}"
+        query = (
+            f"SELECT * FROM {full_table_name} WHERE {predicate} "
+            f"ORDER BY [{key_column}]"
+        )
+        with pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"USE [{database}]")
+            cursor.execute(query, params)
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                header = [column[0] for column in cursor.description]
+                if not ordered:
+                    writer.writerow(header)
+                while True:
+                    batch = cursor.fetchmany(batch_size)
+                    if not batch:
+                        break
+                    writer.writerows(batch)
+                    with lock:
+                        done["rows"] += len(batch)
+                        if progress:
+                            progress(done["rows"], time.perf_counter() - start)
+        return path, header
+
+    with ThreadPoolExecutor(max_workers=max(1, dop)) as executor:
+        futures = [
+            executor.submit(export_range, index, low, high)
+            for index, (low, high) in enumerate(ranges)
+        ]
+        results = [future.result() for future in futures]
+    files = [path for path, _ in results]
+
+    if ordered:
+        with open(output, "w", newline="", encoding="utf-8") as out:
+            csv.writer(out).writerow(results[0][1])
+            for path in files:
+                with open(path, encoding="utf-8", newline="") as part:
+                    shutil.copyfileobj(part, out)
+        shutil.rmtree(part_dir)
+        files = [output]
+
+    seconds = time.perf_counter() - start
+    return {
+        "rows": done["rows"],
+        "seconds": seconds,
+        "rows_per_sec": done["rows"] / seconds if seconds else 0.0,
+        "files": files,
+    }
@@ -0,0 +1,222 @@
+import re
+import xml.etree.ElementTree as ET
+from typing import List, Dict, Any, Optional
+
+SHOWPLAN_NS = "{http://schemas.microsoft.com/sqlserver/2004/07/showplan}"
+
+SCAN_OPERATORS = {"Table Scan", "Clustered Index Scan", "Index Scan"}
+SEEK_OPERATORS = {"Clustered Index Seek", "Index Seek", "RID Lookup", "Key Lookup"}
+
+STATISTICS_IO_RE = re.compile(
+    r"Table '(?P<table>[^']+)'\. Scan count (?P<scan_count>\d+), "
+    r"logical reads (?P<logical_reads>\d+), physical reads (?P<physical_reads>\d+)"
+    r"(?:.*?read-ahead reads (?P<read_ahead_reads>\d+))?"
+)
+STATISTICS_TIME_RE = re.compile(
+    r"CPU time = (?P<cpu_ms>\d+) ms,\s+elapsed time = (?P<elapsed_ms>\d+) ms"
+)
+
+
+def _tag(name):
+    return f"{SHOWPLAN_NS}{name}"
+
+
+def _float(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _strip_brackets(name):
+    return name.strip("[]") if name else name
+
+
+def _estimated_rows_read(rel_op):
+    """Rows an access operator reads over all its executions
+
+    EstimateRows is what it returns, which a TOP or OFFSET/FETCH row goal
+    caps near the page size; EstimatedRowsRead (SQL Server 2016 SP1+) and
+    EstimateRowsWithoutRowGoal aren't capped.
+    """
+    per_execution = rel_op.get("EstimatedRowsRead")
+    if per_execution is None:
+        per_execution = rel_op.get("EstimateRowsWithoutRowGoal")
+    if per_execution is None:
+        per_execution = rel_op.get("EstimateRows")
+    rebinds = _float(rel_op.get("EstimateRebinds"))
+    rewinds = _float(rel_op.get("EstimateRewinds"))
+    executions = 1 + rebinds + rewinds
+    return _float(per_execution) * executions
+
+
+def summarize_showplan(plan_xml: str) -> Dict[str, Any]:
+    """Summarize a SHOWPLAN_XML / STATISTICS XML document"""
+    root = ET.fromstring(plan_xml)
+    summary: Dict[str, Any] = {
+        "statement_cost": 0.0,
+        "estimated_rows": 0.0,
+        "estimated_rows_read": 0.0,
+        "actual_rows": None,
+        "operators": [],
+        "scans": 0,
+        "seeks": 0,
+        "missing_indexes": [],
+        "warnings": [],
+    }
+
+    for stmt in root.iter(_tag("StmtSimple")):
+        summary["statement_cost"] += _float(stmt.get("StatementSubTreeCost"))
+        summary["estimated_rows"] += _float(stmt.get("StatementEstRows"))
+
+    for rel_op in root.iter(_tag("RelOp")):
+        physical_op = rel_op.get("PhysicalOp", "")
+        operator = {
+            "physical_op": physical_op,
+            "logical_op": rel_op.get("LogicalOp", ""),
+            "estimated_rows": _float(rel_op.get("EstimateRows")),
+            "estimated_rows_read": 0.0,
+            "subtree_cost": _float(rel_op.get("EstimatedTotalSubtreeCost")),
+            "object": None,
+            "actual_rows": None,
+        }
+
+        obj = None
+        for child in rel_op:
+            if child.tag == _tag("RelOp"):
+                continue
+            obj = child.find(_tag("Object"))
+            if obj is not None:
+                break
+        if obj is not None:
+            parts = [
+                _strip_brackets(obj.get(key))
+                for key in ("Schema", "Table", "Index")
+                if obj.get(key)
+            ]
+            operator["object"] = ".".join(parts)
+
+        runtime = rel_op.find(_tag("RunTimeInformation"))
+        if runtime is not None:
+            operator["actual_rows"] = sum(
+                _float(counter.get("ActualRows"))
+                for counter in runtime.iter(_tag("RunTimeCountersPerThread"))
+            )
+
+        if physical_op in SCAN_OPERATORS:
+            summary["scans"] += 1
+        elif physical_op in SEEK_OPERATORS:
+            summary["seeks"] += 1
+        if physical_op in SCAN_OPERATORS | SEEK_OPERATORS:
+            operator["estimated_rows_read"] = _estimated_rows_read(rel_op)
+            summary["estimated_rows_read"] += operator["estimated_rows_read"]
+
+        summary["operators"].append(operator)
+
+    if summary["operators"] and summary["operators"][0]["actual_rows"] is not None:
+        summary["actual_rows"] = summary["operators"][0]["actual_rows"]
+
+    for group in root.iter(_tag("MissingIndexGroup")):
+        impact = _float(group.get("Impact"))
+        for index in group.iter(_tag("MissingIndex")):
+            hint = {
+                "impact": impact,
+                "database": _strip_brackets(index.get("Database")),
+                "schema": _strip_brackets(index.get("Schema")),
+                "table": _strip_brackets(index.get("Table")),
+                "equality": [],
+                "inequality": [],
+                "include": [],
+            }
+            for column_group in index.iter(_tag("ColumnGroup")):
+                usage = column_group.get("Usage", "").lower()
+                if usage not in hint:
+                    continue
+                for column in column_group.iter(_tag("Column")):
+                    hint[usage].append(_strip_brackets(column.get("Name")))
+            summary["missing_indexes"].append(hint)
+
+    for warnings in root.iter(_tag("Warnings")):
+        for warning in warnings:
+            summary["warnings"].append(warning.tag.replace(SHOWPLAN_NS, ""))
+
+    return summary
+
+
+def parse_statistics_messages(messages: List[str]) -> Dict[str, Any]:
+    """Parse SET STATISTICS IO, TIME informational messages"""
+    stats: Dict[str, Any] = {"tables": [], "cpu_ms": 0, "elapsed_ms": 0}
+
+    for message in messages:
+        io_match = STATISTICS_IO_RE.search(message)
+        if io_match:
+            stats["tables"].append(
+                {
+                    "table": io_match.group("table"),
+                    "scan_count": int(io_match.group("scan_count")),
+                    "logical_reads": int(io_match.group("logical_reads")),
+                    "physical_reads": int(io_match.group("physical_reads")),
+                    "read_ahead_reads": int(io_match.group("read_ahead_reads") or 0),
+                }
+            )
+            continue
+
+        # SQL Server reports parse/compile time and execution time separately
+        for time_match in STATISTICS_TIME_RE.finditer(message):
+            stats["cpu_ms"] += int(time_match.group("cpu_ms"))
+            stats["elapsed_ms"] += int(time_match.group("elapsed_ms"))
+
+    stats["logical_reads"] = sum(t["logical_reads"] for t in stats["tables"])
+    stats["physical_reads"] = sum(t["physical_reads"] for t in stats["tables"])
+    return stats
+
+
+def format_plan_summary(
+    title: str, summary: Dict[str, Any], io_stats: Optional[Dict[str, Any]] = None
+) -> str:
+    """Render a plan summary as plain text for the plan panel"""
+    lines = [f"== {title} =="]
+    lines.append(f"Estimated cost: {summary['statement_cost']:.4f}")
+    lines.append(f"Estimated rows: {summary['estimated_rows']:,.0f}")
+    lines.append(f"Estimated rows read: {summary['estimated_rows_read']:,.0f}")
+    if summary["actual_rows"] is not None:
+        lines.append(f"Actual rows: {summary['actual_rows']:,.0f}")
+    lines.append(f"Scans: {summary['scans']}  Seeks: {summary['seeks']}")
+
+    if io_stats:
+        lines.append(
+            f"Logical reads: {io_stats['logical_reads']:,}  "
+            f"Physical reads: {io_stats['physical_reads']:,}"
+        )
+        lines.append(
+            f"CPU: {io_stats['cpu_ms']} ms  Elapsed: {io_stats['elapsed_ms']} ms"
+        )
+        for table in io_stats["tables"]:
+            lines.append(
+                f"  {table['table']}: scans {table['scan_count']}, "
+                f"logical reads {table['logical_reads']:,}"
+            )
+
+    lines.append("")
+    lines.append("Operators:")
+    for op in summary["operators"]:
+        target = f" on {op['object']}" if op["object"] else ""
+        rows = f"{op['estimated_rows']:,.0f} est."
+        if op["actual_rows"] is not None:
+            rows += f" / {op['actual_rows']:,.0f} act."
+        lines.append(f"  {op['physical_op']}{target} ({rows})")
+
+    if summary["missing_indexes"]:
+        lines.append("")
+        lines.append("Missing index hints:")
+        for hint in summary["missing_indexes"]:
+            keys = ", ".join(hint["equality"] + hint["inequality"])
+            lines.append(f"  [{hint['impact']:.1f}% impact] {hint['table']} ({keys})")
+            if hint["include"]:
+                lines.append(f"    INCLUDE ({', '.join(hint['include'])})")
+
+    if summary["warnings"]:
+        lines.append("")
+        lines.append("Warnings: " + ", ".join(summary["warnings"]))
+
+    return "\n".join(lines)
@@ -0,0 +1,246 @@
+import sys
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Python type -> (column kind, array typecode)
+TYPED_KINDS = {
+    bool: ("bool", "b"),
+    int: ("int", "q"),
+    float: ("float", "d"),
+    datetime: ("datetime", "q"),
+    date: ("date", "i"),
+}
+
+
+def format_size(num_bytes: int) -> str:
+    """Human readable byte count"""
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class PageColumn:
+    """One column of a page: a typed array (or dictionary-encoded text) plus a
+    null bitmap, falling back to a plain list for anything else"""
+
+    __slots__ = ("kind", "values", "nulls", "length", "text", "lookup")
+
+    def __init__(self):
+        self.kind: Optional[str] = None  # None until the first non-NULL value
+        self.values: Any = None
+        self.nulls = bytearray()
+        self.length = 0
+        self.text: List[str] = []
+        self.lookup: Optional[dict] = {}
+
+    def append(self, value: Any):
+        n = self.length
+        if n % 8 == 0:
+            self.nulls.append(0)
+        self.length = n + 1
+
+        if value is None:
+            self.nulls[n >> 3] |= 1 << (n & 7)
+            if self.kind is not None:
+                self.values.append(None if self.kind == "object" else 0)
+            return
+
+        if self.kind is None:
+            self.start(value, n)
+        try:
+            self.values.append(self.encode(value))
+        except (TypeError, OverflowError, ValueError):
+            # Mixed types or out of range: keep this column as plain objects
+            self.to_objects()
+            self.values.append(value)
+
+    def start(self, value: Any, leading_nulls: int):
+        """Pick the storage from the first non-NULL value"""
+        kind, typecode = TYPED_KINDS.get(type(value), ("object", None))
+        if kind == "datetime" and value.tzinfo is not None:
+            kind, typecode = "object", None
+        if type(value) is str:
+            kind, typecode = "text", "I"
+
+        self.kind = kind
+        if typecode is None:
+            self.values = [None] * leading_nulls
+        else:
+            self.values = array(typecode, [0]) * leading_nulls
+
+    def encode(self, value: Any) -> Any:
+        kind = self.kind
+        if kind == "object":
+            return value
+        if kind == "text":
+            if type(value) is not str:
+                raise TypeError(kind)
+            code = self.lookup.get(value)
+            if code is None:
+                code = self.lookup[value] = len(self.text)
+                self.text.append(sys.intern(value))
+            return code
+        if TYPED_KINDS.get(type(value), (None,))[0] != kind:
+            raise TypeError(kind)
+        if kind == "datetime":
+            if value.tzinfo is not None:
+                raise TypeError(kind)
+            return (value - EPOCH) // ONE_MICROSECOND
+        if kind == "date":
+            return value.toordinal()
+        return value
+
+    def decode(self, stored: Any) -> Any:
+        kind = self.kind
+        if kind == "text":
+            return self.text[stored]
+        if kind == "datetime":
+            return EPOCH + timedelta(microseconds=stored)
+        if kind == "date":
+            return date.fromordinal(stored)
+        if kind == "bool":
+            return bool(stored)
+        return stored
+
+    def is_null(self, index: int) -> bool:
+        return bool(self.nulls[index >> 3] & (1 << (index & 7)))
+
+    def get(self, index: int) -> Any:
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        if self.kind is None or self.is_null(index):
+            return None
+        return self.decode(self.values[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.kind is None:
+            return iter([None] * self.length)
+        if self.kind == "object":
+            return iter(self.values)
+        return (
+            None if self.is_null(n) else self.decode(stored)
+            for n, stored in enumerate(self.values)
+        )
+
+    def to_objects(self):
+        """Give up on typed storage for this column"""
+        self.values = list(self)
+        self.kind = "object"
+        self.text = []
+        self.lookup = None
+
+    def finish(self):
+        """Drop build-time state once the page is complete"""
+        self.lookup = None
+
+    def nbytes(self) -> int:
+        """Approximate memory held by this column"""
+        size = sys.getsizeof(self.nulls)
+        if self.kind == "object":
+            size += sys.getsizeof(self.values)
+            size += sum(sys.getsizeof(v) for v in self.values if v is not None)
+        elif self.values is not None:
+            size += sys.getsizeof(self.values)
+        if self.text:
+            size += sys.getsizeof(self.text)
+            size += sum(sys.getsizeof(s) for s in self.text)
+        return size
+
+
+class ColumnarPage:
+    """A page of rows stored column by column
+
+    Behaves like a read-only list of tuples, so code that indexes, iterates or
+    pickles current_data keeps working.
+    """
+
+    def __init__(self, columns: List[PageColumn], length: int):
+        self.columns = columns
+        self.length = length
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any], column_count: int = 0) -> "ColumnarPage":
+        columns = [PageColumn() for _ in range(column_count)]
+        length = 0
+        for row in rows:
+            if not columns:
+                columns = [PageColumn() for _ in range(len(row))]
+            for column, value in zip(columns, row):
+                column.append(value)
+            length += 1
+        for column in columns:
+            column.finish()
+        return cls(columns, length)
+
+    @classmethod
+    def from_cursor(cls, cursor, batch_size: int = 1000) -> "ColumnarPage":
+        """Fetch the cursor's result in batches straight into columns"""
+
+        def rows():
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    return
+                yield from batch
+
+        return cls.from_rows(rows(), len(cursor.description))
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __bool__(self) -> bool:
+        return self.length > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[n] for n in range(*index.indices(self.length))]
+        return tuple(column.get(index) for column in self.columns)
+
+    def __iter__(self) -> Iterator[tuple]:
+        return zip(*self.columns)
+
+    def column(self, index: int) -> List[Any]:
+        """All values of one column"""
+        return list(self.columns[index])
+
+    def display_column(
+        self, index: int, formatter: Callable[[Any], str] = str, memoize=False
+    ) -> List[str]:
+        """One column formatted for display, None as an empty string
+
+        Dictionary-encoded text is formatted once per distinct value; other
+        columns are memoized by value when asked to.
+        """
+        column = self.columns[index]
+        if column.kind is None:
+            return [""] * self.length
+        if column.kind == "text":
+            distinct = [formatter(text) for text in column.text]
+            return [
+                "" if column.is_null(n) else distinct[code]
+                for n, code in enumerate(column.values)
+            ]
+        if not memoize:
+            return ["" if val is None else formatter(val) for val in column]
+
+        cache = {None: ""}
+        result = []
+        for val in column:
+            text = cache.get(val)
+            if text is None:
+                text = cache[val] = formatter(val)
+            result.append(text)
+        return result
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the page"""
+        return sys.getsizeof(self) + sum(column.nbytes() for column in self.columns)
@@ -0,0 +1,80 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+CONFIG_DIR = Path(os.environ.get("DYNSQLAPP_HOME", Path.home() / ".dynsqlapp"))
+SESSION_PATH = CONFIG_DIR / "session.json"
+CATALOG_CACHE_PATH = CONFIG_DIR / "catalog_cache.json"
+
+# Cheap fingerprint of a database's catalog; changes on CREATE/ALTER/DROP
+CATALOG_STAMP_QUERY = """
+SELECT
+    (SELECT COUNT(*) FROM sys.schemas),
+    COUNT(*),
+    CONVERT(varchar(30), MAX(modify_date), 126)
+FROM sys.objects
+WHERE is_ms_shipped = 0
+"""
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: Path, data: Dict[str, Any]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def load_session(path: Path = SESSION_PATH) -> Dict[str, Any]:
+    """Last session (server, selection, filter, page size, column widths, settings)"""
+    return _read_json(path)
+
+
+def save_session(session: Dict[str, Any], path: Path = SESSION_PATH):
+    """Persist the session; passwords are never part of it"""
+    try:
+        _write_json(path, session)
+    except OSError:
+        pass
+
+
+class CatalogCache:
+    """Catalog lists persisted per server, served until revalidated"""
+
+    def __init__(self, path: Path = CATALOG_CACHE_PATH):
+        self.path = path
+        self.data = _read_json(path)
+        self.dirty = False
+
+    def get(self, server: str, key: str) -> Optional[Any]:
+        return self.data.get(server, {}).get(key)
+
+    def put(self, server: str, key: str, value: Any):
+        self.data.setdefault(server, {})[key] = value
+        self.dirty = True
+
+    def invalidate_database(self, server: str, database: str):
+        """Drop every cached entry under a database"""
+        entries = self.data.get(server, {})
+        for key in [k for k in entries if k.startswith(f"{database}/")]:
+            del entries[key]
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            _write_json(self.path, self.data)
+            self.dirty = False
+        except OSError:
+            pass
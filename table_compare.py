@@ -0,0 +1,198 @@
+"""Compare a table in two databases by hashing primary key ranges
+
+Both sides hash the same key ranges in parallel (row count plus two
+CHECKSUM_AGGs over a SHA2_256 of each row), only mismatching ranges are split
+further, and small mismatching ranges are settled by comparing per-row hashes.
+Full rows are fetched only for the keys that differ, so two identical tables
+cost a few KB of hashes.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Sequence, Tuple
+
+from parallel_export import build_ntile_query, range_predicate, split_key_ranges
+
+# Types FOR JSON can't serialize, or that always differ between copies
+UNHASHABLE_TYPES = {"geography", "geometry", "hierarchyid", "timestamp", "rowversion"}
+
+# Keys per IN (...) list; SQL Server allows 2100 parameters
+FETCH_BATCH = 1000
+
+
+def hashable_columns(columns: List[Dict[str, Any]]) -> List[str]:
+    return [
+        col["name"] for col in columns if col["type"].lower() not in UNHASHABLE_TYPES
+    ]
+
+
+def row_hash_expression(columns: Sequence[str]) -> str:
+    """SHA2_256 of a row's JSON; INCLUDE_NULL_VALUES tells NULL from missing"""
+    names = ", ".join(f"[{name}]" for name in columns)
+    return (
+        f"HASHBYTES('SHA2_256', (SELECT {names} "
+        "FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES))"
+    )
+
+
+def build_range_hash_query(full_table_name: str, columns, predicate: str) -> str:
+    """Row count and a 64-bit order-independent hash of the rows in a range"""
+    return f"""
+    SELECT COUNT_BIG(*),
+           CHECKSUM_AGG(CAST(SUBSTRING(h, 1, 4) AS int)),
+           CHECKSUM_AGG(CAST(SUBSTRING(h, 5, 4) AS int))
+    FROM (
+        SELECT {row_hash_expression(columns)} AS h
+        FROM {full_table_name}
+        WHERE {predicate}
+    ) AS hashed
+    """
+
+
+class TableSide:
+    """One side of a comparison: a pool, a database and a table in it"""
+
+    def __init__(self, pool, database: str, full_table_name: str):
+        self.pool = pool
+        self.database = database
+        self.full_table_name = full_table_name
+
+    def query(self, query: str, params: Sequence[Any] = ()) -> List[Any]:
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"USE [{self.database}]")
+            cursor.execute(query, list(params))
+            return cursor.fetchall()
+
+
+def compare_tables(
+    source: TableSide,
+    target: TableSide,
+    columns: Sequence[str],
+    key_column: str,
+    key_type: str,
+    where_clause="",
+    parts=16,
+    fanout=8,
+    leaf_rows=2000,
+    dop=4,
+) -> Dict[str, Any]:
+    """Rows that differ between source and target, keyed by key_column
+
+    Returns missing_in_target and missing_in_source (rows as tuples of
+    `columns`), changed ((source row, target row) pairs), ranges_hashed,
+    keys_compared and seconds.
+    """
+    start = time.perf_counter()
+    columns = [key_column] + [name for name in columns if name != key_column]
+
+    def restrict(low, high) -> Tuple[str, List[Any]]:
+        predicate, params = range_predicate(key_column, low, high)
+        if where_clause:
+            predicate = f"({where_clause}) AND {predicate}"
+        return predicate, params
+
+    def range_hash(side: TableSide, key_range):
+        predicate, params = restrict(*key_range)
+        query = build_range_hash_query(side.full_table_name, columns, predicate)
+        return tuple(side.query(query, params)[0])
+
+    def split(side: TableSide, key_range):
+        low, high = key_range
+        predicate, params = restrict(low, high)
+        rows = side.query(
+            build_ntile_query(side.full_table_name, key_column, predicate),
+            [fanout] + params,
+        )
+        edges = [low] + [row[0] for row in rows][:-1] + [high]
+        return list(zip(edges[:-1], edges[1:]))
+
+    def key_hashes(side: TableSide, key_range) -> Dict[Any, bytes]:
+        predicate, params = restrict(*key_range)
+        query = (
+            f"SELECT [{key_column}], {row_hash_expression(columns)} "
+            f"FROM {side.full_table_name} WHERE {predicate}"
+        )
+        return {row[0]: row[1] for row in side.query(query, params)}
+
+    def fetch_rows(side: TableSide, keys) -> Dict[Any, tuple]:
+        names = ", ".join(f"[{name}]" for name in columns)
+        rows = {}
+        for i in range(0, len(keys), FETCH_BATCH):
+            batch = keys[i : i + FETCH_BATCH]
+            placeholders = ", ".join("?" * len(batch))
+            query = (
+                f"SELECT {names} FROM {side.full_table_name} "
+                f"WHERE [{key_column}] IN ({placeholders})"
+            )
+            rows.update((row[0], tuple(row)) for row in side.query(query, batch))
+        return rows
+
+    with ThreadPoolExecutor(max_workers=max(1, dop)) as executor:
+        with source.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"USE [{source.database}]")
+            pending = split_key_ranges(
+                cursor,
+                source.full_table_name,
+                key_column,
+                key_type,
+                parts,
+                where_clause,
+            )
+
+        ranges_hashed = 0
+        leaves = []
+        while pending:
+            source_hashes = executor.map(lambda r: range_hash(source, r), pending)
+            target_hashes = executor.map(lambda r: range_hash(target, r), pending)
+            mismatched = [
+                (key_range, ours, theirs)
+                for key_range, ours, theirs in zip(
+                    pending, source_hashes, target_hashes
+                )
+                if ours != theirs
+            ]
+            ranges_hashed += len(pending)
+            pending = []
+            for key_range, ours, theirs in mismatched:
+                side = source if ours[0] >= theirs[0] else target
+                if max(ours[0], theirs[0]) <= leaf_rows:
+                    leaves.append(key_range)
+                    continue
+                sub_ranges = split(side, key_range)
+                if len(sub_ranges) > 1:
+                    pending.extend(sub_ranges)
+                else:
+                    leaves.append(key_range)
+
+        ours, theirs = {}, {}
+        for hashes, side in ((ours, source), (theirs, target)):
+            for result in executor.map(lambda r: key_hashes(side, r), leaves):
+                hashes.update(result)
+
+        only_source = [key for key in ours if key not in theirs]
+        only_target = [key for key in theirs if key not in ours]
+        changed = [key for key in ours if key in theirs and ours[key] != theirs[key]]
+
+        source_rows = executor.submit(fetch_rows, source, only_source + changed)
+        target_rows = executor.submit(fetch_rows, target, only_target + changed)
+        source_rows, target_rows = source_rows.result(), target_rows.result()
+
+    return {
+        "columns": columns,
+        "missing_in_target": [source_rows[key] for key in only_source],
+        "missing_in_source": [target_rows[key] for key in only_target],
+        "changed": [(source_rows[key], target_rows[key]) for key in changed],
+        "ranges_hashed": ranges_hashed,
+        "keys_compared": len(ours) + len(theirs),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def changed_columns(columns, source_row, target_row) -> List[str]:
+    return [
+        name
+        for name, ours, theirs in zip(columns, source_row, target_row)
+        if ours != theirs
+    ]
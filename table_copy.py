@@ -0,0 +1,185 @@
+"""Stream rows from one table into another, on the same or another server
+
+A reader thread pages through the source in key order with fetchmany and
+hands batches to the writer through a bounded queue, so reading and inserting
+overlap without buffering the table. Each batch is inserted with
+fast_executemany and committed on its own, which makes the largest key in the
+target the point to resume from after a failure.
+"""
+
+import queue
+import threading
+import time
+from typing import List, Dict, Any, Callable, Optional, Sequence, Tuple
+
+from change_detection import find_rowversion_column
+from parallel_export import range_predicate
+
+IDENTITY_COLUMN_QUERY = """
+SELECT name FROM sys.identity_columns WHERE object_id = OBJECT_ID(?)
+"""
+
+# INFORMATION_SCHEMA.COLUMNS lists computed columns, which an INSERT can't name
+COMPUTED_COLUMNS_QUERY = """
+SELECT name
+FROM sys.columns
+WHERE object_id = OBJECT_ID(?) AND COLUMNPROPERTY(object_id, name, 'IsComputed') = 1
+"""
+
+# Types the server fills in and never accepts in an INSERT
+GENERATED_TYPES = {"timestamp", "rowversion"}
+
+
+def computed_columns(side) -> List[str]:
+    """Names of the computed columns of a table_compare.TableSide's table"""
+    rows = side.query(COMPUTED_COLUMNS_QUERY, [side.full_table_name])
+    return [row[0] for row in rows]
+
+
+def map_columns(
+    source_columns: List[Dict[str, Any]],
+    target_columns: List[Dict[str, Any]],
+    target_computed: Sequence[str] = (),
+) -> List[Tuple[str, str]]:
+    """(source, target) name pairs for the columns both tables have
+
+    Names match case-insensitively; rowversion columns and the target's
+    computed columns are left out.
+    """
+    computed = {name.lower() for name in target_computed}
+    targets = {
+        col["name"].lower(): col["name"]
+        for col in target_columns
+        if col["type"].lower() not in GENERATED_TYPES
+        and col["name"].lower() not in computed
+    }
+    skipped = find_rowversion_column(source_columns)
+    return [
+        (col["name"], targets[col["name"].lower()])
+        for col in source_columns
+        if col["name"].lower() in targets and col["name"] != skipped
+    ]
+
+
+def last_copied_key(target, key_column: str, where_clause=""):
+    """Largest key already in the target (matching the filter), or None"""
+    query = f"SELECT MAX([{key_column}]) FROM {target.full_table_name}"
+    if where_clause:
+        query += f" WHERE {where_clause}"
+    return target.query(query)[0][0]
+
+
+def copy_table(
+    source,
+    target,
+    mapping: List[Tuple[str, str]],
+    key_column: str,
+    where_clause="",
+    resume_after=None,
+    batch_size=5000,
+    queue_batches=4,
+    progress: Optional[Callable[[int, float, Any], None]] = None,
+) -> Dict[str, Any]:
+    """Copy matching source rows with a key above resume_after into target
+
+    source and target are table_compare.TableSide objects; mapping comes from
+    map_columns and must include key_column. progress gets (rows copied,
+    seconds, last committed key) after every batch. Returns rows, seconds,
+    rows_per_sec and last_key.
+    """
+    start = time.perf_counter()
+    source_names = [name for name, _ in mapping]
+    target_names = [name for _, name in mapping]
+    key_index = source_names.index(key_column)
+
+    predicate, params = range_predicate(key_column, resume_after, None)
+    if where_clause:
+        predicate = f"({where_clause}) AND {predicate}"
+    select_list = ", ".join(f"[{name}]" for name in source_names)
+    select = (
+        f"SELECT {select_list} FROM {source.full_table_name} "
+        f"WHERE {predicate} ORDER BY [{key_column}]"
+    )
+    insert = (
+        f"INSERT INTO {target.full_table_name} "
+        f"({', '.join(f'[{name}]' for name in target_names)}) "
+        f"VALUES ({', '.join('?' * len(target_names))})"
+    )
+
+    batches: "queue.Queue" = queue.Queue(maxsize=max(1, queue_batches))
+    stop = threading.Event()
+
+    def put(item):
+        # Give up when the writer has failed rather than block on a full queue
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def read():
+        try:
+            with source.pool.connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(f"USE [{source.database}]")
+                cursor.execute(select, params)
+                while not stop.is_set():
+                    batch = cursor.fetchmany(batch_size)
+                    if not batch:
+                        break
+                    put([tuple(row) for row in batch])
+            put(None)
+        except Exception as e:
+            put(e)
+
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+
+    rows = 0
+    last_key = resume_after
+    try:
+        with target.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"USE [{target.database}]")
+            # Explicit identity values only when the identity column is copied
+            cursor.execute(IDENTITY_COLUMN_QUERY, target.full_table_name)
+            row = cursor.fetchone()
+            identity = row is not None and row[0].lower() in {
+                name.lower() for name in target_names
+            }
+            if identity:
+                cursor.execute(f"SET IDENTITY_INSERT {target.full_table_name} ON")
+            cursor.fast_executemany = True
+            try:
+                while True:
+                    batch = batches.get()
+                    if batch is None:
+                        break
+                    if isinstance(batch, Exception):
+                        raise batch
+                    cursor.executemany(insert, batch)
+                    connection.commit()
+                    rows += len(batch)
+                    last_key = batch[-1][key_index]
+                    if progress:
+                        progress(rows, time.perf_counter() - start, last_key)
+            finally:
+                if identity:
+                    try:
+                        cursor.execute(
+                            f"SET IDENTITY_INSERT {target.full_table_name} OFF"
+                        )
+                    except Exception:
+                        pass  # Broken connection; the pool discards it
+    finally:
+        stop.set()
+        reader.join()
+
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds else 0.0,
+        "last_key": last_key,
+    }
@@ -0,0 +1,76 @@
+from bisect import bisect_left
+from typing import List, Optional
+
+from column_profile import (
+    COLUMN_STATS_QUERY,
+    UNPROFILED_TYPES,
+    build_histogram_query,
+    build_sample_query,
+)
+
+# Leading key column of some index: DISTINCT TOP is then an ordered range scan
+LEADING_INDEX_COLUMN_QUERY = """
+SELECT TOP 1 1
+FROM sys.index_columns
+WHERE object_id = OBJECT_ID(?)
+    AND key_ordinal = 1
+    AND COL_NAME(object_id, column_id) = ?
+"""
+
+
+class PrefixIndex:
+    """Case-insensitive prefix lookups over a sorted array of values"""
+
+    def __init__(self, values):
+        pairs = sorted({(str(v).casefold(), str(v)) for v in values if v is not None})
+        self.keys = [key for key, _ in pairs]
+        self.values = [value for _, value in pairs]
+
+    def __len__(self):
+        return len(self.values)
+
+    def suggest(self, prefix: str, limit=10) -> List[str]:
+        """Up to limit values starting with prefix, in sort order"""
+        prefix = prefix.casefold()
+        start = bisect_left(self.keys, prefix)
+        matches = []
+        for i in range(start, min(start + limit, len(self.keys))):
+            if not self.keys[i].startswith(prefix):
+                break
+            matches.append(self.values[i])
+        return matches
+
+
+def load_distinct_values(
+    cursor, full_table_name: str, column: str, data_type: str, limit=5000
+) -> Optional[List[str]]:
+    """Up to limit distinct values of a column, without a full scan
+
+    All of them (up to limit) when an index leads on the column; otherwise the
+    step values of its statistics histogram, or the values in a sample.
+    None for types that can't be listed.
+    """
+    if data_type.lower() in UNPROFILED_TYPES:
+        return None
+
+    cursor.execute(LEADING_INDEX_COLUMN_QUERY, full_table_name, column)
+    if cursor.fetchone() is not None:
+        cursor.execute(
+            f"SELECT DISTINCT TOP ({int(limit)}) [{column}] FROM {full_table_name} "
+            f"WHERE [{column}] IS NOT NULL ORDER BY [{column}]"
+        )
+        return [str(row[0]) for row in cursor.fetchall()]
+
+    try:
+        cursor.execute(COLUMN_STATS_QUERY, full_table_name, column)
+        row = cursor.fetchone()
+        if row is not None:
+            cursor.execute(build_histogram_query(data_type), full_table_name, row[0])
+            steps = cursor.fetchall()
+            if steps:
+                return [str(step[0]) for step in steps if step[0] is not None]
+    except Exception:
+        pass  # No VIEW DATABASE STATE, or a server before 2016 SP1 CU2
+
+    cursor.execute(build_sample_query(full_table_name, column, limit, top_only=True))
+    return [str(value) for value, _ in cursor.fetchall() if value is not None]
@@ -0,0 +1,357 @@
+"""Record what a session does at the engine level and replay it elsewhere
+
+A trace is a JSON lines file: a header, then one line per user-level step
+(open table, filter, next page, edit, ...) with every SQL statement the step
+ran, its parameters, row count and time.
+
+    python workload.py replay trace.jsonl -S otherserver -d Sales
+    python workload.py replay trace.jsonl --standin --rows 20000
+    python workload.py compare before.jsonl after.jsonl
+"""
+
+import argparse
+import functools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "MERGE")
+
+
+class RecordingCursor:
+    """Times execute and fetch calls of a DB-API cursor for the current step"""
+
+    def __init__(self, cursor, recorder: "WorkloadRecorder"):
+        self._cursor = cursor
+        self._recorder = recorder
+        self._statement: Optional[Dict[str, Any]] = None
+
+    def execute(self, query, *params):
+        start = time.perf_counter()
+        try:
+            self._cursor.execute(query, *params)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            if len(params) == 1 and isinstance(params[0], (list, tuple)):
+                params = tuple(params[0])
+            self._statement = self._recorder.add_statement(query, params, elapsed)
+        return self
+
+    def _fetch(self, method, *args):
+        start = time.perf_counter()
+        result = getattr(self._cursor, method)(*args)
+        if self._statement is not None:
+            self._statement["ms"] += (time.perf_counter() - start) * 1000
+            if isinstance(result, list):
+                self._statement["rows"] += len(result)
+            elif result is not None:
+                self._statement["rows"] += 1
+        return result
+
+    def fetchone(self):
+        return self._fetch("fetchone")
+
+    def fetchmany(self, size=1):
+        return self._fetch("fetchmany", size)
+
+    def fetchall(self):
+        return self._fetch("fetchall")
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class RecordingConnection:
+    def __init__(self, connection, recorder: "WorkloadRecorder"):
+        self._connection = connection
+        self._recorder = recorder
+
+    def cursor(self):
+        return RecordingCursor(self._connection.cursor(), self._recorder)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            super().__setattr__(name, value)
+        else:
+            setattr(self._connection, name, value)
+
+
+class WorkloadRecorder:
+    """Writes steps and their SQL to a trace file
+
+    Statements are recorded only on the thread that opened the step, so
+    background work (catalog revalidation, live polling) stays out of it.
+    """
+
+    def __init__(self, path: str, **header):
+        self.path = path
+        self.file = open(path, "a", encoding="utf-8")
+        self.local = threading.local()
+        self.step_count = 0
+        self.write_line(
+            {"trace": 1, "started": datetime.now().isoformat(), **header}
+        )
+
+    def write_line(self, data: Dict[str, Any]):
+        self.file.write(json.dumps(data, default=str) + "\n")
+        self.file.flush()
+
+    def wrap(self, connection):
+        return RecordingConnection(connection, self)
+
+    def add_statement(self, query, params, ms) -> Optional[Dict[str, Any]]:
+        step = getattr(self.local, "step", None)
+        if step is None:
+            return None
+        statement = {"sql": query, "params": list(params), "ms": ms, "rows": 0}
+        step["statements"].append(statement)
+        return statement
+
+    @contextmanager
+    def step(self, action: str, context: Optional[Dict[str, Any]] = None):
+        """Record everything run inside the with block as one step
+
+        Yields the step dict (None when nested), whose "context" may still be
+        filled in before the block ends.
+        """
+        if getattr(self.local, "step", None) is not None:
+            # Nested step (e.g. refresh inside an edit): part of the outer one
+            yield None
+            return
+
+        self.step_count += 1
+        step = {
+            "step": self.step_count,
+            "action": action,
+            "context": context or {},
+            "statements": [],
+        }
+        self.local.step = step
+        start = time.perf_counter()
+        try:
+            yield step
+        except Exception as e:
+            step["error"] = str(e)
+            raise
+        finally:
+            self.local.step = None
+            step["wall_ms"] = (time.perf_counter() - start) * 1000
+            step["sql_ms"] = sum(s["ms"] for s in step["statements"])
+            self.write_line(step)
+
+    def close(self):
+        self.file.close()
+
+
+def recorded_step(action: str, with_columns=False):
+    """Method decorator: record the call as a step when the app is recording
+
+    The step's context is the app state the call left behind (table, page,
+    filter; column definitions too when with_columns).
+    """
+
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            recorder = self.workload_recorder
+            if recorder is None:
+                return method(self, *args, **kwargs)
+            with recorder.step(action) as step:
+                try:
+                    return method(self, *args, **kwargs)
+                finally:
+                    if step is not None:
+                        step["context"] = self.workload_context(with_columns)
+
+        return wrapper
+
+    return decorate
+
+
+def load_trace(path: str):
+    """(header, steps) of a trace file"""
+    header, steps = {}, []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            if "trace" in data:
+                header = data
+            else:
+                steps.append(data)
+    return header, steps
+
+
+def is_write(sql: str) -> bool:
+    return sql.lstrip().upper().startswith(WRITE_PREFIXES)
+
+
+def replay(steps, pool, include_writes=False) -> List[Dict[str, Any]]:
+    """Re-run each step's statements on pool; writes are skipped unless asked
+    for, and always rolled back"""
+    results = []
+    for step in steps:
+        result = {
+            "step": step["step"],
+            "action": step["action"],
+            "recorded_ms": 0.0,
+            "replay_ms": 0.0,
+            "errors": 0,
+        }
+        with pool.connection() as connection:
+            cursor = connection.cursor()
+            wrote = False
+            for statement in step["statements"]:
+                if is_write(statement["sql"]) and not include_writes:
+                    continue
+                # Compare like with like: only the statements replayed count
+                result["recorded_ms"] += statement["ms"]
+                start = time.perf_counter()
+                try:
+                    cursor.execute(statement["sql"], *statement["params"])
+                    if cursor.description:
+                        cursor.fetchall()
+                except Exception:
+                    result["errors"] += 1
+                result["replay_ms"] += (time.perf_counter() - start) * 1000
+                wrote = wrote or is_write(statement["sql"])
+            if wrote:
+                connection.rollback()
+        results.append(result)
+    return results
+
+
+def print_comparison(results):
+    """Per-step latency deltas, then totals"""
+    print(f"{'step':>5}  {'action':<20}{'before ms':>11}{'after ms':>11}{'delta':>9}")
+    total_before = total_after = 0.0
+    for r in results:
+        before, after = r["recorded_ms"], r["replay_ms"]
+        total_before += before
+        total_after += after
+        delta = f"{(after - before) / before * 100:+.0f}%" if before else "-"
+        errors = f"  ({r['errors']} failed)" if r.get("errors") else ""
+        print(
+            f"{r['step']:>5}  {r['action']:<20}{before:>11.1f}{after:>11.1f}"
+            f"{delta:>9}{errors}"
+        )
+    delta = (
+        f"{(total_after - total_before) / total_before * 100:+.0f}%"
+        if total_before
+        else "-"
+    )
+    print(f"{'':>5}  {'total':<20}{total_before:>11.1f}{total_after:>11.1f}{delta:>9}")
+
+
+def standin_for(steps, rows):
+    """A FakeServer with a synthetic table for every table the trace opened"""
+    from benchmark import synthetic_value
+    from fake_sqlserver import FakeServer
+
+    server = FakeServer()
+    rng = random.Random(0)
+    created = set()
+    for step in steps:
+        context = step.get("context", {})
+        key = (context.get("schema"), context.get("table"))
+        columns = context.get("columns")
+        if not all(key) or not columns or key in created:
+            continue
+        created.add(key)
+        definitions = [(col["name"], col["type"], col.get("scale")) for col in columns]
+        server.create_table(*key, definitions, context.get("primary_key") or ())
+        data = [
+            [
+                n + 1 if col["name"] in (context.get("primary_key") or ())
+                else synthetic_value(col["type"], i, n, rng)
+                for i, col in enumerate(columns)
+            ]
+            for n in range(rows)
+        ]
+        server.insert_rows(*key, data)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay and compare workload traces")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = commands.add_parser("replay", help="Re-run a trace and compare")
+    replay_parser.add_argument("trace")
+    replay_parser.add_argument("-S", "--server")
+    replay_parser.add_argument("-U", "--username")
+    replay_parser.add_argument("-d", "--database")
+    replay_parser.add_argument("--read-only", action="store_true")
+    replay_parser.add_argument(
+        "--standin", action="store_true", help="Replay on a local SQLite stand-in"
+    )
+    replay_parser.add_argument("--rows", type=int, default=10000)
+    replay_parser.add_argument(
+        "--include-writes",
+        action="store_true",
+        help="Also run INSERT/UPDATE/DELETE (rolled back after each step)",
+    )
+
+    compare_parser = commands.add_parser("compare", help="Compare two traces")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        _, before = load_trace(args.before)
+        _, after = load_trace(args.after)
+        print_comparison(
+            [
+                {
+                    "step": old["step"],
+                    "action": old["action"],
+                    "recorded_ms": old.get("sql_ms", 0.0),
+                    "replay_ms": new.get("sql_ms", 0.0),
+                }
+                for old, new in zip(before, after)
+            ]
+        )
+        return 0
+
+    _, steps = load_trace(args.trace)
+    if args.standin:
+        pool = standin_for(steps, args.rows).pool()
+    elif args.server:
+        from db_connections import ConnectionPool
+
+        password = None
+        if args.username:
+            import getpass
+
+            password = os.environ.get("DYNSQLAPP_PASSWORD") or getpass.getpass()
+        pool = ConnectionPool(
+            size=1,
+            server=args.server,
+            username=args.username,
+            password=password,
+            database=args.database,
+            read_only=args.read_only,
+        )
+    else:
+        parser.error("replay needs --server or --standin")
+
+    try:
+        print_comparison(replay(steps, pool, args.include_writes))
+    finally:
+        pool.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())